@@ -1,5 +1,178 @@
 """CrewAI agents for LinkedIn post generation."""
 
+import atexit
+import hashlib
+import importlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+logger = logging.getLogger(__name__)
 
+_LLM_CACHE_CONFIGURED = False
 
+
+def _configure_llm_cache() -> None:
+    """
+    Install a process-wide LangChain response cache so identical prompts skip the provider.
+    Uses Redis when REDIS_URL is set, otherwise a local SQLite file (LANGCHAIN_CACHE_DB).
+    Called lazily when an agent first loads langchain_openai, so importing the package stays cheap.
+    """
+    global _LLM_CACHE_CONFIGURED
+    if _LLM_CACHE_CONFIGURED:
+        return
+    _LLM_CACHE_CONFIGURED = True
+    try:
+        from langchain_core.globals import get_llm_cache, set_llm_cache
+    except Exception:
+        return
+    if get_llm_cache() is not None:
+        return
+
+    try:
+        redis_url = (os.getenv("REDIS_URL") or "").strip()
+        if redis_url:
+            import redis
+            from langchain_community.cache import RedisCache
+
+            set_llm_cache(RedisCache(redis.Redis.from_url(redis_url)))
+        else:
+            from langchain_community.cache import SQLiteCache
+
+            set_llm_cache(SQLiteCache(database_path=os.getenv("LANGCHAIN_CACHE_DB", ".llm_cache.db")))
+    except Exception as exc:
+        logger.warning("LLM response cache disabled: %s", exc)
+
+
+# crewai / langchain_openai pull in a large import graph; resolve them on first use so
+# process cold start does not pay for it.
+_MODULES: Dict[str, Any] = {}
+
+
+def _lazy_module(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        if name == "langchain_openai":
+            _configure_llm_cache()
+        module = _MODULES.setdefault(name, importlib.import_module(name))
+    return module
+
+
+# Provider clients (ChatOpenAI, OpenAI, ...) shared by every agent module, keyed by a hash of
+# (provider, model, api_key, base_url, ...) so connection pools are reused across calls. Keys
+# include per-user OpenAI keys, so the cache is a bounded LRU; evicted clients are closed.
+_LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CLIENT_CACHE_SIZE", "64"))
+
+
+class _LLMCache:
+    """
+    Thread-safe LRU of provider clients. A client created with owns_connections=False (one built
+    on a shared httpx client, or a model_copy variant sharing its base's client) is dropped on
+    eviction but never closed. Variants are tied to their base: evicting the base (and closing
+    its connections) drops them too.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(1, maxsize)
+        # key -> (client, owns_connections)
+        self._entries: "OrderedDict[str, Tuple[Any, bool]]" = OrderedDict()
+        self._keys: Dict[int, str] = {}
+        self._variants: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(
+        self, key: str, factory: Callable[[], Any], owns_connections: bool = True, parent: Optional[str] = None
+    ) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+        created = factory()
+        evicted: List[Tuple[Any, bool]] = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = (created, owns_connections)
+                self._keys[id(created)] = key
+                if parent is not None:
+                    self._variants.setdefault(parent, []).append(key)
+                while len(self._entries) > self.maxsize:
+                    evicted.extend(self._pop(next(iter(self._entries))))
+                result = created
+            else:
+                # Lost a creation race: keep the cached client, discard ours.
+                self._entries.move_to_end(key)
+                evicted.append((created, owns_connections))
+                result = entry[0]
+        for client, owns in evicted:
+            if owns:
+                _close_client(client)
+        return result
+
+    def key_of(self, client: Any) -> Optional[str]:
+        with self._lock:
+            return self._keys.get(id(client))
+
+    def _pop(self, key: str) -> List[Tuple[Any, bool]]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return []
+        self._keys.pop(id(entry[0]), None)
+        popped = [entry]
+        for variant in self._variants.pop(key, []):
+            popped.extend(self._pop(variant))
+        return popped
+
+    def close_all(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._keys.clear()
+            self._variants.clear()
+        for client, owns in entries:
+            if owns:
+                _close_client(client)
+
+
+def _close_client(client: Any) -> None:
+    close = getattr(getattr(client, "root_client", None), "close", None) or getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
+
+
+_LLM_CACHE = _LLMCache(_LLM_CACHE_MAX_ENTRIES)
+
+
+def _llm_cache_key(*parts: Any) -> str:
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _get_or_create_llm(key: str, factory: Callable[[], Any], owns_connections: bool = True) -> Any:
+    return _LLM_CACHE.get_or_create(key, factory, owns_connections)
+
+
+def _get_or_create_llm_variant(base: Any, factory: Callable[[], Any], *parts: Any) -> Any:
+    """
+    Cached variant of base (e.g. a model_copy with another max_tokens), keyed by base's cache key
+    and parts. Variants share base's connections, so they are never closed themselves. A base
+    that is not cached (any more) gets an uncached variant.
+    """
+    base_key = _LLM_CACHE.key_of(base)
+    if base_key is None:
+        return factory()
+    return _LLM_CACHE.get_or_create(
+        _llm_cache_key("variant", base_key, *parts), factory, owns_connections=False, parent=base_key
+    )
+
+
+def _close_cached_llms() -> None:
+    _LLM_CACHE.close_all()
+
+
+atexit.register(_close_cached_llms)
@@ -1,74 +1,309 @@
 """CrewAI agent for generating high-quality LinkedIn posts."""
 
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
-from crewai import Agent, Crew, Task
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional, Union
 
+import httpx
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from agents import _get_or_create_llm, _get_or_create_llm_variant, _lazy_module, _llm_cache_key
+from utils.rate_limit import throttle_llm
 from utils.trend_fetcher import format_trend_brief
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _Env:
+    gemini_key: Optional[str]
+    nvidia_key: Optional[str]
+    nvidia_base_url: Optional[str]
+    nvidia_model: str
+    nvidia_editor_model: Optional[str]
+    openai_key: Optional[str]
+    openai_model: str
+    openai_creator_model: Optional[str]
+    openai_editor_model: str
+    separate_editor: bool
+
+
+def _read_env() -> _Env:
+    return _Env(
+        gemini_key=os.getenv("GEMINI_API_KEY"),
+        nvidia_key=os.getenv("NVIDIA_API_KEY"),
+        nvidia_base_url=os.getenv("NVIDIA_BASE_URL"),
+        nvidia_model=os.getenv("NVIDIA_MODEL", "meta/llama-3.1-70b-instruct"),
+        nvidia_editor_model=os.getenv("NVIDIA_EDITOR_MODEL"),
+        openai_key=os.getenv("OPENAI_API_KEY"),
+        openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        openai_creator_model=os.getenv("OPENAI_CREATOR_MODEL"),
+        openai_editor_model=os.getenv("OPENAI_EDITOR_MODEL", "gpt-4o-mini"),
+        separate_editor=os.getenv("ENABLE_SEPARATE_EDITOR", "false").strip().lower() in {"1", "true", "yes", "on"},
+    )
+
+
+_ENV = _read_env()
+
+
+def reload_env() -> _Env:
+    """Re-read provider settings from the environment (tests, or after the .env file changes)."""
+    global _ENV
+    _ENV = _read_env()
+    return _ENV
+
+
+if not (_ENV.gemini_key or (_ENV.nvidia_key and _ENV.nvidia_base_url) or _ENV.openai_key):
+    logger.warning(
+        "No server-side AI provider configured (GEMINI_API_KEY, NVIDIA_API_KEY/NVIDIA_BASE_URL "
+        "or OPENAI_API_KEY); generation will only work for users with their own OpenAI key."
+    )
+
+
+# Default bound on concurrent generations in generate_linkedin_posts_batch.
+_LLM_CONCURRENCY = max(1, int(os.getenv("POST_GENERATION_CONCURRENCY", "10")))
+
+# Pooled HTTP clients shared by every cached ChatOpenAI instance: the async one serves
+# ainvoke/astream, the sync one invoke and the Batch API. Streams and single generations hold
+# no semaphore, so the pool is sized for the whole process, not for one batch. Clients built on
+# them do not own their connections, so cache eviction never closes them.
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "1000")),
+    max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "100")),
+)
+_HTTP_CLIENT = httpx.Client(limits=_HTTP_LIMITS)
+_HTTP_ASYNC_CLIENT = httpx.AsyncClient(limits=_HTTP_LIMITS)
+atexit.register(_HTTP_CLIENT.close)
+
+
+async def aclose_http_clients() -> None:
+    await _HTTP_ASYNC_CLIENT.aclose()
+
+
+# Transient provider errors are retried with backoff on the same provider; anything else
+# (auth, invalid key, bad request) fails over to the next provider straight away.
+def _is_retryable_error(exc: BaseException) -> bool:
+    openai = _lazy_module("openai")
+    return isinstance(exc, (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError))
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=20),
+    retry=retry_if_exception(_is_retryable_error),
+    reraise=True,
+)
+async def _run_crew_with_retry(crew):
+    return await crew.kickoff_async()
+
+
+# Circuit breaker per (provider, API key) -> (consecutive_failures, open_until_ts). Keyed by
+# key as well as provider because "openai" runs on each user's own key: one user's revoked or
+# exhausted key must not open the circuit for everyone. Only outages count (transport errors,
+# timeouts, 429, 5xx); a bad request or a 401 is the caller's problem, not the provider's.
+# After _BREAKER_THRESHOLD outages in a row the provider is skipped for _BREAKER_COOLDOWN_S,
+# then probed with a tiny request before a full crew run is committed to it.
+_BREAKER: Dict[str, tuple[int, float]] = {}
+_BREAKER_LOCK = threading.Lock()
+_BREAKER_THRESHOLD = 3
+_BREAKER_COOLDOWN_S = 60.0
+_PROBE_TIMEOUT_S = 2.0
+
+
+def _breaker_key(name: str, llm: Any) -> str:
+    secret = getattr(llm, "openai_api_key", None)
+    if secret is None:
+        return name  # server-configured provider (e.g. the Gemini model string)
+    value = secret.get_secret_value() if hasattr(secret, "get_secret_value") else str(secret)
+    return f"{name}:{hashlib.sha256(value.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _is_provider_outage(exc: BaseException) -> bool:
+    """True for errors that say the provider is down or overloaded (walks wrapped causes)."""
+    openai = _lazy_module("openai")
+    seen = 0
+    while exc is not None and seen < 5:
+        if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError, openai.APITimeoutError, openai.APIConnectionError)):
+            return True
+        status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+        if isinstance(status, int) and (status == 429 or status >= 500):
+            return True
+        exc = exc.__cause__ or exc.__context__
+        seen += 1
+    return False
+
+
+def _record_provider_failure(name: str) -> None:
+    with _BREAKER_LOCK:
+        failures = _BREAKER.get(name, (0, 0.0))[0] + 1
+        open_until = time.time() + _BREAKER_COOLDOWN_S if failures >= _BREAKER_THRESHOLD else 0.0
+        _BREAKER[name] = (failures, open_until)
+    if open_until:
+        logger.warning("Circuit open for provider %s for %.0fs after %d failures", name, _BREAKER_COOLDOWN_S, failures)
+
+
+def _record_provider_success(name: str) -> None:
+    with _BREAKER_LOCK:
+        _BREAKER.pop(name, None)
+
 
-def create_content_creator_agent(llm):
+async def _provider_available(name: str, llm: Any) -> bool:
+    """False while the provider's circuit is open; probe it once the cooldown has expired."""
+    failures, open_until = _BREAKER.get(name, (0, 0.0))
+    if open_until > time.time():
+        logger.info("Skipping provider %s: circuit open", name)
+        return False
+    if failures < _BREAKER_THRESHOLD or not hasattr(llm, "ainvoke"):
+        return True
+
+    # Half-open: bypass the response cache so the probe really reaches the provider.
+    probe = llm.model_copy(update={"cache": False, "max_tokens": 1}) if hasattr(llm, "model_copy") else llm
+    try:
+        await asyncio.wait_for(probe.ainvoke("ping"), timeout=_PROBE_TIMEOUT_S)
+    except Exception as exc:
+        if _is_provider_outage(exc):
+            logger.warning("Provider %s failed health probe: %s", name, exc)
+            _record_provider_failure(name)
+            return False
+    _record_provider_success(name)
+    return True
+
+
+# Single source of truth for post rules; interpolated once into the task prompts only
+# (agent backstories are prepended to every turn, so they stay short).
+POST_RULES = (
+    "Plain text only, no markdown. Under 150 words. Hook first, engaging question last. "
+    "Teach a framework (phases/steps/principles) with 2–3 hacks applicable this week, the why, "
+    "and one memorable takeaway. Vary the layout (story+bullets, old vs new, numbered hacks). "
+    "0–2 emojis, no jargon. Last 1–2 lines: 4–7 lowercase niche hashtags (e.g. #saasgrowth). "
+    "No outdated years unless requested."
+)
+
+
+# Output ceilings per task: the post itself is ~150 words (~200 tokens), so no task needs
+# the provider-level 500-token budget.
+_RESEARCH_MAX_TOKENS = 220
+_CREATION_MAX_TOKENS = 320
+_EDITOR_MAX_TOKENS = 260
+# Fused topic + post output (automation): a short topic line plus the ~200-token post.
+_TOPIC_AND_POST_MAX_TOKENS = 380
+
+
+def _with_max_tokens(llm: Any, max_tokens: int) -> Any:
+    """Return a cached variant of llm capped at max_tokens (Gemini model strings become crewai LLMs)."""
+    if isinstance(llm, str):
+        return _get_or_create_llm(
+            _llm_cache_key("crewai", llm, max_tokens),
+            lambda: _lazy_module("crewai").LLM(model=llm, max_tokens=max_tokens),
+        )
+    if getattr(llm, "max_tokens", None) == max_tokens or not hasattr(llm, "model_copy"):
+        return llm
+    return _get_or_create_llm_variant(
+        llm, lambda: llm.model_copy(update={"max_tokens": max_tokens}), "sized", max_tokens
+    )
+
+
+# Static agent configs, built once at import. Agents themselves are still created per call
+# because CrewAI mutates them during a run (crew binding, executor, tools).
+_CONTENT_CREATOR_CFG = dict(
+    role="LinkedIn Content Creator",
+    goal="Write educational, framework-style LinkedIn posts that read like a human expert wrote them.",
+    backstory="You are an expert LinkedIn creator who turns topics into dense mini-lessons with practical hacks.",
+)
+
+_EDITOR_CFG = dict(
+    role="Content Editor",
+    goal="Tighten LinkedIn drafts so they follow the post rules exactly and are ready to publish.",
+    backstory="You are a meticulous editor specializing in educational LinkedIn content.",
+)
+
+_POST_AUTHOR_CFG = dict(
+    role="LinkedIn Post Author",
+    goal="Write and self-edit educational LinkedIn posts that follow the post rules exactly.",
+    backstory="You are an expert LinkedIn creator and a meticulous editor of your own drafts.",
+)
+
+_TREND_RESEARCH_CFG = dict(
+    role="Trend Research Analyst",
+    goal="Continuously surface timely, buzzworthy angles tailored to the user's niche",
+    backstory=(
+        "You're a cultural strategist who combines live web research with instincts for what performs "
+        "on LinkedIn. You distill breaking stories, stats, and hype into snackable angles others can "
+        "immediately riff on."
+    ),
+)
+
+
+def create_content_creator_agent(llm, max_tokens: Optional[int] = None):
     """Create the Content Creator agent for LinkedIn posts."""
-    return Agent(
-        role="LinkedIn Content Creator",
-        goal="Create clean, human-written, highly informative LinkedIn posts that teach a clear system or method (like Plan→Setup→Build), explain why it matters, include concrete hacks people can apply this week, end with a strong takeaway, and always include 4–7 relevant hashtags at the end (no markdown formatting).",
-        backstory="""You are an expert LinkedIn content creator who specializes in educational, framework-style posts.
-        Your posts teach like a mini-lesson: a clear structure (e.g. 3 phases, key steps, or a simple framework),
-        explain the 'why' not just the 'how', and end with one memorable big idea or takeaway.
-        You include specific, practical hacks and moves that people can apply within a week (e.g. scripts, questions to ask, small process changes).
-        You vary the layout from post to post: sometimes a short narrative then bullets, sometimes a bold contrast (Old way vs New way), sometimes a tight numbered list of hacks.
-        You use numbered points or short bullets when it helps, and you keep posts dense with insight and information (no filler lines).
-        You write in a conversational yet professional tone, lead with a hook, and teach a repeatable approach
-        (a system), not just one random tip.
-
-        Formatting rules:
-        - Output MUST be plain text only (no markdown such as bold, headings, or code blocks).
-        - End with 4–7 relevant hashtags on the last 1–2 lines (e.g. #productmanagement #saasgrowth).""",
-        llm=llm,
+    return _lazy_module("crewai").Agent(
+        **_CONTENT_CREATOR_CFG,
+        llm=_with_max_tokens(llm, max_tokens or _CREATION_MAX_TOKENS),
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
     )
 
 
-def create_editor_agent(llm):
+def create_editor_agent(llm, max_tokens: Optional[int] = None):
     """Create the Editor agent for refining posts."""
-    return Agent(
-        role="Content Editor",
-        goal="Refine posts so they are clearly educational: a framework or structure, a clear why, one big takeaway, and a clean block of 4–7 relevant hashtags at the end (plain text only, no markdown).",
-        backstory="""You are a meticulous editor specializing in educational LinkedIn content. You ensure posts:
-        - Teach a clear framework, system, or method (e.g. 3 steps, phases, or key principles)—not just one isolated tip
-        - Explain why it matters (context, common mistakes, or the shift in thinking)
-        - Include a memorable big idea or takeaway (one line the reader can keep)
-        - Are under 150 words, with a strong hook
-        - Use structure (numbered points or short bullets) when it helps clarity
-        - Sound personal yet smart; avoid jargon; are ready for publication""",
-        llm=llm,
+    return _lazy_module("crewai").Agent(
+        **_EDITOR_CFG,
+        llm=_with_max_tokens(llm, max_tokens or _EDITOR_MAX_TOKENS),
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
+    )
+
+
+def create_post_author_agent(llm, max_tokens: Optional[int] = None):
+    """Create the single-pass author agent that drafts, self-edits, and returns the final post."""
+    return _lazy_module("crewai").Agent(
+        **_POST_AUTHOR_CFG,
+        llm=_with_max_tokens(llm, max_tokens or _CREATION_MAX_TOKENS),
+        verbose=True,
+        allow_delegation=False,
     )
 
 
+def _separate_editor_enabled() -> bool:
+    """ENABLE_SEPARATE_EDITOR=true restores the two-pass creator -> editor pipeline (for A/B tests)."""
+    return _ENV.separate_editor
+
+
 def create_trend_research_agent(llm):
     """Create the research agent responsible for trend scouting."""
-    return Agent(
-        role="Trend Research Analyst",
-        goal="Continuously surface timely, buzzworthy angles tailored to the user's niche",
-        backstory="""You're a cultural strategist who combines live web research with instincts for what
-        performs on LinkedIn. You distill breaking stories, stats, and hype into snackable angles others
-        can immediately riff on.""",
-        llm=llm,
+    return _lazy_module("crewai").Agent(
+        **_TREND_RESEARCH_CFG,
+        llm=_with_max_tokens(llm, _RESEARCH_MAX_TOKENS),
         verbose=True,
         allow_delegation=False,
     )
 
 
-def _compress_profile_context(profile_context: Optional[Dict[str, Optional[str]]]) -> str:
+def _profile_context_key(profile_context: Optional[Dict[str, Optional[str]]]) -> tuple[tuple[str, str], ...]:
+    """Stable, hashable form of the profile context (only string fields are used in prompts)."""
+    return tuple(sorted((k, v) for k, v in (profile_context or {}).items() if isinstance(v, str)))
+
+
+@lru_cache(maxsize=1024)
+def _compress_profile_context(items: tuple[tuple[str, str], ...]) -> str:
     """Turn LinkedIn profile details into a short narrative for prompting."""
-    if not profile_context:
+    if not items:
         return ""
 
+    profile_context = dict(items)
     pieces = []
     headline = profile_context.get("headline")
     bio = profile_context.get("bio")
@@ -84,61 +319,172 @@ def _compress_profile_context(profile_context: Optional[Dict[str, Optional[str]]
     return "\n".join(pieces)
 
 
-def generate_linkedin_post(
+def _build_research_prompt(
+    *,
     topic: str,
-    additional_context: Optional[str] = None,
-    profile_context: Optional[Dict[str, Optional[str]]] = None,
-    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None,
-    user_niche: Optional[str] = None,
-    openai_api_key: Optional[str] = None,
+    user_niche: Optional[str],
+    trending_topics: List[Dict[str, Optional[str]]],
+    today_iso: str,
+    current_year: int,
 ) -> str:
+    trend_brief = format_trend_brief(trending_topics)
+    return f"""
+    You are scouting timely topics for a LinkedIn creator.
+    Today's date (UTC): {today_iso}. The current year is {current_year}.
+
+    User niche: {user_niche or 'General professional audience'}
+    Requested angle/topic: {topic}
+
+    Live internet research results:
+    {trend_brief}
+
+    Requirements:
+    - Output 3 concise conversation starters tailored to the user niche
+    - Each starter must reference one of the live findings or data points
+    - Include one punchy supporting insight or stat per starter
+    - Focus on themes that can lead to fun, witty, and high-signal posts
+    - Keep bullets under 40 words
+    - Do NOT mention outdated years (e.g. 2025) unless a live finding explicitly references it.
+
+    Respond ONLY with the three bullet points.
+    """.strip()
+
+
+async def _run_trend_research(llm, research_prompt: str) -> str:
+    """Run the trend research agent on its own crew and return the brief it produces."""
+    crewai = _lazy_module("crewai")
+    trend_agent = create_trend_research_agent(llm)
+    trend_task = crewai.Task(
+        description=research_prompt,
+        agent=trend_agent,
+        expected_output="Three bullet points highlighting trend-backed conversational angles.",
+    )
+    research_crew = crewai.Crew(agents=[trend_agent], tasks=[trend_task], verbose=True)
+    await throttle_llm(llm, research_prompt, _RESEARCH_MAX_TOKENS)
+    result = await _run_crew_with_retry(research_crew)
+    return str(result).strip()
+
+
+_RULES_BLOCK = f"Rules: {POST_RULES}\nIf live trend research is provided, weave in ONE timely detail."
+
+
+async def _prepare_creation_context(
+    *,
+    topic: str,
+    additional_context: Optional[str],
+    profile_context: Optional[Dict[str, Optional[str]]],
+    user_niche: Optional[str],
+    today_iso: str,
+    current_year: int,
+) -> str:
+    """Build the generation prompt (everything except the live trend brief)."""
+    profile_summary = _compress_profile_context(_profile_context_key(profile_context))
+    parts = [
+        f"Write a high-IQ, human-style LinkedIn post about {topic}.\n"
+        f"Today's date (UTC): {today_iso}; current year: {current_year}."
+    ]
+    if additional_context:
+        parts.append(f"Additional context: {additional_context}")
+    if profile_summary:
+        parts.append(f"Author context:\n{profile_summary}")
+    elif user_niche:
+        parts.append(f"Author niche: {user_niche}")
+    parts.append(_RULES_BLOCK)
+    return "\n\n".join(parts)
+
+
+async def _no_trend_research() -> str:
+    return ""
+
+
+_EDITING_INSTRUCTIONS = f"""
+Edit the LinkedIn post draft so it follows these rules: {POST_RULES}
+Trim if too long; add a missing framework, hack, or takeaway; strip any markdown but keep the hashtag block.
+Output ONLY the final post text.
+""".strip()
+
+_SELF_EDIT_INSTRUCTION = (
+    "Draft the post, critique it against the rules, then output ONLY the final revision."
+)
+
+_POST_EXPECTED_OUTPUT = (
+    "A polished, educational LinkedIn post in clean plain text with a clear framework "
+    "and 4–7 relevant hashtags at the end (no markdown)."
+)
+
+
+def _nvidia_model_name(model: str) -> str:
+    return model if model.startswith("openai/") else f"openai/{model}"
+
+
+def _nvidia_llm(model_name: str, api_key: str, base_url: str) -> "ChatOpenAI":
+    return _get_or_create_llm(
+        _llm_cache_key("nvidia", model_name, api_key, base_url, 0.7, 500),
+        lambda: _lazy_module("langchain_openai").ChatOpenAI(
+            model=model_name,
+            base_url=base_url,
+            api_key=api_key,
+            temperature=0.7,
+            max_tokens=500,
+            max_retries=3,
+            timeout=30,
+            http_client=_HTTP_CLIENT,
+            http_async_client=_HTTP_ASYNC_CLIENT,
+        ),
+        owns_connections=False,
+    )
+
+
+def _openai_llm(model_name: str, api_key: Optional[str]) -> "ChatOpenAI":
+    return _get_or_create_llm(
+        _llm_cache_key("openai", model_name, api_key, None, 0.7, 500),
+        lambda: _lazy_module("langchain_openai").ChatOpenAI(
+            model=model_name,
+            api_key=api_key,
+            temperature=0.7,
+            max_tokens=500,
+            max_retries=3,
+            timeout=30,
+            http_client=_HTTP_CLIENT,
+            http_async_client=_HTTP_ASYNC_CLIENT,
+        ),
+        owns_connections=False,
+    )
+
+
+def _build_providers(openai_api_key: Optional[str] = None) -> List[tuple[str, object, object]]:
     """
-    Generate a LinkedIn post using CrewAI agents.
-    
-    Args:
-        topic: The main topic for the post
-        additional_context: Optional additional context or requirements
-        
-    Returns:
-        Generated LinkedIn post content
-    """
-    now = datetime.now(timezone.utc)
-    today_iso = now.date().isoformat()
-    current_year = now.year
+    Return configured (provider_name, creator_llm, editor_llm) triples in preference order.
 
-    gemini_api_key = os.getenv("GEMINI_API_KEY")
-    nvidia_api_key = os.getenv("NVIDIA_API_KEY")
-    nvidia_base_url = os.getenv("NVIDIA_BASE_URL")
-    nvidia_model = os.getenv("NVIDIA_MODEL", "meta/llama-3.1-70b-instruct")
-    openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    The editor pass is light rewriting, so it can run on a smaller/faster tier
+    (OPENAI_EDITOR_MODEL / NVIDIA_EDITOR_MODEL) than the creator.
+    """
+    env = _ENV
+    gemini_api_key = env.gemini_key
+    nvidia_api_key = env.nvidia_key
+    nvidia_base_url = env.nvidia_base_url
+    nvidia_model = env.nvidia_model
+    nvidia_editor_model = env.nvidia_editor_model or nvidia_model
+    openai_creator_model = env.openai_creator_model or env.openai_model
+    openai_editor_model = env.openai_editor_model
 
-    providers: List[tuple[str, object]] = []
+    providers: List[tuple[str, object, object]] = []
     if gemini_api_key:
-        providers.append(("gemini", "gemini/gemini-2.5-flash"))
+        providers.append(("gemini", "gemini/gemini-2.5-flash", "gemini/gemini-2.5-flash"))
     if nvidia_api_key and nvidia_base_url:
-        model_name = nvidia_model if nvidia_model.startswith("openai/") else f"openai/{nvidia_model}"
         providers.append(
             (
                 "nvidia",
-                ChatOpenAI(
-                    model=model_name,
-                    base_url=nvidia_base_url,
-                    api_key=nvidia_api_key,
-                    temperature=0.7,
-                    max_tokens=500,
-                ),
+                _nvidia_llm(_nvidia_model_name(nvidia_model), nvidia_api_key, nvidia_base_url),
+                _nvidia_llm(_nvidia_model_name(nvidia_editor_model), nvidia_api_key, nvidia_base_url),
             )
         )
-    if openai_api_key or os.getenv("OPENAI_API_KEY"):
+    if openai_api_key or env.openai_key:
         providers.append(
             (
                 "openai",
-                ChatOpenAI(
-                    model=openai_model,
-                    api_key=openai_api_key,
-                    temperature=0.7,
-                    max_tokens=500,
-                ),
+                _openai_llm(openai_creator_model, openai_api_key),
+                _openai_llm(openai_editor_model, openai_api_key),
             )
         )
 
@@ -147,142 +493,608 @@ def generate_linkedin_post(
             "No AI provider configured. Set GEMINI_API_KEY or (NVIDIA_API_KEY and NVIDIA_BASE_URL), "
             "or store an OpenAI API key for the user (or set OPENAI_API_KEY)."
         )
-    
+    return providers
+
+
+async def _build_generation_prompt(
+    llm,
+    *,
+    topic: str,
+    additional_context: Optional[str],
+    profile_context: Optional[Dict[str, Optional[str]]],
+    trending_topics: Optional[List[Dict[str, Optional[str]]]],
+    user_niche: Optional[str],
+) -> str:
+    """Run trend research alongside prompt assembly and return the final creation prompt."""
+    now = datetime.now(timezone.utc)
+    today_iso = now.date().isoformat()
+    current_year = now.year
+
+    research = (
+        _run_trend_research(
+            llm,
+            _build_research_prompt(
+                topic=topic,
+                user_niche=user_niche,
+                trending_topics=trending_topics,
+                today_iso=today_iso,
+                current_year=current_year,
+            ),
+        )
+        if trending_topics
+        else _no_trend_research()
+    )
+    trend_result, generation_prompt = await asyncio.gather(
+        research,
+        _prepare_creation_context(
+            topic=topic,
+            additional_context=additional_context,
+            profile_context=profile_context,
+            user_niche=user_niche,
+            today_iso=today_iso,
+            current_year=current_year,
+        ),
+        return_exceptions=True,
+    )
+    if isinstance(generation_prompt, BaseException):
+        raise generation_prompt
+    if isinstance(trend_result, BaseException):
+        logger.warning("Trend research failed, continuing without it: %s", trend_result)
+        trend_result = ""
+    if trend_result:
+        return "\n\n".join((generation_prompt, f"Live trend research (conversation starters):\n{trend_result}"))
+    return generation_prompt
+
+
+def _creation_task(content_creator, generation_prompt: str):
+    return _lazy_module("crewai").Task(
+        description=generation_prompt,
+        agent=content_creator,
+        expected_output=_POST_EXPECTED_OUTPUT,
+    )
+
+
+def _author_prompt(generation_prompt: str) -> str:
+    return f"{generation_prompt}\n\n{_SELF_EDIT_INSTRUCTION}"
+
+
+def _clean_post_text(raw: object) -> str:
+    post_text = str(raw).strip()
+    if post_text.startswith('"') and post_text.endswith('"'):
+        post_text = post_text[1:-1]
+    return post_text
+
+
+def _looks_truncated(post_text: str) -> bool:
+    """True when a post stops mid-sentence, i.e. the output cap was probably hit."""
+    tail = post_text.rstrip()
+    if not tail or tail.split()[-1].startswith("#"):
+        return False
+    return tail[-1].isalnum() or tail[-1] in ",;:-("
+
+
+async def generate_linkedin_post_async(
+    topic: str,
+    additional_context: Optional[str] = None,
+    profile_context: Optional[Dict[str, Optional[str]]] = None,
+    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None,
+    user_niche: Optional[str] = None,
+    openai_api_key: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+) -> str:
+    """
+    Generate a LinkedIn post using CrewAI agents.
+
+    Trend research runs on its own crew concurrently with prompt assembly; its brief is then
+    injected into the creation prompt. A failed research step degrades to the no-trend path.
+
+    Args:
+        topic: The main topic for the post
+        additional_context: Optional additional context or requirements
+        max_tokens: Output cap for the writing passes (defaults to the per-role caps). A post
+            that comes back cut off mid-sentence is regenerated once with twice the cap.
+
+    Returns:
+        Generated LinkedIn post content
+    """
+    if not topic or not topic.strip():
+        raise ValueError("Topic is required to generate a LinkedIn post.")
+    providers = _build_providers(openai_api_key)
+    crewai = _lazy_module("crewai")
+
     last_error: Optional[Exception] = None
-    for provider_name, llm in providers:
+    for provider_name, llm, editor_llm in providers:
+        breaker = _breaker_key(provider_name, llm)
+        if not await _provider_available(breaker, llm):
+            continue
         try:
-            # Create agents (conditionally include research analyst)
-            agents = []
-            tasks = []
-
-            trend_task = None
-            if trending_topics:
-                trend_agent = create_trend_research_agent(llm)
-                agents.append(trend_agent)
-
-                trend_brief = format_trend_brief(trending_topics)
-                research_prompt = f"""
-                You are scouting timely topics for a LinkedIn creator.
-                Today's date (UTC): {today_iso}. The current year is {current_year}.
-
-                User niche: {user_niche or 'General professional audience'}
-                Requested angle/topic: {topic}
-
-                Live internet research results:
-                {trend_brief}
-
-                Requirements:
-                - Output 3 concise conversation starters tailored to the user niche
-                - Each starter must reference one of the live findings or data points
-                - Include one punchy supporting insight or stat per starter
-                - Focus on themes that can lead to fun, witty, and high-signal posts
-                - Keep bullets under 40 words
-                - Do NOT mention outdated years (e.g. 2025) unless a live finding explicitly references it.
-
-                Respond ONLY with the three bullet points.
-                """.strip()
-
-                trend_task = Task(
-                    description=research_prompt,
-                    agent=trend_agent,
-                    expected_output="Three bullet points highlighting trend-backed conversational angles.",
-                )
-                tasks.append(trend_task)
-
-            content_creator = create_content_creator_agent(llm)
-            editor = create_editor_agent(llm)
-            agents.extend([content_creator, editor])
-
-            # Build the generation prompt
-            profile_summary = _compress_profile_context(profile_context)
-            generation_prompt = f"""Write a high-IQ, human-style LinkedIn post about {topic}.
-
-            Date context:
-            - Today's date (UTC): {today_iso}
-            - Current year: {current_year}
-            - Do NOT say "as we approach 2025" or reference outdated years unless the user asked for it.
-            """.strip()
-
-            if additional_context:
-                generation_prompt += f"\n\nAdditional context: {additional_context}"
-
-            if profile_summary:
-                generation_prompt += f"\n\nAuthor context:\n{profile_summary}"
-            elif user_niche:
-                generation_prompt += f"\n\nAuthor niche: {user_niche}"
-
-            generation_prompt += """
-
-            Requirements (educational, framework-style—like a mini-lesson):
-            - Output MUST be plain text only (no markdown such as bold, headings, or code blocks).
-            - Teach a clear FRAMEWORK or SYSTEM (e.g. "3 phases", "Plan → Do → Review", key steps or principles). Not just one random tip—a repeatable approach.
-            - Include at least 2–3 very practical hacks or moves that the reader can apply this week (e.g. exact questions to ask, micro-routines, checklists, templates in words).
-            - Explain the WHY: why this matters, common mistakes, or the shift in thinking (e.g. "Stop X. Start Y.").
-            - Include one memorable BIG IDEA or takeaway (one line the reader can remember and apply).
-            - Vary the layout so it doesn't always look the same: sometimes a short story then bullets, sometimes "Old way vs New way", sometimes a tight numbered list of hacks. Choose the layout that best fits this topic.
-            - Use structure when it helps: short numbered points or short bullets (but keep it clean and readable).
-            - Keep it under 150 words. Start with a hook; end with an engaging question.
-            - End with 4–7 relevant, niche-specific hashtags on the last 1–2 lines (e.g. #productmanagement #saasgrowth). Keep them lowercase words with # and no extra punctuation.
-            - Use emojis naturally (0-2 max). Avoid jargon; sound personal yet smart.
-            - If live trend research is provided, incorporate ONE timely detail and keep it current.
-
-            Make it feel like an expert sharing a framework—clear intent, structure, and one takeaway—not generic AI fluff."""
-
-            # Create tasks
-            creation_task_context = [trend_task] if trend_task else None
-            creation_task = Task(
-                description=generation_prompt,
-                agent=content_creator,
-                expected_output="A clean, plain-text educational post with a clear framework (phases/steps), a why, one big takeaway, and 4–7 relevant hashtags at the end (no markdown).",
-                context=creation_task_context,
-            )
-            tasks.append(creation_task)
-
-            editing_task = Task(
-                description="""
-                Review and refine the LinkedIn post draft. Ensure it:
-
-                1. Is plain text only (NO markdown such as bold, headings, or code blocks).
-                2. Teaches a clear FRAMEWORK or SYSTEM (phases, steps, or key principles)—not just one isolated tip. Has a memorable big idea or takeaway.
-                3. Contains at least 2–3 concrete, easy-to-apply hacks or moves the reader can try this week.
-                4. Explains the WHY (why it matters, common mistakes, or shift in thinking).
-                5. Is under 150 words (strict limit). Has a compelling hook in the first 1-2 lines.
-                6. Uses a layout that feels intentional and not repetitive: e.g. short story then bullets, or Old way vs New way, or a tight numbered list of hacks—pick what best fits the draft.
-                7. Ends with an engaging question.
-                8. Ends with a clean block of 4–7 relevant, niche-specific hashtags on the last 1–2 lines (e.g. #productmanagement #saasgrowth). Tags should be plain words with # and no extra punctuation.
-                9. Uses emojis naturally (0-2 max). Avoids jargon; sounds human and ready for publication.
-
-                If the post is too long, trim while keeping the framework, hacks, hook, and big takeaway.
-                If it lacks a clear framework, hacks, or takeaway, add them. If it contains markdown symbols (like **bold** or headings), remove them while keeping or adding the final hashtags block.
-                Remove any outdated year references unless explicitly requested.
-
-                Output ONLY the final refined post text, nothing else.
-                """,
-                agent=editor,
-                expected_output="A polished, educational LinkedIn post in clean plain text with a clear framework and 4–7 relevant hashtags at the end (no markdown).",
-                context=[creation_task],
+            logger.info("Using AI provider: %s", provider_name)
+            generation_prompt = await _build_generation_prompt(
+                llm,
+                topic=topic,
+                additional_context=additional_context,
+                profile_context=profile_context,
+                trending_topics=trending_topics,
+                user_niche=user_niche,
             )
-            tasks.append(editing_task)
 
-            print(f"Using AI provider: {provider_name}")
-            crew = Crew(
-                agents=agents,
-                tasks=tasks,
-                verbose=True,
-            )
+            creation_cap = max_tokens or _CREATION_MAX_TOKENS
+            editor_cap = max_tokens or _EDITOR_MAX_TOKENS
+            for attempt in range(2):
+                if _separate_editor_enabled():
+                    content_creator = create_content_creator_agent(llm, creation_cap)
+                    editor = create_editor_agent(editor_llm, editor_cap)
+                    creation_task = _creation_task(content_creator, generation_prompt)
+                    editing_task = crewai.Task(
+                        description=_EDITING_INSTRUCTIONS,
+                        agent=editor,
+                        expected_output=_POST_EXPECTED_OUTPUT,
+                        context=[creation_task],
+                    )
+                    crew = crewai.Crew(
+                        agents=[content_creator, editor],
+                        tasks=[creation_task, editing_task],
+                        verbose=True,
+                    )
+                    await throttle_llm(llm, generation_prompt, creation_cap)
+                    await throttle_llm(editor_llm, generation_prompt, editor_cap)
+                else:
+                    author = create_post_author_agent(llm, creation_cap)
+                    crew = crewai.Crew(
+                        agents=[author],
+                        tasks=[_creation_task(author, _author_prompt(generation_prompt))],
+                        verbose=True,
+                    )
+                    await throttle_llm(llm, generation_prompt, creation_cap)
 
-            result = crew.kickoff()
-            post_text = str(result).strip()
-            if post_text.startswith('"') and post_text.endswith('"'):
-                post_text = post_text[1:-1]
+                post_text = _clean_post_text(await _run_crew_with_retry(crew))
+                if attempt or not _looks_truncated(post_text):
+                    break
+                creation_cap, editor_cap = creation_cap * 2, editor_cap * 2
+            _record_provider_success(breaker)
             return post_text
         except Exception as exc:
+            if _is_provider_outage(exc):
+                _record_provider_failure(breaker)
             last_error = exc
             continue
 
+    if last_error is None:
+        raise ValueError("All AI providers are temporarily unavailable (circuit open). Try again shortly.")
     raise ValueError(f"All AI providers failed. Last error: {last_error}")
 
 
+async def generate_linkedin_post_stream(
+    topic: str,
+    additional_context: Optional[str] = None,
+    profile_context: Optional[Dict[str, Optional[str]]] = None,
+    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None,
+    user_niche: Optional[str] = None,
+    openai_api_key: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """
+    Generate a LinkedIn post and yield the final pass token by token.
+
+    Research runs as usual; the final pass (the single author call, or the editor call when
+    ENABLE_SEPARATE_EDITOR is on) is streamed straight from the chat model so callers see the
+    first tokens immediately. Providers without a LangChain chat model
+    (e.g. the Gemini model string) yield the finished post as a single chunk. Failover to the
+    next provider only happens before anything has been yielded.
+    """
+    if not topic or not topic.strip():
+        raise ValueError("Topic is required to generate a LinkedIn post.")
+    providers = _build_providers(openai_api_key)
+    crewai = _lazy_module("crewai")
+
+    last_error: Optional[Exception] = None
+    for provider_name, llm, editor_llm in providers:
+        breaker = _breaker_key(provider_name, llm)
+        if not await _provider_available(breaker, llm):
+            continue
+        emitted = False
+        try:
+            logger.info("Using AI provider (stream): %s", provider_name)
+            generation_prompt = await _build_generation_prompt(
+                llm,
+                topic=topic,
+                additional_context=additional_context,
+                profile_context=profile_context,
+                trending_topics=trending_topics,
+                user_niche=user_niche,
+            )
+
+            if _separate_editor_enabled():
+                content_creator = create_content_creator_agent(llm, max_tokens)
+                draft_crew = crewai.Crew(
+                    agents=[content_creator],
+                    tasks=[_creation_task(content_creator, generation_prompt)],
+                    verbose=True,
+                )
+                await throttle_llm(llm, generation_prompt, max_tokens or _CREATION_MAX_TOKENS)
+                draft = _clean_post_text(await _run_crew_with_retry(draft_crew))
+                final_agent_factory = create_editor_agent
+                final_llm = _with_max_tokens(editor_llm, max_tokens or _EDITOR_MAX_TOKENS)
+                final_prompt = f"{_EDITING_INSTRUCTIONS}\n\nDraft:\n{draft}"
+            else:
+                final_agent_factory = create_post_author_agent
+                final_llm = _with_max_tokens(llm, max_tokens or _CREATION_MAX_TOKENS)
+                final_prompt = _author_prompt(generation_prompt)
+
+            await throttle_llm(final_llm, final_prompt, getattr(final_llm, "max_tokens", None) or 0)
+            if not hasattr(final_llm, "astream"):
+                final_agent = final_agent_factory(final_llm)
+                final_task = crewai.Task(
+                    description=final_prompt,
+                    agent=final_agent,
+                    expected_output=_POST_EXPECTED_OUTPUT,
+                )
+                final_crew = crewai.Crew(agents=[final_agent], tasks=[final_task], verbose=True)
+                result = await _run_crew_with_retry(final_crew)
+                _record_provider_success(breaker)
+                emitted = True
+                yield _clean_post_text(result)
+                return
+
+            messages = [
+                ("system", "You write and edit educational LinkedIn posts."),
+                ("human", final_prompt),
+            ]
+            async for chunk in final_llm.astream(messages):
+                text = getattr(chunk, "content", None) or ""
+                if text:
+                    emitted = True
+                    yield text
+            _record_provider_success(breaker)
+            return
+        except Exception as exc:
+            if _is_provider_outage(exc):
+                _record_provider_failure(breaker)
+            if emitted:
+                raise
+            last_error = exc
+            continue
+
+    if last_error is None:
+        raise ValueError("All AI providers are temporarily unavailable (circuit open). Try again shortly.")
+    raise ValueError(f"All AI providers failed. Last error: {last_error}")
+
+
+_TOPIC_AND_POST_PROMPT = """
+Pick ONE timely LinkedIn post topic for a {occupation} and write the post.
+Today's date (UTC): {today_iso}; current year: {current_year}.
+
+Live trend findings:
+{trend_brief}
+
+Topic: specific and actionable (not generic), under 12 words, anchored to a finding when one fits.
+{rules}
+
+Respond ONLY with a JSON object: {{"topic": "<topic>", "content": "<post text>"}}
+""".strip()
+
+
+def _topic_and_post_messages(
+    occupation: str, trending_topics: Optional[List[Dict[str, Optional[str]]]]
+) -> List[tuple[str, str]]:
+    now = datetime.now(timezone.utc)
+    prompt = _TOPIC_AND_POST_PROMPT.format(
+        occupation=occupation.strip(),
+        today_iso=now.date().isoformat(),
+        current_year=now.year,
+        trend_brief=format_trend_brief(trending_topics),
+        rules=_RULES_BLOCK,
+    )
+    return [
+        ("system", "You plan and write educational LinkedIn posts. Output JSON only."),
+        ("human", prompt),
+    ]
+
+
+def _parse_topic_and_post(raw: object) -> tuple[str, str]:
+    text = str(raw).strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.find("{"):]
+    start, end = text.find("{"), text.rfind("}")
+    data = json.loads(text[start:end + 1] if start != -1 and end > start else text)
+    topic = str(data.get("topic") or "").strip()
+    content = _clean_post_text(data.get("content") or "")
+    if not topic or not content:
+        raise ValueError("Model response is missing topic or content")
+    return topic, content
+
+
+def _partial_json_string(buf: str, key: str) -> tuple[Optional[str], bool]:
+    """
+    Decode the string value of key from a JSON object still being streamed: (value, complete).
+    The longest prefix that ends on a whole escape is decoded with json.loads (a \\uXXXX high
+    surrogate waits for its pair, so emoji come through intact); (None, False) means not ready.
+    """
+    marker = buf.find(f'"{key}"')
+    if marker == -1:
+        return None, False
+    colon = buf.find(":", marker + len(key) + 2)
+    quote = buf.find('"', colon + 1) if colon != -1 else -1
+    if quote == -1:
+        return None, False
+    i = quote + 1
+    end, complete = len(buf), False
+    while i < len(buf):
+        ch = buf[i]
+        if ch == '"':
+            end, complete = i, True
+            break
+        if ch == "\\":
+            step = 2
+            if buf[i + 1:i + 2] == "u":
+                step = 6
+                if buf[i + 2:i + 3].lower() == "d" and buf[i + 3:i + 4].lower() in ("8", "9", "a", "b"):
+                    step = 12
+            if i + step > len(buf):
+                end = i
+                break
+            i += step
+            continue
+        i += 1
+    try:
+        return json.loads(f'"{buf[quote + 1:end]}"', strict=False), complete
+    except ValueError:
+        return None, False
+
+
+async def suggest_topic_and_post_async(
+    occupation: str,
+    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None,
+    openai_api_key: Optional[str] = None,
+    on_preview: Optional[Callable[[str, str], Any]] = None,
+    preview_chars: int = 600,
+) -> tuple[str, str]:
+    """
+    Choose a topic and write its post in one model call (automation path).
+
+    Replaces the suggest-topics call followed by a separate post generation: the model returns
+    JSON {"topic", "content"}. OpenAI runs in JSON mode; other providers are asked for JSON and
+    parsed leniently. Skips the research/editor crews entirely.
+
+    Chat models are streamed: on_preview(topic, content_head) fires once, as soon as the topic is
+    complete and preview_chars of the post have arrived (or at the end for shorter posts), so
+    callers can start work that only needs the opening (e.g. the image) while decoding finishes.
+    Once a preview has fired, a failure is raised instead of failing over to another provider.
+
+    Returns:
+        (topic, post_content)
+    """
+    if not occupation or not occupation.strip():
+        raise ValueError("Occupation is required to generate a LinkedIn post.")
+    messages = _topic_and_post_messages(occupation, trending_topics)
+
+    last_error: Optional[Exception] = None
+    for provider_name, llm, _editor_llm in _build_providers(openai_api_key):
+        breaker = _breaker_key(provider_name, llm)
+        if not await _provider_available(breaker, llm):
+            continue
+        previewed = False
+        try:
+            sized = _with_max_tokens(llm, _TOPIC_AND_POST_MAX_TOKENS)
+            await throttle_llm(sized, messages[-1][1], _TOPIC_AND_POST_MAX_TOKENS)
+            if hasattr(sized, "astream"):
+                if provider_name == "openai":
+                    sized = sized.bind(response_format={"type": "json_object"})
+                buf = ""
+                async for chunk in sized.astream(messages):
+                    text = getattr(chunk, "content", None) or ""
+                    if not text:
+                        continue
+                    buf += text
+                    if on_preview is not None and not previewed:
+                        topic, topic_done = _partial_json_string(buf, "topic")
+                        head, _ = _partial_json_string(buf, "content")
+                        if topic_done and head and len(head) >= preview_chars:
+                            previewed = True
+                            on_preview(topic.strip(), head[:preview_chars])
+                raw = buf
+            else:
+                # crewai.LLM (Gemini model string): plain completion call, off the loop.
+                raw = await asyncio.to_thread(
+                    sized.call, [{"role": role if role == "system" else "user", "content": text} for role, text in messages]
+                )
+            result = _parse_topic_and_post(raw)
+            _record_provider_success(breaker)
+            if on_preview is not None and not previewed:
+                on_preview(result[0], result[1][:preview_chars])
+            return result
+        except Exception as exc:
+            if _is_provider_outage(exc):
+                _record_provider_failure(breaker)
+            if previewed:
+                raise
+            last_error = exc
+            continue
+
+    if last_error is None:
+        raise ValueError("All AI providers are temporarily unavailable (circuit open). Try again shortly.")
+    raise ValueError(f"All AI providers failed. Last error: {last_error}")
+
+
+@dataclass
+class TopicPostJob:
+    """One user's fused topic + post request in an OpenAI Batch API submission."""
+
+    custom_id: str
+    occupation: str
+    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None
+
+
+def _openai_batch_client():
+    if not _ENV.openai_key:
+        raise ValueError("OPENAI_API_KEY is required for batch generation.")
+    return _get_or_create_llm(
+        _llm_cache_key("openai-batch", _ENV.openai_key),
+        lambda: _lazy_module("openai").OpenAI(api_key=_ENV.openai_key, http_client=_HTTP_CLIENT),
+        owns_connections=False,
+    )
+
+
+def submit_topic_and_post_batch(jobs: List[TopicPostJob]) -> str:
+    """
+    Submit fused topic + post requests to the OpenAI Batch API (24h window, discounted tokens)
+    under the server OPENAI_API_KEY. Blocking; returns the batch id.
+    """
+    model = _ENV.openai_creator_model or _ENV.openai_model
+    lines = []
+    for job in jobs:
+        messages = _topic_and_post_messages(job.occupation, job.trending_topics)
+        body = {
+            "model": model,
+            "messages": [
+                {"role": "system" if role == "system" else "user", "content": text} for role, text in messages
+            ],
+            "max_tokens": _TOPIC_AND_POST_MAX_TOKENS,
+            "temperature": 0.7,
+            "response_format": {"type": "json_object"},
+        }
+        lines.append(
+            json.dumps({"custom_id": job.custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+        )
+    client = _openai_batch_client()
+    input_file = client.files.create(
+        file=("automation-batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def collect_topic_and_post_batch(batch_id: str) -> tuple[str, Dict[str, Union[tuple[str, str], str]]]:
+    """
+    Check a submitted batch. Blocking.
+
+    Returns (status, results): results maps custom_id to (topic, content), or to an error
+    message for rows that failed; it is empty until status is "completed".
+    """
+    client = _openai_batch_client()
+    batch = client.batches.retrieve(batch_id)
+    results: Dict[str, Union[tuple[str, str], str]] = {}
+    if batch.status != "completed":
+        return batch.status, results
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).iter_lines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            custom_id = row.get("custom_id")
+            response = row.get("response") or {}
+            if response.get("status_code") != 200:
+                results[custom_id] = str(row.get("error") or response.get("body") or "Batch request failed")
+                continue
+            try:
+                raw = response["body"]["choices"][0]["message"]["content"]
+                results[custom_id] = _parse_topic_and_post(raw)
+            except Exception as exc:
+                results[custom_id] = str(exc)
+    return batch.status, results
+
+
+async def warmup() -> None:
+    """
+    Prime the pooled connections of the server-side providers with a 1-token request each,
+    so the first user request does not pay the TCP/TLS handshake. Failures are only logged.
+    """
+    try:
+        providers = _build_providers()
+    except ValueError:
+        return
+
+    llms = []
+    for provider_name, llm, editor_llm in providers:
+        for candidate in (llm, editor_llm):
+            if hasattr(candidate, "invoke") and all(candidate is not seen for _, seen in llms):
+                llms.append((provider_name, candidate))
+
+    async def _ping(provider_name: str, llm: Any) -> None:
+        probe = llm.model_copy(update={"cache": False, "max_tokens": 1})
+        try:
+            # Opens a connection in the shared _HTTP_ASYNC_CLIENT pool that later requests reuse.
+            await probe.ainvoke("hi")
+        except Exception as exc:
+            logger.warning("Warmup for provider %s failed: %s", provider_name, exc)
+
+    await asyncio.gather(*(_ping(name, llm) for name, llm in llms))
+    logger.info("Warmed up %d LLM connection(s)", len(llms))
+
+
+@dataclass
+class PostRequest:
+    """Inputs for one post in a batch generation call (mirrors generate_linkedin_post)."""
+
+    topic: str
+    additional_context: Optional[str] = None
+    profile_context: Optional[Dict[str, Optional[str]]] = None
+    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None
+    user_niche: Optional[str] = None
+    openai_api_key: Optional[str] = None
+    max_tokens: Optional[int] = None
+
+
+async def generate_linkedin_posts_batch(
+    requests: List[PostRequest],
+    max_concurrency: int = _LLM_CONCURRENCY,
+) -> List[Union[str, BaseException]]:
+    """
+    Generate several posts concurrently, at most max_concurrency at a time.
+
+    Results are returned in request order; a failed request yields its exception in place
+    of the post text rather than failing the whole batch.
+    """
+    sem = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _one(request: PostRequest) -> str:
+        async with sem:
+            return await generate_linkedin_post_async(**asdict(request))
+
+    return await asyncio.gather(*(_one(r) for r in requests), return_exceptions=True)
+
+
+def generate_linkedin_post(
+    topic: str,
+    additional_context: Optional[str] = None,
+    profile_context: Optional[Dict[str, Optional[str]]] = None,
+    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None,
+    user_niche: Optional[str] = None,
+    openai_api_key: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+) -> str:
+    """
+    Synchronous wrapper around generate_linkedin_post_async for threads and scripts.
+
+    Async callers (FastAPI handlers) should await generate_linkedin_post_async directly. If this
+    wrapper is called while an event loop is running in the current thread, the coroutine is
+    run on a fresh loop in a helper thread instead of failing.
+    """
+    coro_kwargs = dict(
+        topic=topic,
+        additional_context=additional_context,
+        profile_context=profile_context,
+        trending_topics=trending_topics,
+        user_niche=user_niche,
+        openai_api_key=openai_api_key,
+        max_tokens=max_tokens,
+    )
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(generate_linkedin_post_async(**coro_kwargs))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, generate_linkedin_post_async(**coro_kwargs)).result()
+
+
 if __name__ == "__main__":
     # Test the agent
     test_topic = "The future of remote work and its impact on team collaboration"
@@ -2,38 +2,87 @@
 
 import json
 import os
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+
+from agents import _get_or_create_llm, _lazy_module, _llm_cache_key
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+
+@dataclass(frozen=True)
+class _Env:
+    gemini_key: Optional[str]
+    nvidia_key: Optional[str]
+    nvidia_base_url: Optional[str]
+    nvidia_model: str
+    nvidia_editor_model: Optional[str]
+    openai_key: Optional[str]
+    openai_editor_model: str
+
+
+def _read_env() -> _Env:
+    return _Env(
+        gemini_key=os.getenv("GEMINI_API_KEY"),
+        nvidia_key=os.getenv("NVIDIA_API_KEY"),
+        nvidia_base_url=os.getenv("NVIDIA_BASE_URL"),
+        nvidia_model=os.getenv("NVIDIA_MODEL", "meta/llama-3.1-70b-instruct"),
+        nvidia_editor_model=os.getenv("NVIDIA_EDITOR_MODEL"),
+        openai_key=os.getenv("OPENAI_API_KEY"),
+        openai_editor_model=os.getenv("OPENAI_EDITOR_MODEL", "gpt-4o-mini"),
+    )
+
+
+_ENV = _read_env()
+
 
-from crewai import Agent, Crew, Task
-from langchain_openai import ChatOpenAI
+def reload_env() -> _Env:
+    """Re-read provider settings from the environment (tests, or after the .env file changes)."""
+    global _ENV
+    _ENV = _read_env()
+    return _ENV
 
 
-def _build_llm(openai_api_key: Optional[str] = None):
-    gemini_api_key = os.getenv("GEMINI_API_KEY")
-    nvidia_api_key = os.getenv("NVIDIA_API_KEY")
-    nvidia_base_url = os.getenv("NVIDIA_BASE_URL")
-    nvidia_model = os.getenv("NVIDIA_MODEL", "meta/llama-3.1-70b-instruct")
-    openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+def _build_llm(openai_api_key: Optional[str] = None) -> Union[str, "ChatOpenAI"]:
+    env = _ENV
+    gemini_api_key = env.gemini_key
+    nvidia_api_key = env.nvidia_key
+    nvidia_base_url = env.nvidia_base_url
+    # Profile insights are pure JSON summarization, so always use the small/fast tier.
+    nvidia_model = env.nvidia_editor_model or env.nvidia_model
+    openai_model = env.openai_editor_model
 
     if gemini_api_key:
         return "gemini/gemini-2.5-flash"
 
     if nvidia_api_key and nvidia_base_url:
         model_name = nvidia_model if nvidia_model.startswith("openai/") else f"openai/{nvidia_model}"
-        return ChatOpenAI(
-            model=model_name,
-            base_url=nvidia_base_url,
-            api_key=nvidia_api_key,
-            temperature=0.2,
-            max_tokens=600,
+        return _get_or_create_llm(
+            _llm_cache_key("nvidia", model_name, nvidia_api_key, nvidia_base_url, 0.2, 600),
+            lambda: _lazy_module("langchain_openai").ChatOpenAI(
+                model=model_name,
+                base_url=nvidia_base_url,
+                api_key=nvidia_api_key,
+                temperature=0.2,
+                max_tokens=600,
+            ),
         )
 
-    if openai_api_key or os.getenv("OPENAI_API_KEY"):
-        return ChatOpenAI(
-            model=openai_model,
-            api_key=openai_api_key,
-            temperature=0.2,
-            max_tokens=600,
+    if openai_api_key or env.openai_key:
+        return _get_or_create_llm(
+            _llm_cache_key("openai", openai_model, openai_api_key, None, 0.2, 600),
+            lambda: _lazy_module("langchain_openai").ChatOpenAI(
+                model=openai_model,
+                api_key=openai_api_key,
+                temperature=0.2,
+                max_tokens=600,
+            ),
         )
 
     raise ValueError(
@@ -42,6 +91,77 @@ def _build_llm(openai_api_key: Optional[str] = None):
     )
 
 
+_ALLOWED = ("headline", "summary", "experiences", "skills", "industry", "location")
+
+
+def _years(duration_in_days: Any) -> Optional[float]:
+    if not isinstance(duration_in_days, (int, float)) or duration_in_days <= 0:
+        return None
+    return round(duration_in_days / 365, 1)
+
+
+def _compact_profile(scraped_profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce the scraper output to the allowlisted fields the analyst needs and
+    serialize it compactly, instead of slicing the full JSON mid-key.
+    """
+    user_profile = scraped_profile.get("userProfile") or {}
+    source = {
+        "headline": scraped_profile.get("headline") or user_profile.get("title"),
+        "summary": scraped_profile.get("summary") or user_profile.get("description"),
+        "industry": scraped_profile.get("industry") or user_profile.get("industry"),
+        "location": scraped_profile.get("location") or user_profile.get("location"),
+        "experiences": [
+            {
+                k: v
+                for k, v in (
+                    ("title", exp.get("title")),
+                    ("company", exp.get("company")),
+                    ("years", _years(exp.get("durationInDays"))),
+                )
+                if v
+            }
+            for exp in (scraped_profile.get("experiences") or [])[:5]
+            if isinstance(exp, dict)
+        ],
+        "skills": [
+            skill.get("skillName") if isinstance(skill, dict) else skill
+            for skill in (scraped_profile.get("skills") or [])[:10]
+        ],
+    }
+    source["skills"] = [skill for skill in source["skills"] if skill]
+    return {k: source[k] for k in _ALLOWED if source.get(k)}
+
+
+def _dumps_compact(data: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _templated_insight(compact: Dict[str, Any], metrics: Dict[str, Any], content_stats: Dict[str, Any]) -> str:
+    """Deterministic insight card for profiles too sparse to be worth an LLM call."""
+    lines = []
+    for label, key in (("Location", "location"), ("Industry", "industry")):
+        if compact.get(key):
+            lines.append(f"{label}: {compact[key]}")
+    if compact.get("skills"):
+        lines.append(f"Skills: {', '.join(compact['skills'][:5])}")
+
+    audience = []
+    if metrics.get("followers") is not None:
+        audience.append(f"{metrics['followers']:,} followers")
+    if metrics.get("connections") is not None:
+        audience.append(f"{metrics['connections']:,} connections")
+    if audience:
+        lines.append(", ".join(audience))
+    if content_stats.get("published"):
+        lines.append(f"{content_stats['published']} published posts in this workspace.")
+
+    lines.append("Add a headline and experience to your LinkedIn profile to unlock tailored insights.")
+    return "\n".join(lines)
+
+
 def analyze_profile_insights(
     scraped_profile: Dict[str, Any],
     metrics: Dict[str, Any],
@@ -55,9 +175,14 @@ def analyze_profile_insights(
         metrics: Dict with followers/connections counts.
         content_stats: Workspace stats (draft/published counts, avg word count).
     """
+    compact = _compact_profile(scraped_profile or {})
+    if not compact.get("headline") and not compact.get("experiences"):
+        return _templated_insight(compact, metrics or {}, content_stats or {})
+
     llm = _build_llm()
+    crewai = _lazy_module("crewai")
 
-    analyst = Agent(
+    analyst = crewai.Agent(
         role="LinkedIn Intelligence Analyst",
         goal="Summarize LinkedIn profile intelligence for the dashboard.",
         backstory="""You specialize in personal branding analytics. Given structured profile data,
@@ -67,11 +192,11 @@ def analyze_profile_insights(
         allow_delegation=False,
     )
 
-    task = Task(
+    task = crewai.Task(
         description=f"""
         Analyze the following data and provide a concise profile insight card suitable for the dashboard:
 
-        Scraped profile JSON: {json.dumps(scraped_profile)[:4000]}
+        Scraped profile JSON: {_dumps_compact(compact)}
 
         Metrics: {metrics}
 
@@ -87,7 +212,7 @@ def analyze_profile_insights(
         expected_output="Markdown text with summary paragraph plus short bullet list.",
     )
 
-    crew = Crew(agents=[analyst], tasks=[task], verbose=False)
+    crew = crewai.Crew(agents=[analyst], tasks=[task], verbose=False)
     result = crew.kickoff()
     return str(result).strip()
 
@@ -2,63 +2,250 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import textwrap
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, TypeVar, Union
 
-from crewai import Agent, Crew, Task
-from langchain_openai import ChatOpenAI
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional fast path
+    msgspec = None
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast path
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with the LLM stack; cache degrades to exact match
+    np = None
+
+from agents import _get_or_create_llm, _get_or_create_llm_variant, _lazy_module, _llm_cache_key
+from utils.rate_limit import throttle_llm
 from utils.trend_fetcher import format_trend_brief
 
+if TYPE_CHECKING:
+    from crewai import Agent
+    from langchain_openai import OpenAIEmbeddings
 
-def suggest_topics(
-    *,
-    occupation: str,
-    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None,
-    limit: int = 8,
-    openai_api_key: Optional[str] = None,
-) -> List[str]:
-    now = datetime.now(timezone.utc)
-    today_iso = now.date().isoformat()
-    current_year = now.year
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# Topic cache: exact (occupation, trend brief, limit) matches are served from a dict. Near
+# matches compare only the occupation, by cosine similarity of its embedding (OpenAI
+# text-embedding-3-small), and must share the exact trend brief and limit: a different trend
+# brief or count is a different answer, however similar the occupation.
+_TOPIC_CACHE_TTL_SECONDS = int(os.getenv("TOPIC_CACHE_TTL_SECONDS", "21600"))
+_TOPIC_CACHE_SIMILARITY = float(os.getenv("TOPIC_CACHE_SIMILARITY", "0.92"))
+_TOPIC_CACHE_MAX_ENTRIES = 512
+_TOPIC_EXACT_CACHE: Dict[str, tuple[float, List[str]]] = {}
+# (normalized occupation embedding, (trend brief hash, limit), topics, stored_at)
+_TOPIC_CACHE: List[tuple[object, tuple[str, int], List[str], float]] = []
+_TOPIC_CACHE_LOCK = threading.Lock()
+
+
+def _topic_cache_key(occupation: str, trend_brief: str, limit: int) -> str:
+    return f"{occupation.lower()}\n{trend_brief}\n{limit}"
+
+
+def _topic_context_key(trend_brief: str, limit: int) -> tuple[str, int]:
+    return hashlib.sha256(trend_brief.encode("utf-8")).hexdigest(), limit
+
+
+@lru_cache(maxsize=16)
+def _embeddings_client(openai_api_key: Optional[str]) -> OpenAIEmbeddings:
+    """One embeddings client (and connection pool) per API key."""
+    return _lazy_module("langchain_openai").OpenAIEmbeddings(model="text-embedding-3-small", api_key=openai_api_key)
+
+
+async def _embed_occupation(occupation: str, openai_api_key: Optional[str]):
+    """Return the normalized embedding of occupation, or None when embeddings are unavailable."""
+    if np is None or not (openai_api_key or _PROVIDER_CFG.openai_key):
+        return None
+    try:
+        embeddings = _embeddings_client(openai_api_key)
+        vector = np.asarray(await embeddings.aembed_query(occupation.lower()), dtype=np.float32)
+    except Exception as exc:
+        logger.warning("Topic cache embedding failed: %s", exc)
+        return None
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+def _lookup_topic_cache(key_text: str, embedding, context: tuple[str, int]) -> Optional[List[str]]:
+    now = time.time()
+    with _TOPIC_CACHE_LOCK:
+        exact = _TOPIC_EXACT_CACHE.get(key_text)
+        if exact and now - exact[0] < _TOPIC_CACHE_TTL_SECONDS:
+            return list(exact[1])
+        if embedding is None:
+            return None
+        _TOPIC_CACHE[:] = [entry for entry in _TOPIC_CACHE if now - entry[3] < _TOPIC_CACHE_TTL_SECONDS]
+        candidates = [entry for entry in _TOPIC_CACHE if entry[1] == context]
+    if not candidates:
+        return None
+    similarities = np.stack([entry[0] for entry in candidates]) @ embedding
+    best = int(np.argmax(similarities))
+    if float(similarities[best]) >= _TOPIC_CACHE_SIMILARITY:
+        return list(candidates[best][2])
+    return None
+
+
+def _store_topic_cache(key_text: str, embedding, context: tuple[str, int], topics: List[str]) -> None:
+    now = time.time()
+    with _TOPIC_CACHE_LOCK:
+        _TOPIC_EXACT_CACHE[key_text] = (now, list(topics))
+        if len(_TOPIC_EXACT_CACHE) > _TOPIC_CACHE_MAX_ENTRIES:
+            _TOPIC_EXACT_CACHE.pop(next(iter(_TOPIC_EXACT_CACHE)))
+        if embedding is not None:
+            _TOPIC_CACHE.append((embedding, context, list(topics), now))
+            del _TOPIC_CACHE[:-_TOPIC_CACHE_MAX_ENTRIES]
+
+
+# Topic suggestion is one prompt -> one completion, so chat models are called directly.
+# TOPIC_USE_CREWAI=true restores the Agent/Task/Crew path.
+_USE_CREWAI = os.getenv("TOPIC_USE_CREWAI", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+# Static agent config, built once. The Agent itself is created per call because CrewAI
+# mutates it during a run.
+_TOPIC_STRATEGIST_CFG = dict(
+    role="Topic Strategist",
+    goal="Generate timely, high-signal LinkedIn post topic ideas tailored to the user's occupation.",
+    backstory="You are a senior LinkedIn growth strategist who turns fresh industry signals into strong post angles.",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class _ProviderConfig:
+    gemini_key: Optional[str]
+    nvidia_key: Optional[str]
+    nvidia_base_url: Optional[str]
+    nvidia_model_name: str
+    openai_key: Optional[str]
+    openai_model: str
+
+
+def _build_provider_cfg() -> _ProviderConfig:
+    nvidia_model = (os.getenv("NVIDIA_MODEL") or "meta/llama-3.1-70b-instruct").strip()
+    return _ProviderConfig(
+        gemini_key=os.getenv("GEMINI_API_KEY"),
+        nvidia_key=os.getenv("NVIDIA_API_KEY"),
+        nvidia_base_url=os.getenv("NVIDIA_BASE_URL"),
+        nvidia_model_name=nvidia_model if nvidia_model.startswith("openai/") else f"openai/{nvidia_model}",
+        openai_key=os.getenv("OPENAI_API_KEY"),
+        openai_model=(os.getenv("OPENAI_MODEL") or "gpt-4o-mini").strip(),
+    )
+
+
+_PROVIDER_CFG = _build_provider_cfg()
+
+
+def reload_provider_cfg() -> _ProviderConfig:
+    """Re-read provider settings from the environment (tests, or after the .env file changes)."""
+    global _PROVIDER_CFG
+    _PROVIDER_CFG = _build_provider_cfg()
+    return _PROVIDER_CFG
 
-    occupation_clean = (occupation or "").strip()
-    if not occupation_clean:
-        raise ValueError("occupation is required")
 
-    gemini_api_key = os.getenv("GEMINI_API_KEY")
-    nvidia_api_key = os.getenv("NVIDIA_API_KEY")
-    nvidia_base_url = os.getenv("NVIDIA_BASE_URL")
-    nvidia_model = os.getenv("NVIDIA_MODEL", "meta/llama-3.1-70b-instruct")
-    openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+@lru_cache(maxsize=1)
+def _gemini_chat_cls():
+    """ChatGoogleGenerativeAI, or None without langchain_google_genai (Gemini then goes through CrewAI/litellm)."""
+    try:
+        return _lazy_module("langchain_google_genai").ChatGoogleGenerativeAI
+    except ImportError:
+        return None
+
+
+# Server-side schema constraints so providers always return parseable topic lists.
+# OpenAI structured outputs require an object at the root, so topics are wrapped in
+# {"topics": [...]}; Gemini accepts a bare array. NVIDIA NIM models are left unconstrained
+# (json_schema support varies per model) and rely on the tolerant stream scanner.
+_TOPICS_ARRAY_SCHEMA = {"type": "array", "items": {"type": "string"}, "minItems": 3, "maxItems": 20}
+_OPENAI_TOPICS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "topics",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"topics": {"type": "array", "items": {"type": "string"}}},
+            "required": ["topics"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _build_providers(openai_api_key: Optional[str] = None) -> List[tuple[str, object]]:
+    """Return configured (provider_name, llm) pairs."""
+    cfg = _PROVIDER_CFG
+    gemini_api_key = cfg.gemini_key
+    nvidia_api_key = cfg.nvidia_key
+    nvidia_base_url = cfg.nvidia_base_url
+    openai_model = cfg.openai_model
 
     providers: List[tuple[str, object]] = []
     if gemini_api_key:
-        providers.append(("gemini", "gemini/gemini-2.5-flash"))
+        gemini_cls = _gemini_chat_cls()
+        if gemini_cls is not None and not _USE_CREWAI:
+            gemini_llm: object = _get_or_create_llm(
+                _llm_cache_key("gemini", "gemini-2.5-flash", gemini_api_key, None, 0.5, 400, "json_schema"),
+                lambda: gemini_cls(
+                    model="gemini-2.5-flash",
+                    google_api_key=gemini_api_key,
+                    temperature=0.5,
+                    max_output_tokens=400,
+                    response_mime_type="application/json",
+                    response_schema=_TOPICS_ARRAY_SCHEMA,
+                ),
+            )
+        else:
+            gemini_llm = "gemini/gemini-2.5-flash"
+        providers.append(("gemini", gemini_llm))
     if nvidia_api_key and nvidia_base_url:
-        model_name = nvidia_model if nvidia_model.startswith("openai/") else f"openai/{nvidia_model}"
+        model_name = cfg.nvidia_model_name
         providers.append(
             (
                 "nvidia",
-                ChatOpenAI(
-                    model=model_name,
-                    base_url=nvidia_base_url,
-                    api_key=nvidia_api_key,
-                    temperature=0.5,
-                    max_tokens=400,
+                _get_or_create_llm(
+                    _llm_cache_key("nvidia", model_name, nvidia_api_key, nvidia_base_url, 0.5, 400),
+                    lambda: _lazy_module("langchain_openai").ChatOpenAI(
+                        model=model_name,
+                        base_url=nvidia_base_url,
+                        api_key=nvidia_api_key,
+                        temperature=0.5,
+                        max_tokens=400,
+                    ),
                 ),
             )
         )
-    if openai_api_key or os.getenv("OPENAI_API_KEY"):
+    if openai_api_key or cfg.openai_key:
         providers.append(
             (
                 "openai",
-                ChatOpenAI(
-                    model=openai_model,
-                    api_key=openai_api_key,
-                    temperature=0.5,
-                    max_tokens=400,
+                _get_or_create_llm(
+                    _llm_cache_key("openai", openai_model, openai_api_key, None, 0.5, 400, "json_schema"),
+                    lambda: _lazy_module("langchain_openai").ChatOpenAI(
+                        model=openai_model,
+                        api_key=openai_api_key,
+                        temperature=0.5,
+                        max_tokens=400,
+                        model_kwargs={"response_format": _OPENAI_TOPICS_RESPONSE_FORMAT},
+                    ),
                 ),
             )
         )
@@ -68,71 +255,527 @@ def suggest_topics(
             "No AI provider configured. Set GEMINI_API_KEY or (NVIDIA_API_KEY and NVIDIA_BASE_URL), "
             "or store an OpenAI API key for the user (or set OPENAI_API_KEY)."
         )
+    return providers
 
-    limit = max(3, min(int(limit or 8), 20))
-    trend_brief = format_trend_brief(trending_topics) if trending_topics else "No live trend data was available."
 
-    last_error: Optional[Exception] = None
-    for provider_name, llm in providers:
+_NO_TRENDS_BRIEF = "No live trend data was available."
+_TREND_BRIEF_FIELDS = ("title", "snippet", "source", "date")
+
+
+@lru_cache(maxsize=256)
+def _trend_brief_cached(frozen_trends: tuple[tuple[Optional[str], ...], ...]) -> str:
+    return format_trend_brief([dict(zip(_TREND_BRIEF_FIELDS, values)) for values in frozen_trends])
+
+
+def _trend_brief(trending_topics: Optional[List[Dict[str, Optional[str]]]]) -> str:
+    """format_trend_brief memoized on the fields it actually renders (first 5 trends)."""
+    if not trending_topics:
+        return _NO_TRENDS_BRIEF
+    frozen = tuple(
+        tuple(trend.get(field) for field in _TREND_BRIEF_FIELDS)
+        for trend in trending_topics[:5]
+        if isinstance(trend, dict)
+    )
+    return _trend_brief_cached(frozen) if frozen else _NO_TRENDS_BRIEF
+
+
+# (computed_at, today_iso, year), refreshed at most once per second.
+_TIME_CACHE: tuple[float, str, int] = (0.0, "", 0)
+
+
+def _today_utc() -> tuple[str, int]:
+    global _TIME_CACHE
+    t = time.time()
+    if t - _TIME_CACHE[0] > 1.0:
+        now = datetime.now(timezone.utc)
+        _TIME_CACHE = (t, now.date().isoformat(), now.year)
+    return _TIME_CACHE[1], _TIME_CACHE[2]
+
+
+_PROMPT_TMPL = textwrap.dedent(
+    """
+    Generate {limit} LinkedIn post topic ideas for this occupation:
+    Occupation: {occupation}
+
+    Date context:
+    - Today's date (UTC): {today_iso}
+    - Current year: {year}
+    - Never say "as we approach 2025" or reference outdated years unless a live trend explicitly references it.
+
+    Live trend research (may be empty):
+    {trend_brief}
+
+    Requirements:
+    - Output EXACTLY {limit} items.
+    - Each item should be a short title (5-12 words), not a full post.
+    - Make them specific and actionable (not generic).
+    - If live trend research is provided, incorporate at least ONE timely detail across the list.
+    - Keep them suitable for LinkedIn professionals in this occupation.
+    - Respond ONLY as a JSON array of strings (no markdown, no extra text).
+    """
+).strip()
+
+
+@lru_cache(maxsize=1024)
+def _compiled_prompt(occupation: str, limit: int, today_iso: str, year: int) -> tuple[str, str]:
+    """
+    Pre-render everything except the trend brief for a recurring (occupation, limit, day), so a
+    request only concatenates head + trend_brief + tail.
+    """
+    values = {"limit": limit, "occupation": occupation, "today_iso": today_iso, "year": year}
+    head, tail = _PROMPT_TMPL.split("{trend_brief}", 1)
+    return head.format_map(values), tail.format_map(values)
+
+
+def _decode_topic_list(result: str) -> List[str]:
+    """
+    Decode a JSON array of strings (or the {"topics": [...]} object used by OpenAI structured
+    outputs), validating the shape in the decoder when msgspec is available.
+    """
+    if msgspec is not None:
         try:
-            agent = Agent(
-                role="Topic Strategist",
-                goal="Generate timely, high-signal LinkedIn post topic ideas tailored to the user's occupation.",
-                backstory="You are a senior LinkedIn growth strategist who turns fresh industry signals into strong post angles.",
-                llm=llm,
-                verbose=False,
-                allow_delegation=False,
+            parsed = msgspec.json.decode(
+                result.encode("utf-8"), type=Union[list[str], dict[str, list[str]]], strict=False
             )
+        except msgspec.MsgspecError as exc:
+            raise ValueError(f"AI did not return a JSON array of strings: {exc}") from exc
+        return parsed.get("topics", []) if isinstance(parsed, dict) else parsed
 
-            prompt = f"""
-            Generate {limit} LinkedIn post topic ideas for this occupation:
-            Occupation: {occupation_clean}
-
-            Date context:
-            - Today's date (UTC): {today_iso}
-            - Current year: {current_year}
-            - Never say "as we approach 2025" or reference outdated years unless a live trend explicitly references it.
-
-            Live trend research (may be empty):
-            {trend_brief}
-
-            Requirements:
-            - Output EXACTLY {limit} items.
-            - Each item should be a short title (5-12 words), not a full post.
-            - Make them specific and actionable (not generic).
-            - If live trend research is provided, incorporate at least ONE timely detail across the list.
-            - Keep them suitable for LinkedIn professionals in this occupation.
-            - Respond ONLY as a JSON array of strings (no markdown, no extra text).
-            """.strip()
-
-            task = Task(
-                description=prompt,
-                agent=agent,
-                expected_output="JSON array of strings.",
-            )
+    parsed = orjson.loads(result) if orjson is not None else json.loads(result)
+    if isinstance(parsed, dict):
+        parsed = parsed.get("topics")
+    if not isinstance(parsed, list):
+        raise ValueError("AI did not return a JSON array.")
+    return [item for item in parsed if isinstance(item, str)]
 
-            crew = Crew(agents=[agent], tasks=[task], verbose=False)
-            result = str(crew.kickoff()).strip()
-
-            # Parse JSON array of strings.
-            import json as _json
-
-            parsed = _json.loads(result)
-            if not isinstance(parsed, list):
-                raise ValueError("AI did not return a JSON array.")
-            topics: List[str] = []
-            for item in parsed:
-                if isinstance(item, str):
-                    cleaned = item.strip().strip('"').strip()
-                    if cleaned:
-                        topics.append(cleaned)
-            if len(topics) < 3:
-                raise ValueError("AI returned too few topic suggestions.")
-            return topics[:limit]
-        except Exception as exc:
-            last_error = exc
-            continue
+
+def _parse_topics(result: str, limit: int) -> List[str]:
+    """Parse the model's JSON array of strings into cleaned topic titles."""
+    topics = [topic for topic in (item.strip() for item in _decode_topic_list(result)) if topic]
+    if len(topics) < 3:
+        raise ValueError("AI returned too few topic suggestions.")
+    return topics[:limit]
+
+
+# Per-provider concurrency caps so fan-out across many requests does not trip rate limits.
+# asyncio.Semaphore binds to one event loop, and the sync wrapper runs a fresh loop per call,
+# so semaphores are kept per loop.
+_LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+_PROVIDER_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _provider_semaphore(provider_name: str) -> asyncio.Semaphore:
+    per_loop = _PROVIDER_SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+    semaphore = per_loop.get(provider_name)
+    if semaphore is None:
+        semaphore = per_loop[provider_name] = asyncio.Semaphore(_LLM_MAX_CONCURRENCY)
+    return semaphore
+
+
+async def _call_provider(provider_name: str, llm: object, prompt: str, limit: int) -> List[str]:
+    async with _provider_semaphore(provider_name):
+        await throttle_llm(llm, prompt, getattr(llm, "max_tokens", None) or 0)
+        if not _USE_CREWAI and hasattr(llm, "astream"):
+            return await _stream_topics(llm, prompt, limit)
+        return await _run_topic_crew(llm, prompt, limit)
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _scan_array_strings(buffer: str, pos: int, topics: List[str]) -> int:
+    """
+    Consume complete top-level string items of a JSON array from buffer[pos:], appending them
+    to topics. Returns the position to resume from once more text has arrived.
+    """
+    length = len(buffer)
+    while pos < length:
+        char = buffer[pos]
+        if char in " \t\r\n,":
+            pos += 1
+        elif char == '"':
+            try:
+                item, end = _JSON_DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                return pos  # string not complete yet
+            cleaned = item.strip()
+            if cleaned:
+                topics.append(cleaned)
+            pos = end
+        else:
+            return length  # ']' or anything unexpected: stop scanning
+    return pos
+
+
+async def _stream_topics(llm: object, prompt: str, limit: int) -> List[str]:
+    """
+    Stream the completion and stop reading as soon as `limit` titles have been parsed;
+    closing the stream early also closes the HTTP response.
+    """
+    messages = [("system", _TOPIC_STRATEGIST_CFG["backstory"]), ("human", prompt)]
+    topics: List[str] = []
+    buffer = ""
+    pos: Optional[int] = None
+    stream = llm.astream(messages)
+    try:
+        async for chunk in stream:
+            buffer += getattr(chunk, "content", None) or ""
+            if pos is None:
+                start = buffer.find("[")
+                if start < 0:
+                    continue
+                pos = start + 1
+            pos = _scan_array_strings(buffer, pos, topics)
+            if len(topics) >= limit:
+                break
+    finally:
+        await stream.aclose()
+
+    if len(topics) < 3:
+        raise ValueError("AI returned too few topic suggestions.")
+    return topics[:limit]
+
+
+# Idle Topic Strategist agents per LLM, keyed by id(llm). The entry holds the LLM itself so the
+# id cannot be reused by a new client after the LLM cache evicts this one.
+# An agent is checked out for exactly one crew run at a time, since CrewAI binds per-run
+# state (crew, executor) onto it; Task and Crew are still built per call.
+_AGENT_POOL: Dict[int, tuple[object, List[Agent]]] = {}
+_AGENT_POOL_LOCK = threading.Lock()
+_AGENT_POOL_MAX_IDLE = 8
+
+
+def _acquire_agent(llm: object) -> Agent:
+    with _AGENT_POOL_LOCK:
+        entry = _AGENT_POOL.get(id(llm))
+        if entry and entry[0] is llm and entry[1]:
+            return entry[1].pop()
+    return _lazy_module("crewai").Agent(**_TOPIC_STRATEGIST_CFG, llm=llm, verbose=False, allow_delegation=False)
+
+
+def _release_agent(llm: object, agent: Agent) -> None:
+    with _AGENT_POOL_LOCK:
+        entry = _AGENT_POOL.get(id(llm))
+        if entry is None or entry[0] is not llm:
+            entry = _AGENT_POOL[id(llm)] = (llm, [])
+        if len(entry[1]) < _AGENT_POOL_MAX_IDLE:
+            entry[1].append(agent)
+
+
+async def _run_topic_crew(llm: object, prompt: str, limit: int) -> List[str]:
+    crewai = _lazy_module("crewai")
+    agent = _acquire_agent(llm)
+    task = crewai.Task(
+        description=prompt,
+        agent=agent,
+        expected_output="JSON array of strings.",
+    )
+    crew = crewai.Crew(agents=[agent], tasks=[task], verbose=False)
+    result = str(await crew.kickoff_async()).strip()
+    # Only agents whose run completed go back to the pool; a failed/cancelled run may leave stale state.
+    _release_agent(llm, agent)
+    return _parse_topics(result, limit)
+
+
+async def _race_providers(
+    providers: List[tuple[str, object]],
+    call: Callable[[str, object], Awaitable[T]],
+) -> tuple[str, T]:
+    """Run call(name, llm) for every provider concurrently; return the first success, cancel the rest."""
+    pending = {asyncio.create_task(call(provider_name, llm)): provider_name for provider_name, llm in providers}
+    last_error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                provider_name = pending.pop(task)
+                exc = task.exception()
+                if exc is None:
+                    return provider_name, task.result()
+                last_error = exc
+    finally:
+        for task in pending:
+            task.cancel()
 
     raise ValueError(f"All AI providers failed to suggest topics. Last error: {last_error}")
 
 
+async def asuggest_topics(
+    *,
+    occupation: str,
+    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None,
+    limit: int = 8,
+    openai_api_key: Optional[str] = None,
+) -> List[str]:
+    """
+    Suggest topic ideas, racing all configured providers concurrently.
+
+    The first provider to return a valid list wins and the others are cancelled, so latency
+    tracks the fastest healthy provider instead of the sum of failed attempts.
+    """
+    today_iso, current_year = _today_utc()
+
+    occupation_clean = (occupation or "").strip()
+    if not occupation_clean:
+        raise ValueError("occupation is required")
+
+    providers = _build_providers(openai_api_key)
+
+    limit = max(3, min(int(limit or 8), 20))
+    trend_brief = _trend_brief(trending_topics)
+
+    key_text = _topic_cache_key(occupation_clean, trend_brief, limit)
+    context = _topic_context_key(trend_brief, limit)
+    cached = _lookup_topic_cache(key_text, None, context)
+    if cached is not None:
+        return cached
+    embedding = await _embed_occupation(occupation_clean, openai_api_key)
+    cached = _lookup_topic_cache(key_text, embedding, context)
+    if cached is not None:
+        logger.info("Topic suggestions served from semantic cache")
+        return cached
+    head, tail = _compiled_prompt(occupation_clean, limit, today_iso, current_year)
+    prompt = head + trend_brief + tail
+
+    provider_name, topics = await _race_providers(
+        providers, lambda name, llm: _call_provider(name, llm, prompt, limit)
+    )
+    logger.info("Topic suggestions served by provider: %s", provider_name)
+    _store_topic_cache(key_text, embedding, context, topics)
+    return topics
+
+
+def suggest_topics(
+    *,
+    occupation: str,
+    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None,
+    limit: int = 8,
+    openai_api_key: Optional[str] = None,
+) -> List[str]:
+    """Synchronous wrapper around asuggest_topics (for threads and scripts)."""
+    coro_kwargs = dict(
+        occupation=occupation,
+        trending_topics=trending_topics,
+        limit=limit,
+        openai_api_key=openai_api_key,
+    )
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(asuggest_topics(**coro_kwargs))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, asuggest_topics(**coro_kwargs)).result()
+
+
+@dataclass
+class TopicRequest:
+    """One user's inputs in a batched topic-suggestion call (mirrors suggest_topics)."""
+
+    id: str
+    occupation: str
+    trending_topics: Optional[List[Dict[str, Optional[str]]]] = None
+    limit: int = 8
+
+
+_BATCH_GROUP_SIZE = 8
+_BATCH_MAX_TOKENS = 1600
+
+_BATCH_PROMPT_TMPL = textwrap.dedent(
+    """
+    Generate LinkedIn post topic ideas for each request in the JSON array below.
+
+    Date context:
+    - Today's date (UTC): {today_iso}
+    - Current year: {year}
+    - Never say "as we approach 2025" or reference outdated years unless a live trend explicitly references it.
+
+    Requests (each has an id, occupation, the number of topics to return, and live trend research):
+    {requests_json}
+
+    Requirements:
+    - For each request, output EXACTLY `limit` items: short titles (5-12 words), not full posts.
+    - Make them specific, actionable, and suitable for LinkedIn professionals in that occupation.
+    - If a request has live trend research, incorporate at least ONE timely detail across its list.
+    - Respond ONLY as JSON of the shape {{"results": [{{"id": "...", "topics": ["..."]}}]}} with one entry per request id.
+    """
+).strip()
+
+_BATCH_RESULT_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {"id": {"type": "string"}, "topics": {"type": "array", "items": {"type": "string"}}},
+    "required": ["id", "topics"],
+}
+_GEMINI_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {"results": {"type": "array", "items": _BATCH_RESULT_ITEM_SCHEMA}},
+    "required": ["results"],
+}
+_OPENAI_BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "topic_batch",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {**_BATCH_RESULT_ITEM_SCHEMA, "additionalProperties": False},
+                }
+            },
+            "required": ["results"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+if msgspec is not None:
+
+    class _BatchItem(msgspec.Struct):
+        id: str
+        topics: list[str]
+
+    class _BatchResult(msgspec.Struct):
+        results: list[_BatchItem]
+
+
+def _decode_batch(result: str) -> Dict[str, List[str]]:
+    """Decode {"results": [{"id", "topics"}]} into {id: topics}."""
+    if msgspec is not None:
+        try:
+            decoded = msgspec.json.decode(result.encode("utf-8"), type=_BatchResult, strict=False)
+        except msgspec.MsgspecError as exc:
+            raise ValueError(f"AI did not return a valid batch result: {exc}") from exc
+        return {item.id: item.topics for item in decoded.results}
+
+    parsed = orjson.loads(result) if orjson is not None else json.loads(result)
+    results = parsed.get("results") if isinstance(parsed, dict) else None
+    if not isinstance(results, list):
+        raise ValueError("AI did not return a valid batch result.")
+    return {
+        str(item["id"]): [topic for topic in item.get("topics") or [] if isinstance(topic, str)]
+        for item in results
+        if isinstance(item, dict) and "id" in item
+    }
+
+
+def _batch_variant(llm: object) -> object:
+    """The same provider reconfigured for the batch response schema and a larger output budget."""
+    if isinstance(llm, str):
+        return llm
+    gemini_cls = _gemini_chat_cls()
+    if gemini_cls is not None and isinstance(llm, gemini_cls):
+        update = {"response_schema": _GEMINI_BATCH_SCHEMA, "max_output_tokens": _BATCH_MAX_TOKENS}
+    elif "response_format" in (getattr(llm, "model_kwargs", None) or {}):
+        update = {
+            "model_kwargs": {**llm.model_kwargs, "response_format": _OPENAI_BATCH_RESPONSE_FORMAT},
+            "max_tokens": _BATCH_MAX_TOKENS,
+        }
+    else:
+        update = {"max_tokens": _BATCH_MAX_TOKENS}
+    return _get_or_create_llm_variant(llm, lambda: llm.model_copy(update=update), "batch")
+
+
+async def _call_batch_provider(provider_name: str, llm: object, prompt: str) -> Dict[str, List[str]]:
+    async with _provider_semaphore(provider_name):
+        await throttle_llm(llm, prompt, _BATCH_MAX_TOKENS)
+        if not _USE_CREWAI and hasattr(llm, "ainvoke"):
+            messages = [("system", _TOPIC_STRATEGIST_CFG["backstory"]), ("human", prompt)]
+            result = await _batch_variant(llm).ainvoke(messages)
+            return _decode_batch(str(result.content).strip())
+
+        crewai = _lazy_module("crewai")
+        agent = crewai.Agent(**_TOPIC_STRATEGIST_CFG, llm=llm, verbose=False, allow_delegation=False)
+        task = crewai.Task(description=prompt, agent=agent, expected_output="JSON object with a results array.")
+        crew = crewai.Crew(agents=[agent], tasks=[task], verbose=False)
+        return _decode_batch(str(await crew.kickoff_async()).strip())
+
+
+async def _suggest_topics_group(
+    group: List[TopicRequest],
+    providers: List[tuple[str, object]],
+    today_iso: str,
+    current_year: int,
+) -> Dict[str, List[str]]:
+    limits = {req.id: max(3, min(int(req.limit or 8), 20)) for req in group}
+    payload = [
+        {
+            "id": req.id,
+            "occupation": req.occupation.strip(),
+            "limit": limits[req.id],
+            "trend_research": _trend_brief(req.trending_topics),
+        }
+        for req in group
+    ]
+    prompt = _BATCH_PROMPT_TMPL.format_map(
+        {"today_iso": today_iso, "year": current_year, "requests_json": json.dumps(payload, ensure_ascii=False)}
+    )
+    provider_name, raw = await _race_providers(
+        providers, lambda name, llm: _call_batch_provider(name, llm, prompt)
+    )
+    logger.info("Batched topic suggestions for %d request(s) served by provider: %s", len(group), provider_name)
+
+    results: Dict[str, List[str]] = {}
+    for req_id, limit in limits.items():
+        topics = [topic for topic in (item.strip() for item in raw.get(req_id) or []) if topic]
+        if len(topics) >= 3:
+            results[req_id] = topics[:limit]
+    return results
+
+
+async def suggest_topics_batch(
+    requests: List[TopicRequest],
+    openai_api_key: Optional[str] = None,
+    group_size: int = _BATCH_GROUP_SIZE,
+) -> Dict[str, List[str]]:
+    """
+    Suggest topics for many users with one provider call per group of `group_size` requests
+    (groups run concurrently), amortizing the system prompt and round trip across users.
+
+    Requests the batched call misses (absent id, too few topics, or a failed group) are retried
+    through the single-request path. Returns {request id: topics}; ids that still fail are
+    omitted and logged.
+    """
+    valid = [req for req in requests if (req.occupation or "").strip()]
+    if not valid:
+        return {}
+
+    providers = _build_providers(openai_api_key)
+    today_iso, current_year = _today_utc()
+    group_size = max(1, group_size)
+    groups = [valid[i : i + group_size] for i in range(0, len(valid), group_size)]
+
+    group_results = await asyncio.gather(
+        *(_suggest_topics_group(group, providers, today_iso, current_year) for group in groups),
+        return_exceptions=True,
+    )
+    results: Dict[str, List[str]] = {}
+    for group, outcome in zip(groups, group_results):
+        if isinstance(outcome, BaseException):
+            logger.warning("Batched topic suggestion failed for %d request(s): %s", len(group), outcome)
+            continue
+        results.update(outcome)
+
+    missing = [req for req in valid if req.id not in results]
+    if missing:
+        retried = await asyncio.gather(
+            *(
+                asuggest_topics(
+                    occupation=req.occupation,
+                    trending_topics=req.trending_topics,
+                    limit=req.limit,
+                    openai_api_key=openai_api_key,
+                )
+                for req in missing
+            ),
+            return_exceptions=True,
+        )
+        for req, outcome in zip(missing, retried):
+            if isinstance(outcome, BaseException):
+                logger.warning("Topic suggestion failed for request %s: %s", req.id, outcome)
+            else:
+                results[req.id] = outcome
+    return results
@@ -1,6 +1,10 @@
 """FastAPI backend for LinkedIn post generator and publisher."""
 
 import os
+import io
+import logging
+import logging.handlers
+import queue
 import base64
 import random
 import warnings
@@ -10,7 +14,28 @@ from pathlib import Path
 import sys
 import asyncio
 import re
-from typing import Any, Dict
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, BinaryIO, Dict, Union
+
+# Runtime diagnostics go through logging (LOG_LEVEL, default INFO) so error storms can be
+# quieted by level instead of printing a traceback per failed request.
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+# Records are formatted and written to stderr by a listener thread; code on the event loop
+# only enqueues them, so a slow log pipe cannot stall requests.
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *logging.root.handlers, respect_handler_level=True)
+logging.root.handlers = [logging.handlers.QueueHandler(_log_queue)]
+_log_listener.start()
+logger = logging.getLogger(__name__)
 
 # Suppress warnings
 warnings.filterwarnings('ignore', category=UserWarning)
@@ -26,28 +51,45 @@ if sys.platform.startswith("win"):
 # Disable CrewAI telemetry
 os.environ['OTEL_SDK_DISABLED'] = 'true'
 
-from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 import uvicorn
 import secrets
+import html
 import json
 import asyncio
 from starlette.concurrency import run_in_threadpool
+import anyio
+import anyio.to_thread
+import httpx
 import jwt
+from tenacity import retry, retry_if_result, stop_after_attempt, wait_exponential
 from cryptography.fernet import Fernet
 from jwt import PyJWKClient
 
-from agents.linkedin_post_agent import generate_linkedin_post
+from agents import _lazy_module
+from agents.linkedin_post_agent import (
+    generate_linkedin_post_async,
+    generate_linkedin_post_stream,
+    suggest_topic_and_post_async,
+    TopicPostJob,
+    submit_topic_and_post_batch,
+    collect_topic_and_post_batch,
+    warmup as warmup_llms,
+    aclose_http_clients as aclose_llm_http_clients,
+)
 from agents.profile_intel_agent import analyze_profile_insights
-from agents.topic_suggestion_agent import suggest_topics
+from agents.topic_suggestion_agent import asuggest_topics
 from utils.database import (
+    POST_FIELDS,
     PostDatabase,
     UserDatabase,
     FilePostDatabase,
     FileUserDatabase,
     MongoPostDatabase,
+    AsyncMongoPostDatabase,
     MongoUserDatabase,
     MongoAutomationLogStore,
     FileAutomationLogStore,
@@ -57,22 +99,37 @@ from utils.database import (
 from utils.image_generator import generate_post_image
 
 try:
-    from langchain_openai import ChatOpenAI
-except Exception:
-    ChatOpenAI = None
-from utils.linkedin_api import LinkedInAPI, exchange_code_for_token, get_oauth_url
+    import orjson
+    _JSONResponse = ORJSONResponse
+
+    def _sse(payload: dict) -> str:
+        return f"data: {orjson.dumps(payload, default=str).decode()}\n\n"
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+    _JSONResponse = JSONResponse
+
+    def _sse(payload: dict) -> str:
+        return f"data: {json.dumps(payload, default=str)}\n\n"
+
+try:
+    import pybase64 as _b64  # SIMD base64, same API as the stdlib module
+except ImportError:  # pragma: no cover - optional speedup
+    _b64 = base64
+from utils.linkedin_api import LinkedInAPI, aclose_async_client, aexchange_code_for_token, get_oauth_url
 from utils.mailer import EmailSender
 from utils.profile_scraper import (
     extract_basic_profile,
     is_scraper_configured,
     scrape_linkedin_profile,
 )
-from utils.trend_fetcher import TrendingTopicFetcher
+from utils.rate_limit import estimate_tokens, openai_limiter
+from utils.trend_fetcher import TrendingTopicFetcher, rank_trends
 
 app = FastAPI(
     title="LinkedIn Post Generator & Publisher",
     description="AI-powered LinkedIn post generation and publishing system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=_JSONResponse,
 )
 
 # CORS middleware
@@ -84,12 +141,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Env read on hot paths, resolved once at import (the LinkedIn callback's .env reload only
+# touches LinkedIn credentials, which are still read per call).
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+_STORAGE_BUCKET = (os.getenv("SUPABASE_STORAGE_BUCKET") or "linkedinimages").strip()
+_DROPBOX_TOKEN = os.getenv("DROPBOX_ACCESS_TOKEN")
+_CLERK_AUDIENCE = os.getenv("CLERK_AUDIENCE") or None
+_DEBUG_AUTH = os.getenv("DEBUG_AUTH", "").strip().lower() in _TRUTHY
+
 # Initialize database: try MongoDB first, then Supabase, then file fallback
 db = None
 user_db = None
 automation_logs_store = None
 db_init_error = None
 _db_backend = None  # "mongo" | "supabase" | "file"
+# Motor client for the Mongo backend, opened on startup so it binds to the server's event loop.
+async_db: Optional[AsyncMongoPostDatabase] = None
 
 # 1) Try MongoDB if MONGO_DB_URL or MONGODB_URI is set
 if (os.getenv("MONGO_DB_URL") or os.getenv("MONGODB_URI")):
@@ -121,12 +188,7 @@ if db is None and (os.getenv("SUPABASE_URL") and os.getenv("SUPABASE_SERVICE_ROL
 
 # 3) File fallback if enabled
 if db is None:
-    allow_file_fallback = os.getenv("PERSISTENCE_ALLOW_FILE_FALLBACK", "").strip().lower() in {
-        "1",
-        "true",
-        "yes",
-        "on",
-    }
+    allow_file_fallback = os.getenv("PERSISTENCE_ALLOW_FILE_FALLBACK", "").strip().lower() in _TRUTHY
     if allow_file_fallback:
         db = FilePostDatabase(file_path=os.getenv("FILE_POSTS_PATH") or None)
         user_db = FileUserDatabase(file_path=os.getenv("FILE_USERS_PATH") or None)
@@ -142,6 +204,16 @@ if db is None:
         print(f"   Details: {db_init_error}\n")
 
 
+# One Supabase client for Storage uploads: the Supabase post DB's own client, or a storage-only
+# client when posts live in Mongo/files. None when Supabase is not configured.
+_SUPABASE_STORAGE = getattr(db, "client", None)
+if _SUPABASE_STORAGE is None:
+    try:
+        _SUPABASE_STORAGE = get_supabase_storage_client()
+    except Exception as exc:
+        logger.warning("Supabase Storage client unavailable: %s", exc)
+
+
 def _require_db() -> PostDatabase:
     if db is None:
         raise HTTPException(
@@ -155,6 +227,13 @@ def _require_db() -> PostDatabase:
     return db
 
 
+async def _db_call(method: str, *args, **kwargs):
+    """Call a post-store method from async code: awaited on Motor, else run in the threadpool."""
+    if async_db is not None:
+        return await getattr(async_db, method)(*args, **kwargs)
+    return await run_in_threadpool(getattr(_require_db(), method), *args, **kwargs)
+
+
 def _require_user_db() -> UserDatabase:
     if user_db is None:
         raise HTTPException(
@@ -168,19 +247,80 @@ def _require_user_db() -> UserDatabase:
     return user_db
 
 
+async def _user_db_call(method: str, *args, **kwargs):
+    """Call a user-store method from async code without blocking the event loop."""
+    return await run_in_threadpool(getattr(_require_user_db(), method), *args, **kwargs)
+
+
 # --- Clerk JWT verification (for per-user secrets like OpenAI keys) ---
 _jwks_clients: Dict[str, PyJWKClient] = {}
+# Parsed signing keys by (jwks_url, kid), so PyJWKClient doesn't re-parse the JWKS per request.
+_jwks_signing_keys: Dict[tuple, Any] = {}
+
+# Verified claims by sha256(token). Short TTL keeps the window for a revoked token small;
+# entries are also never served past the token's own exp.
+_JWT_CACHE_TTL = int(os.getenv("JWT_CACHE_TTL", "10"))
+_JWT_CACHE_MAX = 10000
+_jwt_claims_cache: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+_jwt_cache_lock = threading.Lock()
 
 
 def _get_jwks_client(jwks_url: str) -> PyJWKClient:
     existing = _jwks_clients.get(jwks_url)
     if existing is not None:
         return existing
-    client = PyJWKClient(jwks_url)
+    # Keep the fetched JWK set for an hour and its parsed keys in PyJWKClient's own LRU too.
+    client = PyJWKClient(jwks_url, cache_keys=True, max_cached_keys=32, lifespan=3600)
     _jwks_clients[jwks_url] = client
     return client
 
 
+def _jwks_url_for_issuer(issuer: str) -> str:
+    return issuer.rstrip("/") + "/.well-known/jwks.json"
+
+
+def _prefetch_jwks(issuer: str) -> None:
+    """Fetch an issuer's JWKS and parse every signing key ahead of the first request."""
+    jwks_url = _jwks_url_for_issuer(issuer)
+    for signing_key in _get_jwks_client(jwks_url).get_signing_keys():
+        if signing_key.key_id:
+            _jwks_signing_keys[(jwks_url, signing_key.key_id)] = signing_key.key
+
+
+def _get_signing_key(jwk_client: PyJWKClient, jwks_url: str, token: str) -> Any:
+    kid = jwt.get_unverified_header(token).get("kid")
+    cache_key = (jwks_url, kid)
+    key = _jwks_signing_keys.get(cache_key)
+    if key is None:
+        key = jwk_client.get_signing_key_from_jwt(token).key
+        if kid:
+            _jwks_signing_keys[cache_key] = key
+    return key
+
+
+def _cached_jwt_claims(cache_key: str) -> Optional[Dict[str, Any]]:
+    now = time.time()
+    with _jwt_cache_lock:
+        entry = _jwt_claims_cache.get(cache_key)
+        if entry is None:
+            return None
+        cached_at, claims = entry
+        exp = claims.get("exp")
+        if now - cached_at > _JWT_CACHE_TTL or (isinstance(exp, (int, float)) and exp <= now):
+            _jwt_claims_cache.pop(cache_key, None)
+            return None
+        _jwt_claims_cache.move_to_end(cache_key)
+        return claims
+
+
+def _store_jwt_claims(cache_key: str, claims: Dict[str, Any]) -> None:
+    with _jwt_cache_lock:
+        _jwt_claims_cache[cache_key] = (time.time(), claims)
+        _jwt_claims_cache.move_to_end(cache_key)
+        while len(_jwt_claims_cache) > _JWT_CACHE_MAX:
+            _jwt_claims_cache.popitem(last=False)
+
+
 def _require_bearer_token(req: Request) -> str:
     auth_header = req.headers.get("Authorization") or ""
     prefix = "Bearer "
@@ -192,7 +332,13 @@ def _require_bearer_token(req: Request) -> str:
 def _verify_clerk_jwt(token: str) -> Dict[str, Any]:
     """
     Verify a Clerk-issued JWT using the token issuer's JWKS.
+    Verified claims are cached briefly (JWT_CACHE_TTL seconds) by token hash.
     """
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    cached = _cached_jwt_claims(token_hash)
+    if cached is not None:
+        return cached
+
     try:
         unverified = jwt.decode(token, options={"verify_signature": False})
     except Exception:
@@ -202,11 +348,11 @@ def _verify_clerk_jwt(token: str) -> Dict[str, Any]:
     if not issuer:
         raise HTTPException(status_code=401, detail="Token issuer missing")
 
-    jwks_url = issuer.rstrip("/") + "/.well-known/jwks.json"
+    jwks_url = _jwks_url_for_issuer(issuer)
     try:
         jwk_client = _get_jwks_client(jwks_url)
-        signing_key = jwk_client.get_signing_key_from_jwt(token).key
-        audience = os.getenv("CLERK_AUDIENCE") or None
+        signing_key = _get_signing_key(jwk_client, jwks_url, token)
+        audience = _CLERK_AUDIENCE
         decoded = jwt.decode(
             token,
             signing_key,
@@ -215,12 +361,13 @@ def _verify_clerk_jwt(token: str) -> Dict[str, Any]:
             audience=audience,
             options={"verify_aud": bool(audience)},
         )
+        _store_jwt_claims(token_hash, decoded)
         return decoded
     except HTTPException:
         raise
     except Exception as exc:
-        if os.getenv("DEBUG_AUTH", "").strip() in {"1", "true", "yes", "on"}:
-            print(f"[auth] JWT verification failed: {exc} (issuer={issuer}, jwks_url={jwks_url})")
+        if _DEBUG_AUTH:
+            logger.warning("JWT verification failed: %s (issuer=%s, jwks_url=%s)", exc, issuer, jwks_url)
         raise HTTPException(status_code=401, detail="Token verification failed")
 
 
@@ -240,6 +387,11 @@ def _maybe_clerk_user_id(req: Request) -> Optional[str]:
         return None
 
 
+@lru_cache(maxsize=1)
+def _build_fernet(key: str) -> Fernet:
+    return Fernet(key.encode("utf-8"))
+
+
 def _get_fernet() -> Fernet:
     key = os.getenv("APP_ENCRYPTION_KEY")
     if not key:
@@ -248,7 +400,7 @@ def _get_fernet() -> Fernet:
             detail="APP_ENCRYPTION_KEY is not configured on the backend.",
         )
     try:
-        return Fernet(key.encode("utf-8"))
+        return _build_fernet(key)
     except Exception:
         raise HTTPException(
             status_code=500,
@@ -284,6 +436,8 @@ def _get_openai_key_for_user(clerk_user_id: str) -> Optional[str]:
 class PostGenerateRequest(BaseModel):
     topic: str
     additional_context: Optional[str] = None
+    # Override the output cap for the writing pass (default ~320 tokens, about one post).
+    max_tokens: Optional[int] = Field(default=None, ge=100, le=2000)
 
 
 class PostPublishRequest(BaseModel):
@@ -342,14 +496,54 @@ def _pick_one_occupation(user_record: dict) -> Optional[str]:
 
 
 def _storage_bucket() -> str:
-    return (os.getenv("SUPABASE_STORAGE_BUCKET") or "linkedinimages").strip()
+    return _STORAGE_BUCKET
+
+
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
 
 
 def _slugify(value: str) -> str:
-    cleaned = re.sub(r"[^a-zA-Z0-9]+", "-", (value or "").strip()).strip("-").lower()
+    cleaned = _SLUG_RE.sub("-", (value or "").strip()).strip("-").lower()
     return cleaned or "post"
 
 
+class _TTLCache:
+    """Small thread-safe LRU with a per-entry TTL (in-process; one per worker)."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.ttl:
+                self._data.pop(key, None)
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+# LLM image prompts by sha256(model|topic|content preview). The API key is not part of the key:
+# the prompt depends only on the inputs, whoever pays for it.
+_image_prompt_cache = _TTLCache(maxsize=2048, ttl=3600)
+
+
 def _generate_image_prompt_with_llm(
     topic: str, content: str, openai_api_key: Optional[str] = None
 ) -> Optional[str]:
@@ -358,15 +552,21 @@ def _generate_image_prompt_with_llm(
     Returns None if no API key or on failure.
     """
     api_key = (openai_api_key or os.getenv("OPENAI_API_KEY") or "").strip()
-    if not api_key or ChatOpenAI is None:
+    if not api_key:
         return None
     content_preview = (content or "")[:600].strip()
     topic_line = (topic or "").strip()
     if not topic_line and not content_preview:
         return None
+    model = os.getenv("OPENAI_IMAGE_PROMPT_MODEL", "gpt-4o-mini")
+    cache_key = hashlib.sha256(f"{model}|{topic_line}|{content_preview}".encode("utf-8")).hexdigest()
+    cached = _image_prompt_cache.get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        llm = ChatOpenAI(
-            model=os.getenv("OPENAI_IMAGE_PROMPT_MODEL", "gpt-4o-mini"),
+        # Imported on first use: langchain_openai is a large import graph.
+        llm = _lazy_module("langchain_openai").ChatOpenAI(
+            model=model,
             api_key=api_key,
             temperature=0.4,
             max_tokens=120,
@@ -379,9 +579,13 @@ Content:
 {content_preview or 'N/A'}
 
 Output ONLY the image prompt, nothing else. One sentence only."""
+        limiter = openai_limiter(api_key)
+        if limiter is not None:
+            limiter.acquire(estimate_tokens(prompt, model) + 120)
         result = llm.invoke(prompt)
         out = (getattr(result, "content", None) or str(result)).strip()
         if out and len(out) > 10:
+            _image_prompt_cache.set(cache_key, out)
             return out
     except Exception:
         pass
@@ -398,41 +602,58 @@ def _build_image_prompt_for_post(
     dynamic = _generate_image_prompt_with_llm(topic, content_snippet, openai_api_key)
     if dynamic:
         return dynamic
-    subject = (topic or "").strip() or (content_snippet[:100] if content_snippet else "").strip() or "Professional insight"
-    return (
-        f"Super-realistic, high-resolution photograph of real people for LinkedIn about: {subject}. "
-        "Natural lighting, authentic expressions, modern professional setting. No text or labels in the image."
-    )
+    return _fallback_image_prompt(topic or "", (content_snippet or "")[:100])
+
+
+# Constant halves of the non-LLM image prompt.
+_IMAGE_PROMPT_PREFIX = "Super-realistic, high-resolution photograph of real people for LinkedIn about: "
+_IMAGE_PROMPT_SUFFIX = (
+    ". Natural lighting, authentic expressions, modern professional setting. No text or labels in the image."
+)
+
+
+@lru_cache(maxsize=2048)
+def _fallback_image_prompt(topic: str, content_head: str) -> str:
+    subject = topic.strip() or content_head.strip() or "Professional insight"
+    return _IMAGE_PROMPT_PREFIX + subject + _IMAGE_PROMPT_SUFFIX
 
 
-def _upload_image(*, image_bytes: bytes, mime_type: str, topic: str, post_id: Optional[int] = None) -> Optional[dict]:
+def _upload_image(
+    *, image_bytes: Union[bytes, BinaryIO], mime_type: str, topic: str, post_id: Optional[int] = None
+) -> Optional[dict]:
     """
     Upload image to storage. Tries Dropbox first (if DROPBOX_ACCESS_TOKEN set), then Supabase.
+    Accepts raw bytes or a binary file object; Supabase gets a stream, so the SDK sends the
+    image in chunks instead of building a second in-memory body.
     Returns dict with url and path, or None if both unavailable (caller can use base64).
     """
+    # BytesIO over an immutable bytes object shares its buffer (no copy).
+    stream = io.BytesIO(image_bytes) if isinstance(image_bytes, bytes) else image_bytes
+
     ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     safe_topic = _slugify(topic)[:60]
     name = f"{safe_topic}-{post_id or 'new'}-{ts}.png"
 
     # 1) Dropbox
-    if os.getenv("DROPBOX_ACCESS_TOKEN"):
+    if _DROPBOX_TOKEN:
         from utils.dropbox_storage import upload_image as dropbox_upload
         path_slug = f"/{datetime.now(timezone.utc).strftime('%Y/%m/%d')}/{name}"
-        result = dropbox_upload(image_bytes, mime_type, path_slug)
+        stream.seek(0)
+        result = dropbox_upload(stream, mime_type, path_slug)
         if result:
             return {"url": result["url"], "path": result["path"], "provider": "dropbox"}
 
     # 2) Supabase
-    database = _require_db()
-    client = getattr(database, "client", None) or get_supabase_storage_client()
+    client = _SUPABASE_STORAGE
     if client is not None:
         bucket = _storage_bucket()
         path = f"posts/{datetime.now(timezone.utc).strftime('%Y/%m/%d')}/{name}"
         try:
             storage = client.storage.from_(bucket)
+            stream.seek(0)
             storage.upload(
                 path,
-                image_bytes,
+                io.BufferedReader(stream),
                 file_options={
                     "content-type": mime_type,
                     "cache-control": "3600",
@@ -447,7 +668,7 @@ def _upload_image(*, image_bytes: bytes, mime_type: str, topic: str, post_id: Op
     return None
 
 
-def _upload_image_to_supabase(*, image_bytes: bytes, mime_type: str, topic: str, post_id: Optional[int] = None) -> dict:
+def _upload_image_to_supabase(*, image_bytes: Union[bytes, BinaryIO], mime_type: str, topic: str, post_id: Optional[int] = None) -> dict:
     """Upload image (Dropbox or Supabase). Raises HTTPException 503 if no storage configured."""
     result = _upload_image(image_bytes=image_bytes, mime_type=mime_type, topic=topic, post_id=post_id)
     if result is not None:
@@ -458,14 +679,95 @@ def _upload_image_to_supabase(*, image_bytes: bytes, mime_type: str, topic: str,
     )
 
 
-def _fetch_image_bytes_from_url(url: str) -> tuple[bytes, str]:
-    import requests
-    res = requests.get(url, timeout=30)
+_LOCAL_IMAGE_PREFIX = "local:"
+_LOCAL_IMAGE_DIR = Path(__file__).resolve().parent / "data" / "images"
+
+
+@retry(
+    retry=retry_if_result(lambda uploaded: uploaded is None),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.5, max=4),
+    retry_error_callback=lambda state: None,
+)
+def _upload_image_with_retry(**kwargs) -> Optional[dict]:
+    return _upload_image(**kwargs)
+
+
+def _store_image(*, image_bytes: bytes, mime_type: str, topic: str) -> dict:
+    """
+    Store raw image bytes (no base64): Dropbox/Supabase with up to 3 attempts when configured,
+    else a file under data/images. Returns {"url", "path", "provider"}; local files have no url
+    and are served by GET /posts/{id}/image.
+    """
+    if _DROPBOX_TOKEN or _SUPABASE_STORAGE is not None:
+        uploaded = _upload_image_with_retry(image_bytes=image_bytes, mime_type=mime_type, topic=topic)
+        if uploaded:
+            return uploaded
+    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    rel = Path(datetime.now(timezone.utc).strftime("%Y/%m/%d")) / (
+        f"{_slugify(topic)[:60]}-{ts}-{secrets.token_hex(4)}.png"
+    )
+    target = _LOCAL_IMAGE_DIR / rel
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(image_bytes)
+    return {"url": None, "path": f"{_LOCAL_IMAGE_PREFIX}{rel.as_posix()}", "provider": "local"}
+
+
+def _read_local_image(storage_path: str) -> Optional[bytes]:
+    # image_storage_path is client-editable (PUT /posts): never read outside the image dir.
+    root = _LOCAL_IMAGE_DIR.resolve()
+    target = (root / storage_path[len(_LOCAL_IMAGE_PREFIX):]).resolve()
+    if root not in target.parents or not target.is_file():
+        return None
+    return target.read_bytes()
+
+
+def _is_local_image(post: dict) -> bool:
+    return str(post.get("image_storage_path") or "").startswith(_LOCAL_IMAGE_PREFIX)
+
+
+# Pooled client for fetching stored post images. Redirects are followed like requests.get did
+# (Dropbox share links redirect).
+_HTTP = httpx.AsyncClient(
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+    follow_redirects=True,
+)
+
+
+def _image_response_payload(res: httpx.Response) -> tuple[bytes, str]:
     res.raise_for_status()
     content_type = res.headers.get("content-type") or "image/png"
     return res.content, content_type.split(";")[0].strip()
 
 
+async def _fetch_image_bytes_from_url(url: str) -> tuple[bytes, str]:
+    return _image_response_payload(await _HTTP.get(url))
+
+
+async def _load_post_image(post: dict) -> tuple[Optional[bytes], str]:
+    """Raw image bytes for a post from remote storage, the local image dir, or legacy base64."""
+    mime_type = post.get("image_mime_type") or "image/png"
+    if post.get("image_url"):
+        try:
+            image_bytes, detected_mime = await _fetch_image_bytes_from_url(str(post["image_url"]))
+            return image_bytes, detected_mime or mime_type
+        except Exception:
+            return None, mime_type
+    if _is_local_image(post):
+        return await run_in_threadpool(_read_local_image, post["image_storage_path"]), mime_type
+    if post.get("image_base64"):
+        return _decode_post_image_base64(post), mime_type
+    return None, mime_type
+
+
+def _with_served_image_url(post: Optional[dict], req: Request) -> Optional[dict]:
+    """Give locally stored images a URL the dashboard can load (GET /posts/{id}/image)."""
+    if not post or post.get("image_url") or not _is_local_image(post) or post.get("id") is None:
+        return post
+    return {**post, "image_url": str(req.url_for("get_post_image", post_id=post["id"]))}
+
+
 class PostEmailRequest(BaseModel):
     recipients: List[str]
     subject: Optional[str] = None
@@ -489,15 +791,135 @@ class OpenAIKeyPayload(BaseModel):
     openai_api_key: str
 
 
+# Profile details by (PROFILE_URN, token hash): a reconnect with a new token refetches.
+_profile_context_cache = _TTLCache(maxsize=64, ttl=3600)
+
+
+@lru_cache(maxsize=4)
+def _linkedin_client(access_token: Optional[str], profile_urn: Optional[str]) -> LinkedInAPI:
+    return LinkedInAPI(access_token=access_token, profile_urn=profile_urn)
+
+
+def _linkedin_api() -> LinkedInAPI:
+    """
+    Shared client for LINKEDIN_TOKEN/PROFILE_URN: the operator's own account. The OAuth callback
+    only swaps them in single-tenant setups (no user database).
+    """
+    return _linkedin_client(os.getenv("LINKEDIN_TOKEN"), os.getenv("PROFILE_URN"))
+
+
+def _linkedin_api_for(record: Optional[dict]) -> LinkedInAPI:
+    """
+    Client for the token a user connected through OAuth (stored encrypted on their row). Without
+    a user database (single-tenant) this is the env client. Otherwise a user with no usable
+    stored token gets a ValueError: falling back to the env token would post as someone else.
+    """
+    if user_db is None:
+        return _linkedin_api()
+    encrypted = (record or {}).get("linkedin_token_encrypted")
+    if not encrypted:
+        raise ValueError("LinkedIn is not connected for this user. Please connect LinkedIn first.")
+    try:
+        access_token = _decrypt_secret(encrypted)
+    except Exception as exc:
+        raise ValueError("The stored LinkedIn token could not be read. Please reconnect LinkedIn.") from exc
+    return _linkedin_client(access_token, record.get("linkedin_profile_urn"))
+
+
+def _linkedin_api_for_user(clerk_user_id: Optional[str]) -> LinkedInAPI:
+    """
+    Client for publishing on behalf of clerk_user_id, from the token stored on their row (see
+    _linkedin_api_for). Posts with no owner publish to the operator's env account. A failed
+    user lookup raises rather than falling back.
+    """
+    if not clerk_user_id or user_db is None:
+        return _linkedin_api()
+    return _linkedin_api_for(user_db.get_user_by_clerk_id(clerk_user_id))
+
+
+_LI_TOKEN_RE = re.compile(r"^LINKEDIN_TOKEN=.*$", re.MULTILINE)
+_PROFILE_URN_RE = re.compile(r"^PROFILE_URN=.*$", re.MULTILINE)
+
+
+def _write_linkedin_env(env_path: Path, access_token: str, profile_urn: str) -> None:
+    """Keep LINKEDIN_TOKEN/PROFILE_URN in a local .env current (single-process dev setups)."""
+    env_content = env_path.read_text(encoding="utf-8")
+    for name, value, pattern in (
+        ("LINKEDIN_TOKEN", access_token, _LI_TOKEN_RE),
+        ("PROFILE_URN", profile_urn, _PROFILE_URN_RE),
+    ):
+        if pattern.search(env_content):
+            env_content = pattern.sub(lambda _m: f"{name}={value}", env_content)
+        else:
+            env_content += f"\n{name}={value}\n"
+    env_path.write_text(env_content, encoding="utf-8")
+
+
+@lru_cache(maxsize=1)
+def _email_sender() -> EmailSender:
+    return EmailSender()
+
+
+# LinkedIn token validity by token hash. validate_token is a profile round-trip; the scheduler,
+# automation and /publish all check before every post (publish_post checked twice).
+_linkedin_token_cache = _TTLCache(
+    maxsize=16, ttl=int(os.getenv("LINKEDIN_TOKEN_CHECK_TTL_SECONDS", "300"))
+)
+
+
+def _linkedin_token_key(api: LinkedInAPI) -> str:
+    return hashlib.sha256(api.access_token.encode("utf-8")).hexdigest()
+
+
+def _linkedin_token_ok(api: LinkedInAPI) -> bool:
+    """
+    validate_token() with a short-lived cache per access token. Only a valid result is cached:
+    validate_token() also returns False on timeouts and connection errors, and a cached False
+    would reject a good token for the whole TTL.
+    """
+    key = _linkedin_token_key(api)
+    if _linkedin_token_cache.get(key):
+        return True
+    ok = api.validate_token()
+    if ok:
+        _linkedin_token_cache.set(key, True)
+    return ok
+
+
+# Trend payloads by normalized (niche, topic_hint): regenerations on the same topic and automation
+# users sharing an occupation reuse one Serper call. Per-key locks make concurrent misses wait for
+# the first fetch instead of all going out.
+_trend_cache = _TTLCache(maxsize=1024, ttl=int(os.getenv("TREND_CACHE_TTL_SECONDS", "900")))
+_trend_fetch_locks: Dict[tuple, threading.Lock] = {}
+_trend_fetch_locks_guard = threading.Lock()
+
+
+def _trend_fetch_lock(cache_key: tuple) -> threading.Lock:
+    with _trend_fetch_locks_guard:
+        lock = _trend_fetch_locks.get(cache_key)
+        if lock is None:
+            if len(_trend_fetch_locks) > 4096:
+                _trend_fetch_locks.clear()
+            lock = _trend_fetch_locks[cache_key] = threading.Lock()
+        return lock
+
+
 def _collect_profile_context() -> dict:
     """Attempt to pull profile context from LinkedIn for personalization."""
     context = {}
-    if not os.getenv("LINKEDIN_TOKEN") or not os.getenv("PROFILE_URN"):
+    token = os.getenv("LINKEDIN_TOKEN")
+    profile_urn = os.getenv("PROFILE_URN")
+    if not token or not profile_urn:
         return context
 
+    cache_key = (profile_urn, hashlib.sha256(token.encode("utf-8")).hexdigest())
+    cached = _profile_context_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
     try:
-        linkedin_client = LinkedInAPI()
+        linkedin_client = _linkedin_api()
         context = linkedin_client.get_profile_about_details() or {}
+        _profile_context_cache.set(cache_key, dict(context))
     except Exception as exc:
         context = {"error": str(exc)}
     return context
@@ -523,55 +945,43 @@ def _fetch_trending_topics(niche: str, topic_hint: str) -> dict:
         result["error"] = "SERPER_API_KEY not configured"
         return result
 
-    try:
-        result["items"] = fetcher.fetch_topics(niche=niche, topic_hint=topic_hint)
-    except Exception as exc:
-        result["error"] = str(exc)
+    cache_key = ((niche or "").strip().lower(), (topic_hint or "").strip().lower())
+    cached = _trend_cache.get(cache_key)
+    if cached is not None:
+        result["items"] = list(cached)
+        return result
+    with _trend_fetch_lock(cache_key):
+        cached = _trend_cache.get(cache_key)
+        if cached is not None:
+            result["items"] = list(cached)
+            return result
+        try:
+            # Most relevant first: the prompts only include the first five trends.
+            result["items"] = rank_trends(
+                fetcher.fetch_topics(niche=niche, topic_hint=topic_hint), niche, topic_hint
+            )
+            _trend_cache.set(cache_key, list(result["items"]))
+        except Exception as exc:
+            result["error"] = str(exc)
     return result
 
 
 def _compute_content_stats() -> dict:
-    """Aggregate basic analytics from stored posts."""
+    """Aggregate basic analytics from stored posts (computed by the database)."""
     try:
-        posts = _require_db().get_all_posts()
+        return _require_db().get_content_stats()
     except Exception as e:
         # If database connection fails, return empty stats
-        print(f"Warning: Failed to fetch posts for stats: {e}")
-        posts = []
-    total = len(posts)
-    published_posts = [p for p in posts if p.get("status") == "published"]
-    drafts = [p for p in posts if p.get("status") == "draft"]
-    scheduled = [p for p in posts if p.get("status") == "scheduled"]
-
-    word_counts = []
-    recent_topics = []
-    for post in posts[:5]:
-        if post.get("topic"):
-            recent_topics.append(post["topic"])
-        if post.get("content"):
-            word_counts.append(len(post["content"].split()))
-
-    avg_word_count = round(sum(word_counts) / len(word_counts), 1) if word_counts else 0
-    last_published_at = None
-    if published_posts:
-        last_published_at = max(
-            [
-                p.get("published_at") or p.get("updated_at") or p.get("created_at")
-                for p in published_posts
-                if p.get("published_at") or p.get("updated_at") or p.get("created_at")
-            ],
-            default=None,
-        )
-
-    return {
-        "total": total,
-        "drafts": len(drafts),
-        "published": len(published_posts),
-        "scheduled": len(scheduled),
-        "avg_word_count": avg_word_count,
-        "recent_topics": recent_topics,
-        "last_published_at": last_published_at,
-    }
+        logger.warning("Failed to fetch post stats: %s", e)
+        return {
+            "total": 0,
+            "drafts": 0,
+            "published": 0,
+            "scheduled": 0,
+            "avg_word_count": 0,
+            "recent_topics": [],
+            "last_published_at": None,
+        }
 
 
 def _build_profile_summary(profile_basic: dict, profile_about: dict, metrics: dict, content_stats: dict) -> str:
@@ -624,9 +1034,51 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+async def health():
     """Health check endpoint."""
-    return {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
+    return {
+        "status": "healthy",
+        "service": "LinkedIn Post Generator & Publisher",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "db_connected": db is not None,
+        "db_error": db_init_error,
+    }
+
+
+def _supabase_connection_check() -> dict:
+    """Blocking half of /test/supabase: create the client and run a one-row query."""
+    connection_test: dict = {}
+    try:
+        from utils.database import _get_supabase_client
+        client = _get_supabase_client()
+        connection_test["client_created"] = True
+        
+        # Try a simple query
+        try:
+            # Test with posts table
+            table_name = os.getenv("SUPABASE_POSTS_TABLE", "posts")
+            test_query = client.table(table_name).select("id").limit(1).execute()
+            connection_test["query_success"] = True
+            connection_test["table_accessible"] = True
+            connection_test["table_name"] = table_name
+        except Exception as query_error:
+            connection_test["query_success"] = False
+            connection_test["query_error"] = str(query_error)
+            # Check if it's a table not found error
+            if "relation" in str(query_error).lower() or "does not exist" in str(query_error).lower():
+                connection_test["table_accessible"] = False
+                connection_test["hint"] = "Table might not exist. Check your Supabase schema."
+            else:
+                connection_test["table_accessible"] = None
+                
+    except ConnectionError as e:
+        connection_test["client_created"] = False
+        connection_test["error"] = str(e)
+    except Exception as e:
+        connection_test["client_created"] = False
+        connection_test["error"] = f"Unexpected error: {str(e)}"
+        connection_test["error_type"] = type(e).__name__
+    return connection_test
 
 
 @app.get("/test/supabase")
@@ -663,9 +1115,10 @@ async def test_supabase_connection():
                 "resolved": False,
             }
             try:
-                ip_address = socket.gethostbyname(hostname)
+                # Async resolver: a slow or failing lookup must not stall the event loop.
+                infos = await asyncio.get_running_loop().getaddrinfo(hostname, None, family=socket.AF_INET)
                 result["dns_test"]["resolved"] = True
-                result["dns_test"]["ip_address"] = ip_address
+                result["dns_test"]["ip_address"] = infos[0][4][0]
             except socket.gaierror as e:
                 result["dns_test"]["error"] = f"DNS resolution failed: {str(e)}"
                 result["dns_test"]["error_code"] = e.errno
@@ -674,36 +1127,7 @@ async def test_supabase_connection():
     
     # Test Supabase client connection
     if supabase_url and supabase_key:
-        try:
-            from utils.database import _get_supabase_client
-            client = _get_supabase_client()
-            result["connection_test"]["client_created"] = True
-            
-            # Try a simple query
-            try:
-                # Test with posts table
-                table_name = os.getenv("SUPABASE_POSTS_TABLE", "posts")
-                test_query = client.table(table_name).select("id").limit(1).execute()
-                result["connection_test"]["query_success"] = True
-                result["connection_test"]["table_accessible"] = True
-                result["connection_test"]["table_name"] = table_name
-            except Exception as query_error:
-                result["connection_test"]["query_success"] = False
-                result["connection_test"]["query_error"] = str(query_error)
-                # Check if it's a table not found error
-                if "relation" in str(query_error).lower() or "does not exist" in str(query_error).lower():
-                    result["connection_test"]["table_accessible"] = False
-                    result["connection_test"]["hint"] = "Table might not exist. Check your Supabase schema."
-                else:
-                    result["connection_test"]["table_accessible"] = None
-                    
-        except ConnectionError as e:
-            result["connection_test"]["client_created"] = False
-            result["connection_test"]["error"] = str(e)
-        except Exception as e:
-            result["connection_test"]["client_created"] = False
-            result["connection_test"]["error"] = f"Unexpected error: {str(e)}"
-            result["connection_test"]["error_type"] = type(e).__name__
+        result["connection_test"] = await run_in_threadpool(_supabase_connection_check)
     
     result["overall_status"] = (
         "connected" if result.get("connection_test", {}).get("query_success") else
@@ -717,16 +1141,64 @@ async def test_supabase_connection():
     return result
 
 
-@app.get("/health")
-async def health():
-    """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "service": "LinkedIn Post Generator & Publisher",
-        "timestamp": datetime.now().isoformat(),
-        "db_connected": db is not None,
-        "db_error": db_init_error,
-    }
+def _collect_generation_intel(topic: str) -> tuple:
+    """Profile context, the niche derived from it, and live trends for that niche (blocking)."""
+    profile_context = _collect_profile_context()
+    user_niche = _derive_user_niche(profile_context or {}, topic)
+    return profile_context, user_niche, _fetch_trending_topics(user_niche, topic)
+
+
+def _resolve_user_openai_key(req: Request) -> tuple:
+    """(clerk_user_id, stored OpenAI key) for the caller, if authenticated (blocking)."""
+    clerk_user_id = _maybe_clerk_user_id(req)
+    return clerk_user_id, (_get_openai_key_for_user(clerk_user_id) if clerk_user_id else None)
+
+
+def _generate_post_image_payload(
+    topic: str,
+    post_content: str,
+    openai_api_key: Optional[str],
+) -> tuple:
+    """
+    Generate and store the cover image for a post (blocking: HF inference + upload).
+
+    Returns (image_payload, image_mime_type, image_url, image_storage_path).
+    """
+    image_payload = None
+    image_mime_type = None
+    image_url = None
+    image_storage_path = None
+    if os.getenv("HF_TOKEN"):
+        try:
+            styled_prompt = _build_image_prompt_for_post(
+                topic or "",
+                post_content[:600] if post_content else "",
+                openai_api_key=openai_api_key,
+            )
+            image_bytes = generate_post_image(styled_prompt, None)
+            image_mime_type = "image/png"
+            stored = _store_image(
+                image_bytes=image_bytes,
+                mime_type=image_mime_type,
+                topic=topic,
+            )
+            image_url = stored["url"]
+            image_storage_path = stored["path"]
+            image_payload = {
+                "url": image_url,
+                "storage_path": image_storage_path,
+                "mime_type": image_mime_type,
+                "provider": stored.get("provider"),
+            }
+            if stored.get("provider") == "local":
+                image_payload["fallback"] = (
+                    "Image stored on the server disk (set DROPBOX_ACCESS_TOKEN or Supabase for remote storage)."
+                )
+        except Exception as image_error:
+            image_payload = {
+                "error": str(image_error)
+            }
+    return image_payload, image_mime_type, image_url, image_storage_path
 
 
 @app.post("/generate")
@@ -743,85 +1215,57 @@ async def generate_post(req: Request, request: PostGenerateRequest):
     try:
         if not request.topic or len(request.topic.strip()) == 0:
             raise HTTPException(status_code=400, detail="Topic is required")
-        
-        profile_context = _collect_profile_context()
+
+        # Profile -> trends and JWT -> OpenAI key are independent blocking chains; run them
+        # concurrently in the threadpool.
+        (profile_context, user_niche, trend_payload), (clerk_user_id, openai_api_key) = await asyncio.gather(
+            run_in_threadpool(_collect_generation_intel, request.topic),
+            run_in_threadpool(_resolve_user_openai_key, req),
+        )
         usable_profile_context = (
             profile_context
             if profile_context and not profile_context.get("error")
             else None
         )
-        user_niche = _derive_user_niche(profile_context or {}, request.topic)
-        trend_payload = _fetch_trending_topics(user_niche, request.topic)
-        
-        clerk_user_id = _maybe_clerk_user_id(req)
-        openai_api_key = _get_openai_key_for_user(clerk_user_id) if clerk_user_id else None
 
-        # Generate post using CrewAI (Gemini/NVIDIA preferred, OpenAI as fallback if available)
-        post_content = generate_linkedin_post(
+        # Generate post using CrewAI (Gemini/NVIDIA preferred, OpenAI as fallback if available).
+        # kickoff_async keeps the event loop free for other requests while the crew runs.
+        post_content = await generate_linkedin_post_async(
             topic=request.topic,
             additional_context=request.additional_context,
             profile_context=usable_profile_context,
             trending_topics=trend_payload.get("items") or None,
             user_niche=user_niche,
             openai_api_key=openai_api_key,
+            max_tokens=request.max_tokens,
+        )
+
+        (
+            image_payload,
+            image_mime_type,
+            image_url,
+            image_storage_path,
+        ) = await run_in_threadpool(
+            _generate_post_image_payload, request.topic or "", post_content, openai_api_key
         )
 
-        image_payload = None
-        image_base64 = None
-        image_mime_type = None
-        image_url = None
-        image_storage_path = None
-        if os.getenv("HF_TOKEN"):
-            try:
-                styled_prompt = _build_image_prompt_for_post(
-                    request.topic or "",
-                    post_content[:600] if post_content else "",
-                    openai_api_key=openai_api_key,
-                )
-                image_bytes = generate_post_image(styled_prompt, None)
-                image_mime_type = "image/png"
-                uploaded = _upload_image(
-                    image_bytes=image_bytes,
-                    mime_type=image_mime_type,
-                    topic=request.topic,
-                )
-                if uploaded:
-                    image_url = uploaded["url"]
-                    image_storage_path = uploaded["path"]
-                    image_payload = {
-                        "url": image_url,
-                        "storage_path": image_storage_path,
-                        "mime_type": image_mime_type,
-                        "provider": uploaded.get("provider"),
-                    }
-                else:
-                    # No Dropbox/Supabase: store image as base64 in post
-                    image_base64 = base64.b64encode(image_bytes).decode("ascii")
-                    image_payload = {
-                        "mime_type": image_mime_type,
-                        "data_url": f"data:{image_mime_type};base64,{image_base64}",
-                        "fallback": "Image stored in post (set DROPBOX_ACCESS_TOKEN or Supabase for remote storage).",
-                    }
-                    # Persist in post for display
-                    image_url = None
-                    image_storage_path = None
-            except Exception as image_error:
-                image_payload = {
-                    "error": str(image_error)
-                }
-        
         # Save to database as draft
-        post = _require_db().create_post(
+        post = await _db_call(
+            "create_post",
             content=post_content,
             topic=request.topic,
             status="draft",
-            image_base64=image_base64,
             image_mime_type=image_mime_type,
             image_url=image_url,
             image_storage_path=image_storage_path,
             clerk_user_id=clerk_user_id,
         )
         
+        if post and _is_local_image(post):
+            # Storage-less fallback: the bytes are on disk, hand back the URL that streams them.
+            post = _with_served_image_url(post, req)
+            image_payload = {**(image_payload or {}), "image_id": post.get("id"), "url": post.get("image_url")}
+
         response_payload = {
             "success": True,
             "post": post,
@@ -836,15 +1280,69 @@ async def generate_post(req: Request, request: PostGenerateRequest):
         return response_payload
     
     except ValueError as e:
-        import traceback
-        traceback.print_exc()
+        logger.debug("generate_post rejected", exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("generate_post failed")
         raise HTTPException(status_code=500, detail=f"Error generating post: {str(e)}")
 
 
+@app.post("/generate/stream")
+async def generate_post_stream(req: Request, request: PostGenerateRequest):
+    """
+    Generate a LinkedIn post and stream it as Server-Sent Events.
+
+    Emits `data: {"token": ...}` events while the final pass is written, then one
+    `data: {"done": true, "post": {...}}` event after the draft is saved (no image).
+    Errors are reported as a `data: {"error": ...}` event.
+    """
+    if not request.topic or len(request.topic.strip()) == 0:
+        raise HTTPException(status_code=400, detail="Topic is required")
+
+    (profile_context, user_niche, trend_payload), (clerk_user_id, openai_api_key) = await asyncio.gather(
+        run_in_threadpool(_collect_generation_intel, request.topic),
+        run_in_threadpool(_resolve_user_openai_key, req),
+    )
+    usable_profile_context = (
+        profile_context
+        if profile_context and not profile_context.get("error")
+        else None
+    )
+
+    async def _events():
+        parts: List[str] = []
+        try:
+            async for token in generate_linkedin_post_stream(
+                topic=request.topic,
+                additional_context=request.additional_context,
+                profile_context=usable_profile_context,
+                trending_topics=trend_payload.get("items") or None,
+                user_niche=user_niche,
+                openai_api_key=openai_api_key,
+                max_tokens=request.max_tokens,
+            ):
+                parts.append(token)
+                yield _sse({"token": token})
+
+            post = await _db_call(
+                "create_post",
+                content="".join(parts).strip(),
+                topic=request.topic,
+                status="draft",
+                clerk_user_id=clerk_user_id,
+            )
+            yield _sse({"done": True, "post": post})
+        except Exception as exc:
+            detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+            yield _sse({"error": detail})
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/topics/suggest")
 async def suggest_topics_endpoint(req: Request, request: TopicSuggestRequest):
     """
@@ -855,25 +1353,29 @@ async def suggest_topics_endpoint(req: Request, request: TopicSuggestRequest):
         if not occupation:
             raise HTTPException(status_code=400, detail="occupation is required")
 
-        clerk_user_id = _maybe_clerk_user_id(req)
-        openai_api_key = _get_openai_key_for_user(clerk_user_id) if clerk_user_id else None
+        clerk_user_id = await run_in_threadpool(_maybe_clerk_user_id, req)
+        openai_api_key = (
+            await run_in_threadpool(_get_openai_key_for_user, clerk_user_id) if clerk_user_id else None
+        )
 
         # Persist occupation for this Clerk user (optional)
         if clerk_user_id and user_db is not None:
             try:
-                _require_user_db().upsert_user(
+                await run_in_threadpool(
+                    _require_user_db().upsert_user,
                     {
                         "clerk_user_id": clerk_user_id,
                         "occupation": occupation,
                         "occupation_set_at": datetime.now(timezone.utc).isoformat(),
-                    }
+                    },
+                    returning=False,
                 )
             except Exception:
                 pass
 
-        trend_payload = _fetch_trending_topics(occupation, occupation)
+        trend_payload = await run_in_threadpool(_fetch_trending_topics, occupation, occupation)
 
-        topics = suggest_topics(
+        topics = await asuggest_topics(
             occupation=occupation,
             trending_topics=trend_payload.get("items") or None,
             limit=request.limit,
@@ -894,17 +1396,11 @@ async def suggest_topics_endpoint(req: Request, request: TopicSuggestRequest):
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("suggest_topics failed")
         raise HTTPException(status_code=500, detail=f"Error suggesting topics: {str(e)}")
 
 
-@app.get("/me/automation")
-async def get_automation(req: Request):
-    """Get current user's automation settings (enabled, occupation(s), frequency, last_run_at)."""
-    clerk_user_id = _require_clerk_user_id(req)
-    _require_user_db()
-    record = user_db.get_user_by_clerk_id(clerk_user_id) or {}
+def _automation_settings(record: dict) -> dict:
     occupations = _occupations_list(record)
     return {
         "enabled": bool(record.get("automation_enabled")),
@@ -916,12 +1412,19 @@ async def get_automation(req: Request):
     }
 
 
+@app.get("/me/automation")
+async def get_automation(req: Request):
+    """Get current user's automation settings (enabled, occupation(s), frequency, last_run_at)."""
+    clerk_user_id = _require_clerk_user_id(req)
+    record = await _user_db_call("get_user_by_clerk_id", clerk_user_id) or {}
+    return _automation_settings(record)
+
+
 @app.patch("/me/automation")
 async def patch_automation(req: Request, body: AutomationPatchRequest):
     """Update current user's automation settings. Set profession(s) before enabling."""
     clerk_user_id = _require_clerk_user_id(req)
-    _require_user_db()
-    record = user_db.get_user_by_clerk_id(clerk_user_id) or {}
+    record = await _user_db_call("get_user_by_clerk_id", clerk_user_id) or {}
     updates = {}
     if body.enabled is not None:
         current_list = _occupations_list(record)
@@ -955,36 +1458,111 @@ async def patch_automation(req: Request, body: AutomationPatchRequest):
         updates["automation_auto_publish"] = body.auto_publish
     if body.reset_schedule:
         try:
-            user_db.clear_last_auto_run_at(clerk_user_id)
+            await _user_db_call("clear_last_auto_run_at", clerk_user_id)
+            record = {**record, "last_auto_run_at": None}
         except Exception:
             pass
     if not updates:
-        record = user_db.get_user_by_clerk_id(clerk_user_id) or {}
-        occupations = _occupations_list(record)
-        return {
-            "enabled": bool(record.get("automation_enabled")),
-            "occupation": record.get("occupation") or (occupations[0] if occupations else None),
-            "occupations": occupations,
-            "frequency": (record.get("automation_frequency") or "daily").strip() or "daily",
-            "last_run_at": record.get("last_auto_run_at"),
-            "auto_publish": bool(record.get("automation_auto_publish")),
-        }
-    user_db.upsert_user({"clerk_user_id": clerk_user_id, **updates})
-    record = user_db.get_user_by_clerk_id(clerk_user_id) or {}
-    occupations = _occupations_list(record)
+        return _automation_settings(record)
+    # upsert_user returns the stored row, so no re-read is needed.
+    record = await _user_db_call("upsert_user", {"clerk_user_id": clerk_user_id, **updates}) or record
+    return _automation_settings(record)
+
+
+def _automation_log_row(
+    clerk_user_id: str,
+    run_at: str,
+    status: str,
+    posts_created: int = 0,
+    error_message: Optional[str] = None,
+) -> dict:
     return {
-        "enabled": bool(record.get("automation_enabled")),
-        "occupation": record.get("occupation") or (occupations[0] if occupations else None),
-        "occupations": occupations,
-        "frequency": (record.get("automation_frequency") or "daily").strip() or "daily",
-        "last_run_at": record.get("last_auto_run_at"),
-        "auto_publish": bool(record.get("automation_auto_publish")),
+        "clerk_user_id": clerk_user_id,
+        "run_at": run_at,
+        "status": status,
+        "posts_created": posts_created,
+        "error_message": error_message,
     }
 
 
+def _write_automation_logs(rows: List[dict]) -> None:
+    """Write a cron run's log rows with one bulk insert (blocking)."""
+    store = automation_logs_store
+    if store is None or not rows:
+        return
+    try:
+        store.append_logs(rows)
+    except Exception as exc:
+        # One rejected row fails the whole bulk insert; retry row by row so the rest land.
+        logger.warning("Bulk automation log insert failed (%s); retrying per row", exc)
+        for row in rows:
+            try:
+                store.append_logs([row])
+            except Exception:
+                pass
+
+
+class _UserWriteBuffer:
+    """
+    Coalesces fire-and-forget user upserts (e.g. /auth/status bumping linkedin_last_checked_at)
+    by clerk_user_id, last write wins per field; a task on the server loop writes them with
+    user_db.upsert_users every max_delay seconds. Without a running flusher they go straight
+    through.
+    """
+
+    def __init__(self, max_delay: float = 0.2):
+        self.max_delay = max_delay
+        self._rows: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._running = False
+
+    def enqueue(self, data: dict) -> None:
+        if user_db is None:
+            return
+        if not self._running:
+            self._write([data])
+            return
+        with self._lock:
+            clerk_user_id = data["clerk_user_id"]
+            self._rows[clerk_user_id] = {**self._rows.get(clerk_user_id, {}), **data}
+
+    @staticmethod
+    def _write(rows: List[dict]) -> None:
+        db = user_db
+        if db is None or not rows:
+            return
+        try:
+            db.upsert_users(rows)
+        except Exception as exc:
+            logger.warning("Bulk user upsert failed (%s); retrying per row", exc)
+            for row in rows:
+                try:
+                    db.upsert_user(row, returning=False)
+                except Exception:
+                    pass
+
+    async def flush(self) -> None:
+        with self._lock:
+            rows, self._rows = list(self._rows.values()), {}
+        if rows:
+            await run_in_threadpool(self._write, rows)
+
+    async def run(self) -> None:
+        self._running = True
+        while True:
+            await asyncio.sleep(self.max_delay)
+            await self.flush()
+
+
+_user_writes = _UserWriteBuffer()
+
+
 @app.get("/me/automation/logs")
-async def get_automation_logs(req: Request, limit: int = Query(20, ge=1, le=50)):
-    """Get automation run logs for the current user."""
+def get_automation_logs(req: Request, limit: int = Query(20, ge=1, le=50)):
+    """
+    Get automation run logs for the current user. A plain def (run in the threadpool): JWT
+    verification may fetch JWKS and the log store read is blocking.
+    """
     clerk_user_id = _require_clerk_user_id(req)
     if automation_logs_store is None:
         return {"logs": [], "total": 0}
@@ -992,140 +1570,295 @@ async def get_automation_logs(req: Request, limit: int = Query(20, ge=1, le=50))
     return {"logs": logs, "total": len(logs)}
 
 
-def _run_automation_once() -> dict:
+def _automation_image(topic: str, content: str, openai_key: Optional[str]) -> tuple:
     """
-    Run auto-create for users with automation enabled. Processes at most
-    CRON_AUTOMATION_MAX_USERS_PER_RUN users per invocation (default 1) to avoid OOM on low-memory instances.
+    Generate and store the cover image for an automated post (blocking).
+
+    Returns (image_url, image_mime_type, image_storage_path); all None on failure.
     """
-    if user_db is None:
-        return {"users_processed": 0, "posts_created": 0, "errors": [{"clerk_user_id": "", "error": "User DB unavailable"}]}
     try:
-        users = user_db.list_users_with_automation()
-    except Exception as e:
-        return {"users_processed": 0, "posts_created": 0, "errors": [{"clerk_user_id": "", "error": str(e)}]}
-    max_users = max(1, min(10, int(os.getenv("CRON_AUTOMATION_MAX_USERS_PER_RUN", "1"))))
-    users = users[:max_users]
-    now_iso = datetime.now(timezone.utc).isoformat()
-    posts_created = 0
-    errors = []
-    max_errors = 50
-    max_error_len = 200
-    for u in users:
-        clerk_user_id = u.get("clerk_user_id")
-        occupation = _pick_one_occupation(u)
-        if not clerk_user_id or not occupation:
-            continue
-        last_run = u.get("last_auto_run_at")
-        freq = (u.get("automation_frequency") or "daily").strip() or "daily"
-        if last_run:
-            try:
-                last_dt = datetime.fromisoformat(last_run.replace("Z", "+00:00"))
-                elapsed_seconds = (datetime.now(timezone.utc) - last_dt).total_seconds()
-                if freq == "daily" and elapsed_seconds < 23 * 3600:
-                    if automation_logs_store:
-                        automation_logs_store.append_log(
-                            clerk_user_id, now_iso, "skipped", 0,
-                            "Already ran in last 23h (daily limit).",
-                        )
-                    continue  # already ran in last 23h, skip to avoid duplicate same-day post
-                if freq == "weekly" and elapsed_seconds < 7 * 24 * 3600:
-                    if automation_logs_store:
-                        automation_logs_store.append_log(
-                            clerk_user_id, now_iso, "skipped", 0,
-                            "Already ran in last 7 days (weekly limit).",
-                        )
-                    continue  # already ran in last 7 days, skip until next week
-            except Exception:
-                pass
+        styled_prompt = _build_image_prompt_for_post(
+            topic or "", content[:600] if content else "", openai_api_key=openai_key
+        )
+        image_bytes = generate_post_image(styled_prompt, None)
+        image_mime = "image/png"
+        stored = _store_image(image_bytes=image_bytes, mime_type=image_mime, topic=topic)
+        return stored["url"], image_mime, stored["path"]
+    except Exception:
+        return None, None, None
+
+
+# Blocking automation work (trends, LLM/image calls, user DB) runs on its own pool so a cron
+# tick never competes with request handlers for the shared anyio threadpool.
+_AUTOMATION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AUTOMATION_WORKERS", "4")),
+    thread_name_prefix="automation",
+)
+
+
+async def _run_automation_blocking(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_AUTOMATION_EXECUTOR, partial(func, *args, **kwargs))
+
+
+@dataclass(frozen=True)
+class _AutomationRun:
+    """Per-run constants for a cron tick, read once instead of per user."""
+
+    now: datetime
+    now_iso: str
+    want_image: bool
+    use_batch: bool
+    publish_visibility: str
+    # Log rows for this run, written with one bulk insert when the run ends.
+    logs: List[dict] = field(default_factory=list, compare=False)
+
+    def log(self, clerk_user_id: str, status: str, posts_created: int = 0, error_message: Optional[str] = None) -> None:
+        self.logs.append(_automation_log_row(clerk_user_id, self.now_iso, status, posts_created, error_message))
+
+    @classmethod
+    def snapshot(cls) -> "_AutomationRun":
+        now = datetime.now(timezone.utc)
+        have_openai = bool(os.getenv("OPENAI_API_KEY"))
+        visibility = (os.getenv("CRON_AUTOMATION_PUBLISH_VISIBILITY") or "PUBLIC").strip().upper()
+        return cls(
+            now=now,
+            now_iso=now.isoformat(),
+            want_image=have_openai
+            and os.getenv("CRON_AUTOMATION_SKIP_IMAGE", "").strip().lower() not in _TRUTHY,
+            use_batch=have_openai
+            and os.getenv("CRON_AUTOMATION_USE_BATCH", "").strip().lower() in _TRUTHY,
+            publish_visibility=visibility if visibility in ("PUBLIC", "CONNECTIONS") else "PUBLIC",
+        )
+
+
+def _automation_due(u: dict) -> bool:
+    """
+    Final per-user check. Cooldowns (daily 23h / weekly 7 days) are already applied by
+    list_users_due_for_automation in the database.
+    """
+    if not u.get("clerk_user_id") or not _pick_one_occupation(u):
+        return False
+    return not u.get("automation_batch_id")  # drafts for this user are still in an OpenAI batch
+
+
+async def _automate_user(u: dict, run: _AutomationRun, stats: dict) -> None:
+    """Create (and optionally publish) one automated post for a user who is due."""
+    clerk_user_id = u.get("clerk_user_id")
+    occupation = _pick_one_occupation(u)
+    try:
+        trend_payload, openai_key = await asyncio.gather(
+            _run_automation_blocking(_fetch_trending_topics, occupation, occupation),
+            _run_automation_blocking(_get_openai_key_for_user, clerk_user_id),
+        )
+        want_image = run.want_image
+        image_task: Optional[asyncio.Future] = None
+
+        def _start_image(topic_preview: str, content_head: str) -> None:
+            # The image only uses the topic and the first 600 chars, so it can start mid-stream.
+            nonlocal image_task
+            if want_image:
+                image_task = asyncio.ensure_future(
+                    _run_automation_blocking(_automation_image, topic_preview, content_head, openai_key)
+                )
+
+        # One streamed model call picks the topic and writes the post.
         try:
-            trend_payload = _fetch_trending_topics(occupation, occupation)
-            topics = suggest_topics(
+            topic, content = await suggest_topic_and_post_async(
                 occupation=occupation,
                 trending_topics=trend_payload.get("items") or None,
-                limit=3,
-                openai_api_key=_get_openai_key_for_user(clerk_user_id),
+                openai_api_key=openai_key,
+                on_preview=_start_image,
             )
-            topic = (topics[0] if topics else None) or f"Trending in {occupation}"
-            content = generate_linkedin_post(
-                topic=topic,
-                profile_context=None,
+        except BaseException:
+            if image_task is not None:
+                image_task.cancel()
+            raise
+        image_url_auto = None
+        image_mime_auto = None
+        image_storage_path_auto = None
+        if image_task is not None:
+            image_url_auto, image_mime_auto, image_storage_path_auto = await image_task
+        created = await _db_call(
+            "create_post",
+            content=content,
+            topic=topic,
+            status="draft",
+            clerk_user_id=clerk_user_id,
+            image_url=image_url_auto,
+            image_mime_type=image_mime_auto,
+            image_storage_path=image_storage_path_auto,
+        )
+        stats["posts_created"] += 1
+        await _run_automation_blocking(
+            user_db.upsert_user, {"clerk_user_id": clerk_user_id, "last_auto_run_at": run.now_iso}, returning=False
+        )
+        run.log(clerk_user_id, "success", 1)
+        auto_publish = bool(u.get("automation_auto_publish"))
+        if auto_publish and created and created.get("id") is not None:
+            try:
+                linkedin_api = _linkedin_api_for(u)
+                if await _run_automation_blocking(_linkedin_token_ok, linkedin_api):
+                    full_post = await _db_call("get_post", created["id"])
+                    if full_post and full_post.get("status") == "draft":
+                        result = await _publish_post_internal(post=full_post, visibility=run.publish_visibility)
+                        if result.get("success"):
+                            await _db_call(
+                                "mark_as_published",
+                                post_id=created["id"],
+                                linkedin_post_id=result.get("post_id", "unknown"),
+                            )
+            except Exception:
+                pass
+    except Exception as exc:
+        _record_automation_error(stats, run, clerk_user_id, str(exc))
+
+
+async def _run_automation_once_async() -> dict:
+    """
+    Run auto-create for users with automation enabled whose cooldown has passed. Processes at most
+    CRON_AUTOMATION_MAX_USERS_PER_RUN due users per invocation (default 1) to avoid OOM on low-memory
+    instances, CRON_AUTOMATION_CONCURRENCY of them at a time (default 5).
+    """
+    if user_db is None:
+        return {"users_processed": 0, "posts_created": 0, "errors": [{"clerk_user_id": "", "error": "User DB unavailable"}]}
+    run = _AutomationRun.snapshot()
+    try:
+        users = await _run_automation_blocking(
+            user_db.list_users_due_for_automation, run.now, include_pending_batches=run.use_batch
+        )
+    except Exception as e:
+        return {"users_processed": 0, "posts_created": 0, "errors": [{"clerk_user_id": "", "error": str(e)}]}
+    stats = {"posts_created": 0, "errors": []}
+    try:
+        if run.use_batch:
+            await _collect_automation_batches(users, run, stats)
+        max_users = max(1, min(10, int(os.getenv("CRON_AUTOMATION_MAX_USERS_PER_RUN", "1"))))
+        due = [u for u in users if _automation_due(u)][:max_users]
+        users_processed = len(due)
+        if run.use_batch:
+            # Draft-only users on the server key go through the Batch API; auto-publish users and
+            # users with their own OpenAI key stay on the live path.
+            batched = [
+                u for u in due
+                if not u.get("automation_auto_publish") and not u.get("openai_api_key_encrypted")
+            ]
+            if batched:
+                await _submit_automation_batch(batched, run, stats)
+                due = [u for u in due if u not in batched]
+        sem = asyncio.Semaphore(max(1, int(os.getenv("CRON_AUTOMATION_CONCURRENCY", "5"))))
+
+        async def _bounded(u: dict) -> None:
+            async with sem:
+                await _automate_user(u, run, stats)
+
+        await asyncio.gather(*(_bounded(u) for u in due))
+    finally:
+        await run_in_threadpool(_write_automation_logs, run.logs)
+    return {"users_processed": users_processed, "posts_created": stats["posts_created"], "errors": stats["errors"]}
+
+
+def _record_automation_error(stats: dict, run: _AutomationRun, clerk_user_id: str, error: str) -> None:
+    if len(stats["errors"]) < 50:
+        stats["errors"].append({"clerk_user_id": clerk_user_id, "error": error[:200]})
+    run.log(clerk_user_id, "failed", 0, error[:500])
+
+
+async def _submit_automation_batch(users: List[dict], run: _AutomationRun, stats: dict) -> None:
+    """
+    Phase A: queue fused topic + post requests for draft-only users in one OpenAI batch and
+    remember the batch id on each user (cleared again when the results are collected).
+    """
+    jobs = []
+    for u in users:
+        occupation = _pick_one_occupation(u)
+        trend_payload = await _run_automation_blocking(_fetch_trending_topics, occupation, occupation)
+        jobs.append(
+            TopicPostJob(
+                custom_id=u["clerk_user_id"],
+                occupation=occupation,
                 trending_topics=trend_payload.get("items") or None,
-                user_niche=occupation,
-                openai_api_key=_get_openai_key_for_user(clerk_user_id),
             )
-            image_url_auto = None
-            image_base64_auto = None
-            image_mime_auto = None
-            image_storage_path_auto = None
-            if os.getenv("OPENAI_API_KEY") and os.getenv("CRON_AUTOMATION_SKIP_IMAGE", "").strip().lower() not in ("1", "true", "yes", "on"):
-                try:
-                    openai_key = _get_openai_key_for_user(clerk_user_id)
-                    styled_prompt = _build_image_prompt_for_post(
-                        topic or "", content[:600] if content else "", openai_api_key=openai_key
-                    )
-                    image_bytes = generate_post_image(styled_prompt, None)
-                    image_mime_auto = "image/png"
-                    uploaded = _upload_image(
-                        image_bytes=image_bytes,
-                        mime_type=image_mime_auto,
-                        topic=topic,
-                    )
-                    if uploaded:
-                        image_url_auto = uploaded["url"]
-                        image_storage_path_auto = uploaded.get("path")
-                    else:
-                        image_base64_auto = base64.b64encode(image_bytes).decode("ascii")
-                except Exception:
-                    pass
-            created = _require_db().create_post(
-                content=content,
-                topic=topic,
-                status="draft",
-                clerk_user_id=clerk_user_id,
-                image_url=image_url_auto,
-                image_base64=image_base64_auto,
-                image_mime_type=image_mime_auto,
-                image_storage_path=image_storage_path_auto,
-            )
-            posts_created += 1
-            user_db.upsert_user({"clerk_user_id": clerk_user_id, "last_auto_run_at": now_iso})
-            if automation_logs_store:
-                automation_logs_store.append_log(clerk_user_id, now_iso, "success", 1, None)
-            auto_publish = bool(u.get("automation_auto_publish"))
-            if auto_publish and created and created.get("id") is not None:
-                try:
-                    linkedin_api = LinkedInAPI()
-                    if linkedin_api.validate_token():
-                        full_post = _require_db().get_post(created["id"])
-                        if full_post and full_post.get("status") == "draft":
-                            visibility = (os.getenv("CRON_AUTOMATION_PUBLISH_VISIBILITY") or "PUBLIC").strip().upper()
-                            if visibility not in ("PUBLIC", "CONNECTIONS"):
-                                visibility = "PUBLIC"
-                            result = _publish_post_internal(post=full_post, visibility=visibility)
-                            if result.get("success"):
-                                _require_db().mark_as_published(
-                                    post_id=created["id"],
-                                    linkedin_post_id=result.get("post_id", "unknown"),
-                                )
-                except Exception:
-                    pass
+        )
+    try:
+        batch_id = await _run_automation_blocking(submit_topic_and_post_batch, jobs)
+    except Exception as exc:
+        for u in users:
+            _record_automation_error(stats, run, u["clerk_user_id"], f"Batch submit failed: {exc}")
+        return
+    await _run_automation_blocking(
+        user_db.upsert_users,
+        [
+            {"clerk_user_id": u["clerk_user_id"], "automation_batch_id": batch_id, "last_auto_run_at": run.now_iso}
+            for u in users
+        ],
+    )
+
+
+async def _collect_automation_batches(users: List[dict], run: _AutomationRun, stats: dict) -> None:
+    """
+    Phase B: for every pending batch, turn completed rows into drafts (with images when
+    enabled). Failed or expired batches release their users so the next tick retries them.
+    """
+    pending: Dict[str, List[dict]] = {}
+    for u in users:
+        if u.get("automation_batch_id"):
+            pending.setdefault(u["automation_batch_id"], []).append(u)
+    for batch_id, batch_users in pending.items():
+        try:
+            status, results = await _run_automation_blocking(collect_topic_and_post_batch, batch_id)
         except Exception as exc:
-            err_msg = (str(exc))[:max_error_len]
-            if len(errors) < max_errors:
-                errors.append({"clerk_user_id": clerk_user_id, "error": err_msg})
-            if automation_logs_store:
-                automation_logs_store.append_log(clerk_user_id, now_iso, "failed", 0, str(exc)[:500])
-    return {"users_processed": len(users), "posts_created": posts_created, "errors": errors}
+            logger.warning("Automation batch %s check failed: %s", batch_id, exc)
+            continue
+        if status not in ("completed", "failed", "expired", "cancelled"):
+            continue
+        for u in batch_users:
+            clerk_user_id = u["clerk_user_id"]
+            result = results.get(clerk_user_id)
+            try:
+                if not isinstance(result, tuple):
+                    await _run_automation_blocking(user_db.clear_last_auto_run_at, clerk_user_id)
+                    _record_automation_error(
+                        stats, run, clerk_user_id, str(result or f"Batch {status} without a result")
+                    )
+                    continue
+                topic, content = result
+                image = (None, None, None)
+                if run.want_image:
+                    image = await _run_automation_blocking(_automation_image, topic, content, None)
+                await _db_call(
+                    "create_post",
+                    content=content,
+                    topic=topic,
+                    status="draft",
+                    clerk_user_id=clerk_user_id,
+                    image_url=image[0],
+                    image_mime_type=image[1],
+                    image_storage_path=image[2],
+                )
+                stats["posts_created"] += 1
+                run.log(clerk_user_id, "success", 1)
+            except Exception as exc:
+                _record_automation_error(stats, run, clerk_user_id, str(exc))
+            finally:
+                # upsert_user skips None values, so an empty string clears the pending batch.
+                await _run_automation_blocking(
+                    user_db.upsert_user, {"clerk_user_id": clerk_user_id, "automation_batch_id": ""}, returning=False
+                )
 
 
-def _run_automation_safe() -> None:
-    """Wrapper so background run does not raise; logs are written inside _run_automation_once."""
+async def _run_automation_safe() -> None:
+    """Wrapper so background run does not raise; logs are written inside _automate_user."""
     try:
-        _run_automation_once()
+        await _run_automation_once_async()
     except Exception:
         pass
 
 
+# Strong refs to in-flight automation runs (the loop only keeps weak refs to tasks).
+_automation_tasks: set = set()
+
+
 @app.post("/cron/run-automation")
 @app.get("/cron/run-automation")
 async def cron_run_automation():
@@ -1136,19 +1869,26 @@ async def cron_run_automation():
     """
     if user_db is None:
         raise HTTPException(status_code=503, detail="User DB not available")
-    loop = asyncio.get_event_loop()
-    loop.run_in_executor(None, _run_automation_safe)
-    return JSONResponse(
+    task = asyncio.create_task(_run_automation_safe())
+    _automation_tasks.add(task)
+    task.add_done_callback(_automation_tasks.discard)
+    return _JSONResponse(
         status_code=202,
-        content={"status": "accepted", "message": "Automation started in background."},
+        content={
+            "status": "accepted",
+            "message": "Automation started in background.",
+            "runs_in_flight": len(_automation_tasks),
+            "queued_jobs": _AUTOMATION_EXECUTOR._work_queue.qsize(),
+        },
     )
 
 
 @app.post("/generate/image")
-async def generate_post_image_endpoint(request: PostImageRequest):
+def generate_post_image_endpoint(request: PostImageRequest):
     """
     Generate an illustrative image for a LinkedIn post using OpenAI DALL-E.
     Uploads to Dropbox (if DROPBOX_ACCESS_TOKEN set) or Supabase; otherwise returns 503.
+    A plain def so the (slow, blocking) generation and upload run in the threadpool.
     """
     try:
         prompt_base = request.prompt or "Professional LinkedIn brand visual"
@@ -1189,7 +1929,7 @@ async def publish_post(request: PostPublishRequest):
     """
     try:
         # Get post from database
-        post = _require_db().get_post(request.post_id)
+        post = await _db_call("get_post", request.post_id)
         if not post:
             raise HTTPException(status_code=404, detail="Post not found")
         
@@ -1200,31 +1940,29 @@ async def publish_post(request: PostPublishRequest):
                 "post": post
             }
         
-        # Initialize LinkedIn API
+        # Initialize LinkedIn API with the post owner's token
         try:
-            linkedin_api = LinkedInAPI()
+            linkedin_api = await run_in_threadpool(_linkedin_api_for_user, post.get("clerk_user_id"))
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
         
         # Validate token
-        if not linkedin_api.validate_token():
+        if not await run_in_threadpool(_linkedin_token_ok, linkedin_api):
             raise HTTPException(
                 status_code=401,
                 detail="LinkedIn token is invalid or expired. Please refresh your token."
             )
         
-        result = _publish_post_internal(post=post, visibility=request.visibility)
+        result = await _publish_post_internal(post=post, visibility=request.visibility)
         
         if result.get("success"):
-            # Update post status
-            _require_db().mark_as_published(
+            # Update post status (returns the updated post)
+            updated_post = await _db_call(
+                "mark_as_published",
                 post_id=request.post_id,
                 linkedin_post_id=result.get("post_id", "unknown")
             )
             
-            # Get updated post
-            updated_post = _require_db().get_post(request.post_id)
-            
             return {
                 "success": True,
                 "message": "Post published successfully",
@@ -1253,33 +1991,44 @@ def _parse_iso_datetime(value: str) -> datetime:
     return parsed
 
 
-def _publish_post_internal(*, post: dict, visibility: str) -> dict:
-    # Initialize LinkedIn API
-    linkedin_api = LinkedInAPI()
-    if not linkedin_api.validate_token():
-        raise HTTPException(status_code=401, detail="LinkedIn token is invalid or expired. Please refresh your token.")
+def _decode_post_image_base64(post: dict) -> Optional[bytes]:
+    try:
+        return _b64.b64decode(post["image_base64"])
+    except Exception:
+        return None
 
-    image_bytes = None
-    image_mime_type = post.get("image_mime_type") or "image/png"
-    if post.get("image_url"):
-        try:
-            image_bytes, detected_mime = _fetch_image_bytes_from_url(str(post["image_url"]))
-            image_mime_type = detected_mime or image_mime_type
-        except Exception:
-            image_bytes = None
-    elif post.get("image_base64"):
-        try:
-            image_bytes = base64.b64decode(post["image_base64"])
-        except Exception:
-            image_bytes = None
 
-    return linkedin_api.post_text_content(
+def _publish_with_image(*, post: dict, visibility: str, image_bytes: Optional[bytes], image_mime_type: str) -> dict:
+    # Initialize LinkedIn API with the post owner's token
+    linkedin_api = _linkedin_api_for_user(post.get("clerk_user_id"))
+    if not _linkedin_token_ok(linkedin_api):
+        raise HTTPException(status_code=401, detail="LinkedIn token is invalid or expired. Please refresh your token.")
+
+    result = linkedin_api.post_text_content(
         text=post["content"],
         visibility=visibility,
         image_bytes=image_bytes,
         image_mime_type=image_mime_type,
         image_alt_text=post.get("topic", "Generated visual"),
     )
+    details = result.get("details")
+    if isinstance(details, dict) and details.get("status_code") == 401:
+        # Revoked/expired since the last check: do not trust the cached "valid" any longer.
+        _linkedin_token_cache.pop(_linkedin_token_key(linkedin_api))
+    return result
+
+
+async def _publish_post_internal(*, post: dict, visibility: str) -> dict:
+    """Publish from the event loop: the image is fetched async, the LinkedIn calls run in the threadpool."""
+    image_bytes, image_mime_type = await _load_post_image(post)
+
+    return await run_in_threadpool(
+        _publish_with_image,
+        post=post,
+        visibility=visibility,
+        image_bytes=image_bytes,
+        image_mime_type=image_mime_type,
+    )
 
 
 @app.post("/posts/{post_id}/schedule")
@@ -1287,7 +2036,7 @@ async def schedule_post(post_id: int, request: PostScheduleRequest):
     """
     Schedule a post for future publishing.
     """
-    post = _require_db().get_post(post_id)
+    post = await _db_call("get_post", post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
@@ -1295,93 +2044,95 @@ async def schedule_post(post_id: int, request: PostScheduleRequest):
     if scheduled_dt <= datetime.now(timezone.utc):
         raise HTTPException(status_code=400, detail="scheduled_for must be in the future")
 
-    updated = _require_db().update_post(
+    updated = await _db_call(
+        "update_post",
         post_id,
         status="scheduled",
         scheduled_for=scheduled_dt.astimezone(timezone.utc).isoformat(),
         scheduled_visibility=request.visibility or "PUBLIC",
         last_publish_error=None,
     )
+    _scheduler_wake.set()
     return {"success": True, "post": updated, "message": "Post scheduled"}
 
 
+# Set when a post is scheduled in this process so the scheduler re-reads its next deadline.
+_scheduler_wake = asyncio.Event()
+_SCHEDULER_BATCH = 10
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.5, max=4), reraise=True)
+def _record_scheduled_publish(database, post_id: int, linkedin_post_id: str) -> None:
+    database.mark_as_published(post_id, linkedin_post_id)
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.5, max=4), reraise=True)
+def _record_scheduled_failures(database, errors: Dict[int, str]) -> None:
+    database.fail_scheduled_posts(errors)
+
+
 async def _scheduler_loop() -> None:
-    poll_seconds = int(os.getenv("SCHEDULER_POLL_SECONDS", "20"))
-    enabled = os.getenv("SCHEDULER_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
+    """
+    Sleep until the earliest scheduled_for (or a wake-up from schedule_post) instead of polling.
+    SCHEDULER_POLL_SECONDS (default 300) caps the sleep as a safety net for posts scheduled by
+    another worker or written straight to the database.
+    """
+    poll_seconds = int(os.getenv("SCHEDULER_POLL_SECONDS", "300"))
+    enabled = os.getenv("SCHEDULER_ENABLED", "1").strip().lower() in _TRUTHY
     if not enabled:
         return
 
     while True:
+        delay = float(poll_seconds)
+        _scheduler_wake.clear()
         try:
             # Scheduler requires Supabase (PostDatabase); skip when using file fallback
             database = _require_db()
-            if not hasattr(database, "client"):
+            if not hasattr(database, "claim_due_scheduled_posts"):
                 await asyncio.sleep(poll_seconds)
                 continue
 
             now_iso = datetime.now(timezone.utc).isoformat()
-            # Fetch due scheduled posts
-            due = (
-                database.client.table(database.table)
-                .select("*")
-                .eq("status", "scheduled")
-                .lte("scheduled_for", now_iso)
-                .order("scheduled_for", desc=False)
-                .limit(10)
-                .execute()
-            )
-            due_posts = due.data or []
-            for post in due_posts:
-                post_id = post.get("id")
-                if not post_id:
-                    continue
-
-                # Claim the job (avoid duplicate publishing across reload/workers)
-                claimed = (
-                    database.client.table(database.table)
-                    .update(
-                        {
-                            "status": "publishing",
-                            "updated_at": now_iso,
-                            "publish_attempts": int(post.get("publish_attempts") or 0) + 1,
-                        }
-                    )
-                    .eq("id", post_id)
-                    .eq("status", "scheduled")
-                    .execute()
-                )
-                if not claimed.data:
-                    continue
-
+            # Claim due posts in bulk (avoid duplicate publishing across reload/workers); the
+            # claimed rows carry every field needed to publish, so nothing is re-fetched.
+            claimed = await run_in_threadpool(database.claim_due_scheduled_posts, now_iso, _SCHEDULER_BATCH)
+            failed: Dict[int, str] = {}
+            for post in claimed:
                 visibility = post.get("scheduled_visibility") or "PUBLIC"
                 try:
-                    result = _publish_post_internal(post=post, visibility=visibility)
-                    if result.get("success"):
-                        _require_db().mark_as_published(
-                            post_id=int(post_id),
-                            linkedin_post_id=result.get("post_id", "unknown"),
-                        )
-                        _require_db().update_post(
-                            int(post_id),
-                            last_publish_error=None,
-                            scheduled_for=None,
-                        )
-                    else:
-                        _require_db().update_post(
-                            int(post_id),
-                            status="failed",
-                            last_publish_error=str(result.get("error") or result.get("details") or "Unknown error"),
-                        )
+                    result = await _publish_post_internal(post=post, visibility=visibility)
                 except Exception as exc:
-                    _require_db().update_post(
-                        int(post_id),
-                        status="failed",
-                        last_publish_error=str(exc),
+                    failed[post["id"]] = str(exc)
+                    continue
+                if not result.get("success"):
+                    failed[post["id"]] = str(result.get("error") or result.get("details") or "Unknown error")
+                    continue
+                # A live post is recorded right away: if a later write in this tick failed, the
+                # row would stay 'publishing' and hide that it is already on LinkedIn.
+                try:
+                    await run_in_threadpool(
+                        _record_scheduled_publish, database, post["id"], result.get("post_id", "unknown")
                     )
-        except Exception as exc:
-            print(f"Scheduler loop error: {exc}")
+                except Exception:
+                    logger.exception("Post %s published but could not be marked as published", post["id"])
+            if failed:
+                # Failures share one write per distinct error; only outcome columns are sent.
+                await run_in_threadpool(_record_scheduled_failures, database, failed)
 
-        await asyncio.sleep(poll_seconds)
+            if len(claimed) >= _SCHEDULER_BATCH:
+                delay = 0.0  # more may be due right now
+            else:
+                next_at = await run_in_threadpool(database.next_scheduled_at)
+                if next_at:
+                    wait = (_parse_iso_datetime(next_at) - datetime.now(timezone.utc)).total_seconds()
+                    delay = min(delay, max(0.0, wait))
+        except Exception:
+            logger.exception("Scheduler loop error")
+
+        try:
+            await asyncio.wait_for(_scheduler_wake.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
 
 
 @app.on_event("startup")
@@ -1390,20 +2141,117 @@ async def _start_scheduler() -> None:
     asyncio.create_task(_scheduler_loop())
 
 
+@app.on_event("startup")
+async def _open_async_db() -> None:
+    global async_db
+    if _db_backend != "mongo":
+        return
+    try:
+        async_db = AsyncMongoPostDatabase()
+    except Exception as exc:
+        # Endpoints keep working through the sync driver in the threadpool.
+        logger.warning("Motor unavailable, using PyMongo in the threadpool: %s", exc)
+
+
+@app.on_event("startup")
+async def _start_user_write_flusher() -> None:
+    asyncio.create_task(_user_writes.run())
+
+
+@app.on_event("shutdown")
+async def _flush_user_writes() -> None:
+    await _user_writes.flush()
+
+
+@app.on_event("shutdown")
+async def _close_async_db() -> None:
+    if async_db is not None:
+        async_db.close()
+
+
+@app.on_event("shutdown")
+async def _stop_log_listener() -> None:
+    _log_listener.stop()  # drains queued records
+
+
+@app.on_event("shutdown")
+async def _close_http_clients() -> None:
+    await _HTTP.aclose()
+    await aclose_async_client()
+    await aclose_llm_http_clients()
+
+
+@app.on_event("shutdown")
+def _stop_automation_executor() -> None:
+    _AUTOMATION_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+
+
+@app.on_event("startup")
+async def _raise_threadpool_limit() -> None:
+    # Sync endpoints and run_in_threadpool share anyio's default limiter (40 threads), which
+    # caps concurrent blocking DB/LLM work; raise it (THREADPOOL_MAX_WORKERS, default 200).
+    anyio.to_thread.current_default_thread_limiter().total_tokens = int(
+        os.getenv("THREADPOOL_MAX_WORKERS", "200")
+    )
+
+
+@app.on_event("startup")
+async def _prewarm_jwks() -> None:
+    # Known Clerk issuer(s), comma-separated: load their JWKS before the first authenticated call.
+    for issuer in filter(None, (i.strip() for i in (os.getenv("CLERK_ISSUER") or "").split(","))):
+        async def _prefetch(issuer: str = issuer) -> None:
+            try:
+                await run_in_threadpool(_prefetch_jwks, issuer)
+            except Exception as exc:
+                logger.warning("JWKS prefetch failed for %s: %s", issuer, exc)
+
+        asyncio.create_task(_prefetch())
+
+
+@app.on_event("startup")
+async def _prewarm_llms() -> None:
+    # Opt-in: open provider connections at boot so the first generation skips the TLS handshake.
+    if os.getenv("PREWARM_LLMS", "").strip().lower() in _TRUTHY:
+        asyncio.create_task(warmup_llms())
+
+
 @app.get("/posts")
 async def list_posts(
+    req: Request,
     status: Optional[str] = Query(None, description="Filter by status"),
     clerk_user_id: Optional[str] = Query(None, description="Filter by user (for multi-tenant)"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    offset: int = Query(0, ge=0, description="Rows to skip (newest first)"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. id,topic,status"),
 ):
     """
-    List all posts, optionally filtered by status and/or clerk_user_id.
+    List posts newest first, one page at a time, optionally filtered by status and/or
+    clerk_user_id. `count` is the total number of matching posts.
     """
+    selected = None
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = sorted(set(selected) - POST_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        if "id" not in selected:
+            selected.insert(0, "id")
     try:
-        posts = _require_db().get_all_posts(status=status, clerk_user_id=clerk_user_id)
+        posts, total = await _db_call(
+            "get_posts_page",
+            status=status,
+            clerk_user_id=clerk_user_id,
+            limit=limit,
+            offset=offset,
+            fields=selected,
+        )
+        posts = [_with_served_image_url(p, req) for p in posts]
+        next_offset = offset + len(posts)
         return {
             "success": True,
-            "count": len(posts),
-            "posts": posts
+            "count": total,
+            "posts": posts,
+            "next_offset": next_offset if next_offset < total else None,
         }
     except Exception as e:
         error_msg = str(e)
@@ -1425,7 +2273,7 @@ async def profile_insights():
     Return LinkedIn profile analytics, follower counts, and workspace content stats.
     """
     try:
-        linkedin_api = LinkedInAPI()
+        linkedin_api = _linkedin_api()
     except ValueError as exc:
         return {
             "success": False,
@@ -1438,9 +2286,12 @@ async def profile_insights():
         }
 
     try:
-        profile_basic = linkedin_api.get_profile_info()
-        profile_about = linkedin_api.get_profile_about_details()
-        metrics = linkedin_api.get_profile_metrics()
+        # Blocking LinkedIn calls run concurrently in the threadpool, off the event loop.
+        profile_basic, profile_about, metrics = await asyncio.gather(
+            run_in_threadpool(linkedin_api.get_profile_info),
+            run_in_threadpool(linkedin_api.get_profile_about_details),
+            run_in_threadpool(linkedin_api.get_profile_metrics),
+        )
     except Exception as exc:
         return {
             "success": False,
@@ -1448,9 +2299,9 @@ async def profile_insights():
         }
 
     try:
-        content_stats = _compute_content_stats()
+        content_stats = await run_in_threadpool(_compute_content_stats)
     except Exception as e:
-        print(f"Warning: Failed to compute content stats: {e}")
+        logger.warning("Failed to compute content stats: %s", e)
         content_stats = {
             "published": 0,
             "avg_word_count": 0,
@@ -1511,7 +2362,8 @@ async def profile_insights():
 
     if scraped_profile:
         try:
-            summary = analyze_profile_insights(
+            summary = await run_in_threadpool(
+                analyze_profile_insights,
                 scraped_profile=scraped_profile,
                 metrics=metrics,
                 content_stats=content_stats,
@@ -1540,7 +2392,7 @@ async def profile_insights():
 
 
 @app.get("/posts/{post_id}")
-async def get_post(post_id: int):
+async def get_post(post_id: int, req: Request):
     """
     Get a specific post by ID.
     
@@ -1550,16 +2402,46 @@ async def get_post(post_id: int):
     Returns:
         Post details
     """
-    post = _require_db().get_post(post_id)
+    post = await _db_call("get_post", post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
     return {
         "success": True,
-        "post": post
+        "post": _with_served_image_url(post, req)
     }
 
 
+_IMAGE_STREAM_CHUNK = 64 * 1024
+
+
+@app.get("/posts/{post_id}/image", name="get_post_image")
+async def get_post_image(post_id: int):
+    """
+    Serve a post's image: redirect to remote storage, or stream the local file (or a legacy
+    base64 row) as raw bytes in 64 KB chunks.
+    """
+    post = await _db_call("get_post", post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if post.get("image_url"):
+        return RedirectResponse(post["image_url"])
+    image_bytes, _ = await _load_post_image(post)
+    if not image_bytes:
+        raise HTTPException(status_code=404, detail="Post has no image")
+
+    def _chunks():
+        view = memoryview(image_bytes)
+        for start in range(0, len(view), _IMAGE_STREAM_CHUNK):
+            yield bytes(view[start:start + _IMAGE_STREAM_CHUNK])
+
+    return StreamingResponse(
+        _chunks(),
+        media_type=post.get("image_mime_type") or "image/png",
+        headers={"Content-Length": str(len(image_bytes)), "Cache-Control": "private, max-age=3600"},
+    )
+
+
 @app.put("/posts/{post_id}")
 async def update_post(post_id: int, request: PostUpdateRequest):
     """
@@ -1572,7 +2454,7 @@ async def update_post(post_id: int, request: PostUpdateRequest):
     Returns:
         Updated post
     """
-    post = _require_db().get_post(post_id)
+    post = await _db_call("get_post", post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
@@ -1593,7 +2475,7 @@ async def update_post(post_id: int, request: PostUpdateRequest):
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
     
-    updated_post = _require_db().update_post(post_id, **update_data)
+    updated_post = await _db_call("update_post", post_id, **update_data)
     
     return {
         "success": True,
@@ -1610,12 +2492,12 @@ async def email_post(post_id: int, request: PostEmailRequest):
     if not request.recipients:
         raise HTTPException(status_code=400, detail="At least one recipient email is required")
 
-    post = _require_db().get_post(post_id)
+    post = await _db_call("get_post", post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
     try:
-        mailer = EmailSender()
+        mailer = _email_sender()
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
@@ -1640,21 +2522,24 @@ LinkedIn Automation
     """
 
     attachments = []
-    if request.include_image and post.get("image_base64"):
-        try:
-            image_bytes = base64.b64decode(post["image_base64"])
-            attachments.append(
-                {
-                    "filename": f"{post.get('topic', 'linkedin')}.png",
-                    "content": image_bytes,
-                    "mime_type": post.get("image_mime_type") or "image/png",
-                }
-            )
-        except Exception as exc:
-            raise HTTPException(status_code=400, detail=f"Failed to decode stored image: {exc}")
+    if request.include_image:
+        attachment = {"filename": f"{post.get('topic', 'linkedin')}.png"}
+        if post.get("image_base64") and not post.get("image_url") and not _is_local_image(post):
+            # Legacy rows: hand the stored base64 text to the mailer instead of decoding it
+            # only for the MIME encoder to re-encode it.
+            attachment["content_base64"] = post["image_base64"]
+            attachment["mime_type"] = post.get("image_mime_type") or "image/png"
+        else:
+            image_bytes, image_mime_type = await _load_post_image(post)
+            if image_bytes:
+                attachment["content"] = image_bytes
+                attachment["mime_type"] = image_mime_type
+        if "mime_type" in attachment:
+            attachments.append(attachment)
 
     try:
-        mailer.send_email(
+        await run_in_threadpool(
+            mailer.send_email,
             recipients=request.recipients,
             subject=subject,
             text_body=text_body,
@@ -1681,11 +2566,11 @@ async def delete_post(post_id: int):
     Returns:
         Deletion result
     """
-    post = _require_db().get_post(post_id)
+    post = await _db_call("get_post", post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    success = _require_db().delete_post(post_id)
+    success = await _db_call("delete_post", post_id)
     
     if success:
         return {
@@ -1696,22 +2581,92 @@ async def delete_post(post_id: int):
         raise HTTPException(status_code=500, detail="Failed to delete post")
 
 
+_LINKEDIN_STATUS_CACHE_SECONDS = int(os.getenv("LINKEDIN_STATUS_CACHE_SECONDS", "300"))
+# /auth/status payloads by clerk_user_id, so a fresh status does not need a user-table read.
+# Values are (checked_at epoch, payload): last_checked_at may be older than the cache entry,
+# and the hot path compares floats instead of re-parsing the ISO string.
+_linkedin_status_cache = _TTLCache(maxsize=10_000, ttl=_LINKEDIN_STATUS_CACHE_SECONDS)
+
+
+def _checked_epoch(ts: Optional[str]) -> Optional[float]:
+    if not ts:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
+        return (parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)).timestamp()
+    except Exception:
+        return None
+
+
+def _epoch_is_fresh(epoch: Optional[float]) -> bool:
+    return epoch is not None and time.time() - epoch < _LINKEDIN_STATUS_CACHE_SECONDS
+
+
+def _cache_linkedin_status(clerk_user_id: Optional[str], payload: dict, checked_epoch: Optional[float]) -> None:
+    # Only "connected" is kept in memory. A connect can complete on another worker, which
+    # cannot clear this cache, so "not connected" is always re-read from the user row.
+    if clerk_user_id and checked_epoch is not None and payload.get("authenticated"):
+        _linkedin_status_cache.set(clerk_user_id, (checked_epoch, {**payload, "cached": True}))
+
+
+# In-flight status checks by clerk_user_id: concurrent /auth/status calls for the same user
+# share one DB read / LinkedIn check instead of each making their own.
+_linkedin_status_inflight: Dict[str, "asyncio.Task"] = {}
+
+
 @app.get("/auth/status")
-async def auth_status(clerk_user_id: Optional[str] = Query(None)):
+async def auth_status(req: Request, response: Response, clerk_user_id: Optional[str] = Query(None)):
     """
     Check LinkedIn authentication status.
+
+    Per-user responses carry an ETag and a private Cache-Control, so dashboard polls within the
+    cache window are answered by the browser or with a 304.
     
     Returns:
         Authentication status and profile info if authenticated
     """
-    cache_seconds = int(os.getenv("LINKEDIN_STATUS_CACHE_SECONDS", "300"))
-    now_iso = datetime.now(timezone.utc).isoformat()
+    if not clerk_user_id:
+        return await _check_linkedin_status(None)
+
+    hit = _linkedin_status_cache.get(clerk_user_id)
+    if hit is not None and _epoch_is_fresh(hit[0]):
+        payload = hit[1]
+    else:
+        task = _linkedin_status_inflight.get(clerk_user_id)
+        if task is None:
+            task = asyncio.ensure_future(_check_linkedin_status(clerk_user_id))
+            _linkedin_status_inflight[clerk_user_id] = task
+            task.add_done_callback(lambda _t: _linkedin_status_inflight.pop(clerk_user_id, None))
+        # shield: a caller that disconnects must not cancel the check the others are waiting on.
+        payload = await asyncio.shield(task)
+
+    if not payload.get("last_checked_at"):
+        return payload  # fallback/error payloads are not cached
+    etag = '"{}"'.format(
+        hashlib.md5(
+            f"{payload.get('authenticated')}:{payload['last_checked_at']}:{payload.get('message')}".encode("utf-8"),
+            usedforsecurity=False,
+        ).hexdigest()
+    )
+    # no-cache: the browser must revalidate (cheap 304 via the ETag) so a connect that just
+    # finished through the OAuth redirect is never hidden behind a cached "not connected".
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in (req.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return payload
+
+
+async def _check_linkedin_status(clerk_user_id: Optional[str]) -> dict:
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
 
     cached_payload = None
     cached_last_checked = None
+    record = None
     if clerk_user_id and user_db is not None:
         try:
-            record = user_db.get_user_by_clerk_id(clerk_user_id)
+            record = await _user_db_call("get_user_by_clerk_id", clerk_user_id)
         except Exception:
             record = None
 
@@ -1724,64 +2679,54 @@ async def auth_status(clerk_user_id: Optional[str] = Query(None)):
                 "cached": True,
                 "last_checked_at": cached_last_checked,
             }
-
-            def _is_fresh(ts: Optional[str]) -> bool:
-                if not ts:
-                    return False
-                try:
-                    parsed = datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
-                    parsed_utc = parsed.astimezone(timezone.utc) if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
-                    return (datetime.now(timezone.utc) - parsed_utc).total_seconds() < cache_seconds
-                except Exception:
-                    return False
-
-            if _is_fresh(cached_last_checked):
+            checked_epoch = _checked_epoch(cached_last_checked)
+            if _epoch_is_fresh(checked_epoch):
+                _cache_linkedin_status(clerk_user_id, cached_payload, checked_epoch)
                 return cached_payload
 
+    checked_epoch = now.timestamp()
     try:
-        linkedin_api = LinkedInAPI()
+        linkedin_api = _linkedin_api_for(record)
         
-        if linkedin_api.validate_token():
-            profile = linkedin_api.get_profile_info()
+        profile = await linkedin_api.afetch_profile_or_none()
+        if profile is not None:
             if clerk_user_id and user_db is not None:
-                try:
-                    user_db.upsert_user(
-                        {
-                            "clerk_user_id": clerk_user_id,
-                            "linkedin_connected": True,
-                            "linkedin_profile": profile,
-                            "linkedin_last_checked_at": now_iso,
-                            "linkedin_status_message": "Connected",
-                        }
-                    )
-                except Exception:
-                    pass
-            return {
+                _user_writes.enqueue(
+                    {
+                        "clerk_user_id": clerk_user_id,
+                        "linkedin_connected": True,
+                        "linkedin_profile": profile,
+                        "linkedin_last_checked_at": now_iso,
+                        "linkedin_status_message": "Connected",
+                    }
+                )
+            payload = {
                 "authenticated": True,
                 "profile": profile,
                 "cached": False,
                 "last_checked_at": now_iso,
             }
+            _cache_linkedin_status(clerk_user_id, payload, checked_epoch)
+            return payload
         else:
             if clerk_user_id and user_db is not None:
-                try:
-                    user_db.upsert_user(
-                        {
-                            "clerk_user_id": clerk_user_id,
-                            "linkedin_connected": False,
-                            "linkedin_profile": None,
-                            "linkedin_last_checked_at": now_iso,
-                            "linkedin_status_message": "Token is invalid or expired",
-                        }
-                    )
-                except Exception:
-                    pass
-            return {
+                _user_writes.enqueue(
+                    {
+                        "clerk_user_id": clerk_user_id,
+                        "linkedin_connected": False,
+                        "linkedin_profile": None,
+                        "linkedin_last_checked_at": now_iso,
+                        "linkedin_status_message": "Token is invalid or expired",
+                    }
+                )
+            payload = {
                 "authenticated": False,
                 "message": "Token is invalid or expired",
                 "cached": False,
                 "last_checked_at": now_iso,
             }
+            _cache_linkedin_status(clerk_user_id, payload, checked_epoch)
+            return payload
     except ValueError:
         # If credentials are missing but we have a cached state, prefer returning cached.
         if cached_payload:
@@ -1794,7 +2739,7 @@ async def auth_status(clerk_user_id: Optional[str] = Query(None)):
             "message": "LinkedIn credentials not configured"
         }
     except Exception as e:
-        print(f"Auth Check Error: {str(e)}")  # Log detailed error
+        logger.warning("Auth check error: %s", e)
         if cached_payload:
             return {
                 **cached_payload,
@@ -1812,7 +2757,7 @@ async def sync_clerk_user(payload: ClerkUserPayload):
     Store or update a Clerk user record in MongoDB.
     """
     try:
-        user = _require_user_db().upsert_user(payload.model_dump())
+        user = await _user_db_call("upsert_user", payload.model_dump())
         return {
             "success": True,
             "user": user
@@ -1839,7 +2784,7 @@ async def get_openai_key_status(req: Request):
     Returns whether the current Clerk user has an OpenAI API key stored.
     """
     clerk_user_id = _require_clerk_user_id(req)
-    record = _require_user_db().get_user_by_clerk_id(clerk_user_id) or {}
+    record = await _user_db_call("get_user_by_clerk_id", clerk_user_id) or {}
     encrypted = record.get("openai_api_key_encrypted")
     return {
         "has_key": bool(encrypted),
@@ -1862,13 +2807,15 @@ async def set_openai_key(req: Request, payload: OpenAIKeyPayload):
     last4 = api_key[-4:] if len(api_key) >= 4 else api_key
     now_iso = datetime.now(timezone.utc).isoformat()
 
-    _require_user_db().upsert_user(
+    await _user_db_call(
+        "upsert_user",
         {
             "clerk_user_id": clerk_user_id,
             "openai_api_key_encrypted": encrypted,
             "openai_api_key_last4": last4,
             "openai_api_key_set_at": now_iso,
-        }
+        },
+        returning=False,
     )
 
     return {
@@ -1879,16 +2826,56 @@ async def set_openai_key(req: Request, payload: OpenAIKeyPayload):
     }
 
 
+@dataclass(frozen=True)
+class _OAuthConfig:
+    """LinkedIn OAuth app settings, read once at import instead of per request."""
+
+    client_id: Optional[str]
+    client_secret: str
+    redirect_uri: str
+
+    @classmethod
+    def from_env(cls) -> "_OAuthConfig":
+        return cls(
+            client_id=os.getenv("LINKEDIN_CLIENT_ID"),
+            client_secret=os.getenv("LINKEDIN_CLIENT_SECRET", "").strip('"').strip("'"),
+            redirect_uri=os.getenv("LINKEDIN_REDIRECT_URI", "http://localhost:8000/auth/callback"),
+        )
+
+
+_OAUTH = _OAuthConfig.from_env()
+
+_OAUTH_STATE_RE = re.compile(r"^[A-Za-z0-9_-]{43}$")  # secrets.token_urlsafe(32)
+
+
+def _oauth_state(req: Request) -> tuple[str, bool]:
+    """
+    CSRF state for a LinkedIn authorization URL: the browser's pending oauth_state cookie when it
+    has one (the callback clears it once consumed), else a new token. Returns (state, is_new).
+    """
+    state = req.cookies.get("oauth_state")
+    if state and _OAUTH_STATE_RE.match(state):
+        return state, False
+    return secrets.token_urlsafe(32), True
+
+
+def _set_oauth_cookies(response: Response, state: str, is_new: bool, clerk_user_id: Optional[str]) -> None:
+    if is_new:
+        response.set_cookie("oauth_state", state, httponly=True, samesite="lax")
+    if clerk_user_id:
+        response.set_cookie("oauth_clerk_user_id", clerk_user_id, httponly=True, samesite="lax")
+
+
 @app.get("/auth/url")
-async def get_auth_url(clerk_user_id: Optional[str] = Query(None)):
+async def get_auth_url(req: Request, clerk_user_id: Optional[str] = Query(None)):
     """
     Get LinkedIn OAuth authorization URL.
     
     Returns:
         OAuth URL for user to authorize the app
     """
-    client_id = os.getenv("LINKEDIN_CLIENT_ID")
-    redirect_uri = os.getenv("LINKEDIN_REDIRECT_URI", "http://localhost:8000/auth/callback")
+    client_id = _OAUTH.client_id
+    redirect_uri = _OAUTH.redirect_uri
     
     if not client_id:
         raise HTTPException(
@@ -1896,31 +2883,29 @@ async def get_auth_url(clerk_user_id: Optional[str] = Query(None)):
             detail="LINKEDIN_CLIENT_ID not configured. Please set it in .env"
         )
     
-    # Generate state for CSRF protection
-    state = secrets.token_urlsafe(32)
+    # State for CSRF protection (reused until the callback consumes it)
+    state, is_new_state = _oauth_state(req)
     
     auth_url, _ = get_oauth_url(client_id, redirect_uri, state=state)
 
-    response = JSONResponse(
+    response = _JSONResponse(
         {
             "success": True,
             "auth_url": auth_url,
             "message": "Visit this URL to authorize the app",
         }
     )
-    response.set_cookie("oauth_state", state, httponly=True, samesite="lax")
-    if clerk_user_id:
-        response.set_cookie("oauth_clerk_user_id", clerk_user_id, httponly=True, samesite="lax")
+    _set_oauth_cookies(response, state, is_new_state, clerk_user_id)
     return response
 
 
 @app.get("/auth/connect")
-async def connect_linkedin(clerk_user_id: Optional[str] = Query(None)):
+async def connect_linkedin(req: Request, clerk_user_id: Optional[str] = Query(None)):
     """
     Redirect to LinkedIn OAuth authorization page.
     """
-    client_id = os.getenv("LINKEDIN_CLIENT_ID")
-    redirect_uri = os.getenv("LINKEDIN_REDIRECT_URI", "http://localhost:8000/auth/callback")
+    client_id = _OAUTH.client_id
+    redirect_uri = _OAUTH.redirect_uri
     
     if not client_id:
         raise HTTPException(
@@ -1928,18 +2913,67 @@ async def connect_linkedin(clerk_user_id: Optional[str] = Query(None)):
             detail="LINKEDIN_CLIENT_ID not configured. Please set it in .env"
         )
     
-    # Generate state for CSRF protection
-    state = secrets.token_urlsafe(32)
+    # State for CSRF protection (reused until the callback consumes it)
+    state, is_new_state = _oauth_state(req)
     
     auth_url, _ = get_oauth_url(client_id, redirect_uri, state=state)
 
     response = RedirectResponse(url=auth_url)
-    response.set_cookie("oauth_state", state, httponly=True, samesite="lax")
-    if clerk_user_id:
-        response.set_cookie("oauth_clerk_user_id", clerk_user_id, httponly=True, samesite="lax")
+    _set_oauth_cookies(response, state, is_new_state, clerk_user_id)
     return response
 
 
+# OAuth callback pages, rendered once at import; only the error text and token lifetime vary.
+_OAUTH_REDIRECT_TARGET = f"{(os.getenv('FRONTEND_URL') or 'http://localhost:5173').rstrip('/')}/"
+
+_OAUTH_ERROR_TMPL = """
+<html>
+    <body style="font-family: Arial; padding: 50px; text-align: center;">
+        <h1 style="color: red;">❌ {title}</h1>
+        <p>{message}</p>
+        <a href="{home}" style="color: blue;">Return to Dashboard</a>
+    </body>
+</html>
+"""
+
+_OAUTH_SUCCESS_TMPL = """
+<html>
+    <head>
+        <meta http-equiv="refresh" content="2;url={redirect_target}">
+        <title>LinkedIn Connected</title>
+    </head>
+    <body style="font-family: Arial; padding: 50px; text-align: center;">
+        <h1 style="color: green;">✅ Successfully Connected to LinkedIn!</h1>
+        <p>Your LinkedIn account has been connected.</p>
+        <p><strong>Token expires in:</strong> {expires_days} days</p>
+        <p style="color:#64748b;margin-top:16px;">Redirecting you back to the dashboard…</p>
+        <a href="{redirect_target}" style="display: inline-block; margin-top: 20px; padding: 10px 20px; background: #0077b5; color: white; text-decoration: none; border-radius: 5px;">Go to Dashboard</a>
+        <script>
+          setTimeout(function () {{
+            window.location.href = "{redirect_target}";
+          }}, 1200);
+        </script>
+    </body>
+</html>
+"""
+
+
+def _oauth_error_page(title: str, message: str, home: str = "/") -> str:
+    # message can echo query parameters or upstream errors, so it is escaped.
+    return _OAUTH_ERROR_TMPL.format(title=title, message=html.escape(message), home=home)
+
+
+_OAUTH_MISSING_CODE_HTML = _oauth_error_page(
+    "Missing Authorization Code", "No authorization code received from LinkedIn."
+)
+_OAUTH_INVALID_STATE_HTML = _oauth_error_page(
+    "Invalid State Parameter", "Security validation failed. Please try again.", home=_OAUTH_REDIRECT_TARGET
+)
+_OAUTH_CONFIG_ERROR_HTML = _oauth_error_page(
+    "Configuration Error", "LinkedIn credentials not configured properly."
+)
+
+
 @app.get("/auth/callback")
 async def oauth_callback(
     request: Request,
@@ -1956,73 +2990,28 @@ async def oauth_callback(
         error: Error message if authorization failed
     """
     if error:
-        return HTMLResponse(
-            content=f"""
-            <html>
-                <body style="font-family: Arial; padding: 50px; text-align: center;">
-                    <h1 style="color: red;">❌ Authorization Failed</h1>
-                    <p>Error: {error}</p>
-                    <a href="/" style="color: blue;">Return to Dashboard</a>
-                </body>
-            </html>
-            """,
-            status_code=400
-        )
+        return HTMLResponse(_oauth_error_page("Authorization Failed", f"Error: {error}"), status_code=400)
     
     if not code:
-        return HTMLResponse(
-            content="""
-            <html>
-                <body style="font-family: Arial; padding: 50px; text-align: center;">
-                    <h1 style="color: red;">❌ Missing Authorization Code</h1>
-                    <p>No authorization code received from LinkedIn.</p>
-                    <a href="/" style="color: blue;">Return to Dashboard</a>
-                </body>
-            </html>
-            """,
-            status_code=400
-        )
+        return HTMLResponse(_OAUTH_MISSING_CODE_HTML, status_code=400)
     
     # Verify state (CSRF protection) using cookies (safe across reload/multi-process).
     stored_state = request.cookies.get("oauth_state")
     stored_clerk_user_id = request.cookies.get("oauth_clerk_user_id")
 
     if not stored_state or state != stored_state:
-        frontend_url = (os.getenv("FRONTEND_URL") or "http://localhost:5173").rstrip("/")
-        return HTMLResponse(
-            content=f"""
-            <html>
-                <body style="font-family: Arial; padding: 50px; text-align: center;">
-                    <h1 style="color: red;">❌ Invalid State Parameter</h1>
-                    <p>Security validation failed. Please try again.</p>
-                    <a href="{frontend_url}/" style="color: blue;">Return to Dashboard</a>
-                </body>
-            </html>
-            """,
-            status_code=400,
-        )
+        return HTMLResponse(_OAUTH_INVALID_STATE_HTML, status_code=400)
     
-    client_id = os.getenv("LINKEDIN_CLIENT_ID")
-    client_secret = os.getenv("LINKEDIN_CLIENT_SECRET", "").strip('"').strip("'")
-    redirect_uri = os.getenv("LINKEDIN_REDIRECT_URI", "http://localhost:8000/auth/callback")
+    client_id = _OAUTH.client_id
+    client_secret = _OAUTH.client_secret
+    redirect_uri = _OAUTH.redirect_uri
     
     if not client_id or not client_secret:
-        return HTMLResponse(
-            content="""
-            <html>
-                <body style="font-family: Arial; padding: 50px; text-align: center;">
-                    <h1 style="color: red;">❌ Configuration Error</h1>
-                    <p>LinkedIn credentials not configured properly.</p>
-                    <a href="/" style="color: blue;">Return to Dashboard</a>
-                </body>
-            </html>
-            """,
-            status_code=500
-        )
+        return HTMLResponse(_OAUTH_CONFIG_ERROR_HTML, status_code=500)
     
     try:
         # Exchange code for token
-        token_data = exchange_code_for_token(code, client_id, client_secret, redirect_uri)
+        token_data = await aexchange_code_for_token(code, client_id, client_secret, redirect_uri)
         access_token = token_data.get("access_token")
         expires_in = token_data.get("expires_in", 5184000)  # Default 60 days
         
@@ -2033,8 +3022,9 @@ async def oauth_callback(
         linkedin_api = LinkedInAPI(access_token=access_token)
         # For OIDC, we only need the profile ID to construct the URN if it's not already there
         # But validate_token or get_profile_info is called next.
+        profile = None
         try:
-            profile = linkedin_api.get_profile_info()
+            profile = await linkedin_api.aget_profile_info()
             # Try different ways to get the profile ID/URN
             profile_id = profile.get('sub') or profile.get('id') or ''
             
@@ -2047,106 +3037,58 @@ async def oauth_callback(
                 profile_urn = "urn:li:person:SET_MANUALLY"
         except Exception as e:
             profile_urn = "urn:li:person:SET_MANUALLY"
-            print(f"Warning: Could not fetch profile info: {e}")
-        
-        # Update .env file with new token and URN
-        base_dir = Path(__file__).parent
-        env_path = base_dir / ".env"
-        if env_path.exists():
-            with open(env_path, "r", encoding="utf-8") as f:
-                env_content = f.read()
-            
-            # Update or add LINKEDIN_TOKEN
-            import re
-            if re.search(r'^LINKEDIN_TOKEN=', env_content, re.MULTILINE):
-                env_content = re.sub(
-                    r'^LINKEDIN_TOKEN=.*$',
-                    f'LINKEDIN_TOKEN={access_token}',
-                    env_content,
-                    flags=re.MULTILINE
-                )
-            else:
-                env_content += f"\nLINKEDIN_TOKEN={access_token}\n"
-            
-            # Update or add PROFILE_URN
-            if re.search(r'^PROFILE_URN=', env_content, re.MULTILINE):
-                env_content = re.sub(
-                    r'^PROFILE_URN=.*$',
-                    f'PROFILE_URN={profile_urn}',
-                    env_content,
-                    flags=re.MULTILINE
-                )
-            else:
-                env_content += f"\nPROFILE_URN={profile_urn}\n"
-            
-            with open(env_path, "w", encoding="utf-8") as f:
-                f.write(env_content)
-            
-            # Reload environment variables
-            from dotenv import load_dotenv
-            load_dotenv(env_path, override=True)
+            logger.warning("Could not fetch profile info: %s", e)
         
+        if user_db is None:
+            # Single-tenant: the env token is the one account, so this process switches to it
+            # and a local .env keeps it across restarts. With users, the token lives only on the
+            # user's row; writing it to os.environ would make it the fallback for everyone.
+            os.environ["LINKEDIN_TOKEN"] = access_token
+            os.environ["PROFILE_URN"] = profile_urn
+            env_path = Path(__file__).parent / ".env"
+            if env_path.exists():
+                try:
+                    await run_in_threadpool(_write_linkedin_env, env_path, access_token, profile_urn)
+                except OSError as exc:
+                    logger.warning("Could not update %s: %s", env_path, exc)
+
         # Persist LinkedIn connection status for this Clerk user (to avoid UI delays)
+        if stored_clerk_user_id:
+            _linkedin_status_cache.pop(stored_clerk_user_id)
         if stored_clerk_user_id and user_db is not None:
+            update = {
+                "clerk_user_id": stored_clerk_user_id,
+                "linkedin_connected": True,
+                "linkedin_profile": profile,
+                "linkedin_profile_urn": profile_urn,
+                "linkedin_last_checked_at": datetime.now(timezone.utc).isoformat(),
+                "linkedin_status_message": "Connected",
+            }
             try:
-                user_db.upsert_user(
-                    {
-                        "clerk_user_id": stored_clerk_user_id,
-                        "linkedin_connected": True,
-                        "linkedin_profile": profile,
-                        "linkedin_last_checked_at": datetime.now(timezone.utc).isoformat(),
-                        "linkedin_status_message": "Connected",
-                    }
-                )
+                update["linkedin_token_encrypted"] = _encrypt_secret(access_token)
+            except HTTPException:
+                # Nowhere else to keep it: the connect cannot be used for publishing.
+                raise Exception("APP_ENCRYPTION_KEY is not set, so the LinkedIn token cannot be stored")
+            try:
+                await _user_db_call("upsert_user", update, returning=False)
             except Exception:
                 pass
 
         # Clear cookies after successful callback
-        frontend_url = (os.getenv("FRONTEND_URL") or "http://localhost:5173").rstrip("/")
-        redirect_target = f"{frontend_url}/"
-
         response = HTMLResponse(
-            content=f"""
-            <html>
-                <head>
-                    <meta http-equiv="refresh" content="2;url={redirect_target}">
-                    <title>LinkedIn Connected</title>
-                </head>
-                <body style="font-family: Arial; padding: 50px; text-align: center;">
-                    <h1 style="color: green;">✅ Successfully Connected to LinkedIn!</h1>
-                    <p>Your LinkedIn account has been connected.</p>
-                    <p><strong>Token expires in:</strong> {expires_in // 86400} days</p>
-                    <p style="color:#64748b;margin-top:16px;">Redirecting you back to the dashboard…</p>
-                    <a href="{redirect_target}" style="display: inline-block; margin-top: 20px; padding: 10px 20px; background: #0077b5; color: white; text-decoration: none; border-radius: 5px;">Go to Dashboard</a>
-                    <script>
-                      setTimeout(function () {{
-                        window.location.href = "{redirect_target}";
-                      }}, 1200);
-                    </script>
-                </body>
-            </html>
-            """
+            _OAUTH_SUCCESS_TMPL.format(redirect_target=_OAUTH_REDIRECT_TARGET, expires_days=expires_in // 86400)
         )
         response.delete_cookie("oauth_state")
         response.delete_cookie("oauth_clerk_user_id")
         return response
     
     except Exception as e:
-        return HTMLResponse(
-            content=f"""
-            <html>
-                <body style="font-family: Arial; padding: 50px; text-align: center;">
-                    <h1 style="color: red;">❌ Connection Failed</h1>
-                    <p>Error: {str(e)}</p>
-                    <a href="/" style="color: blue;">Return to Dashboard</a>
-                </body>
-            </html>
-            """,
-            status_code=500
-        )
+        return HTMLResponse(_oauth_error_page("Connection Failed", f"Error: {e}"), status_code=500)
 
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvloop/httptools ship with uvicorn[standard] but not on Windows (Proactor loop set above).
+    loop_kwargs = {} if sys.platform.startswith("win") else {"loop": "uvloop", "http": "httptools"}
+    uvicorn.run(app, host="0.0.0.0", port=port, **loop_kwargs)
 
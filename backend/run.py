@@ -38,6 +38,22 @@ if __name__ == "__main__":
     print(f"   Dashboard: http://localhost:{port}")
     print(f"\n   Press Ctrl+C to stop\n")
     
-    # Use import string for reload to work properly
-    uvicorn.run("app:app", host=host, port=port, reload=True)
+    if os.getenv("ENV", "").strip().lower() == "production":
+        # No reloader; one process per core (WEB_CONCURRENCY overrides). The scheduler's claim
+        # is atomic, so every worker can run it, and publishing reads each user's LinkedIn token
+        # from their row. That row copy needs APP_ENCRYPTION_KEY: without it only single-tenant
+        # setups can connect, and they keep the token in os.environ of the worker that served
+        # the OAuth callback, so stay on one worker.
+        # uvloop/httptools are not available on Windows.
+        if os.getenv("APP_ENCRYPTION_KEY"):
+            workers = int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+        else:
+            workers = 1
+            print("   APP_ENCRYPTION_KEY not set: running a single worker (LinkedIn tokens live in os.environ)")
+        loop_kwargs = {} if sys.platform.startswith("win") else {"loop": "uvloop", "http": "httptools"}
+        print(f"   Production mode: {workers} worker(s)\n")
+        uvicorn.run("app:app", host=host, port=port, workers=workers, **loop_kwargs)
+    else:
+        # Use import string for reload to work properly
+        uvicorn.run("app:app", host=host, port=port, reload=True)
 
@@ -0,0 +1,12 @@
+-- Dashboard content stats in one round trip (used by PostDatabase.get_content_stats).
+create or replace function public.post_content_stats()
+returns table (total bigint, drafts bigint, published bigint, scheduled bigint, last_published_at timestamptz)
+language sql stable as $$
+  select
+    count(*),
+    count(*) filter (where status = 'draft'),
+    count(*) filter (where status = 'published'),
+    count(*) filter (where status = 'scheduled'),
+    max(coalesce(published_at, updated_at, created_at)) filter (where status = 'published')
+  from public.posts;
+$$;
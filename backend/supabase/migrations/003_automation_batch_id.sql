@@ -0,0 +1,3 @@
+-- Pending OpenAI batch for draft-only automation runs (CRON_AUTOMATION_USE_BATCH). Empty/NULL when nothing is queued.
+ALTER TABLE public.clerk_users
+  ADD COLUMN IF NOT EXISTS automation_batch_id text;
@@ -0,0 +1,4 @@
+-- Per-user LinkedIn OAuth token (Fernet-encrypted with APP_ENCRYPTION_KEY) and member URN, written by /auth/callback.
+ALTER TABLE public.clerk_users
+  ADD COLUMN IF NOT EXISTS linkedin_token_encrypted text,
+  ADD COLUMN IF NOT EXISTS linkedin_profile_urn text;
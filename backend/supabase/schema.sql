@@ -45,11 +45,14 @@ create table if not exists public.clerk_users (
   linkedin_profile jsonb,
   linkedin_last_checked_at timestamptz,
   linkedin_status_message text,
+  linkedin_token_encrypted text,
+  linkedin_profile_urn text,
   occupation text,
   occupations jsonb default '[]'::jsonb,
   automation_enabled boolean not null default false,
   automation_frequency text not null default 'daily' check (automation_frequency in ('daily', 'weekly')),
   last_auto_run_at timestamptz,
+  automation_batch_id text,
   created_at timestamptz not null default now(),
   updated_at timestamptz not null default now()
 );
@@ -71,3 +74,16 @@ create table if not exists public.automation_logs (
 create index if not exists automation_logs_clerk_user_id_run_at_idx on public.automation_logs (clerk_user_id, run_at desc);
 
 
+
+-- Dashboard content stats in one round trip (used by PostDatabase.get_content_stats).
+create or replace function public.post_content_stats()
+returns table (total bigint, drafts bigint, published bigint, scheduled bigint, last_published_at timestamptz)
+language sql stable as $$
+  select
+    count(*),
+    count(*) filter (where status = 'draft'),
+    count(*) filter (where status = 'published'),
+    count(*) filter (where status = 'scheduled'),
+    max(coalesce(published_at, updated_at, created_at)) filter (where status = 'published')
+  from public.posts;
+$$;
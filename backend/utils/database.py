@@ -5,8 +5,10 @@ Supports MongoDB (primary), Supabase (Postgres), and file-based fallback.
 
 import os
 import json
+import asyncio
 import threading
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
 from pathlib import Path
 
@@ -36,6 +38,81 @@ def _backend_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
+# Columns clients may request from GET /posts?fields=... (also guards the select/projection).
+POST_FIELDS = frozenset(
+    {
+        "id", "clerk_user_id", "topic", "content", "status", "linkedin_post_id",
+        "image_base64", "image_mime_type", "image_url", "image_storage_path",
+        "scheduled_for", "scheduled_visibility", "publish_attempts", "last_publish_error",
+        "created_at", "updated_at", "published_at",
+    }
+)
+
+
+# Columns the scheduler needs to publish and settle a post (image_base64 is fetched on demand).
+_SCHEDULER_COLUMNS = (
+    "id,topic,content,status,linkedin_post_id,published_at,scheduled_for,scheduled_visibility,"
+    "publish_attempts,image_url,image_storage_path,image_mime_type,clerk_user_id"
+)
+
+
+def _posts_filter(status: Optional[str], clerk_user_id: Optional[str]) -> Dict[str, Any]:
+    q: Dict[str, Any] = {} if not status else {"status": status}
+    if clerk_user_id is not None:
+        q["clerk_user_id"] = clerk_user_id
+    return q
+
+
+def _posts_projection(fields: Optional[List[str]]) -> Dict[str, Any]:
+    projection: Dict[str, Any] = {"_id": 0}
+    if fields:
+        projection.update({f: 1 for f in fields})
+    return projection
+
+
+# Automation cooldowns: daily users run again after 23h, weekly users after 7 days.
+_DAILY_COOLDOWN = timedelta(hours=23)
+_WEEKLY_COOLDOWN = timedelta(days=7)
+
+
+def _automation_cutoffs(now: datetime) -> tuple[str, str]:
+    """ISO cutoffs (daily, weekly): users whose last_auto_run_at is older are due."""
+    return (now - _DAILY_COOLDOWN).isoformat(), (now - _WEEKLY_COOLDOWN).isoformat()
+
+
+def _has_profession(user: Dict[str, Any]) -> bool:
+    occ = (user.get("occupation") or "").strip()
+    occs = user.get("occupations") or []
+    return bool(occ) or (isinstance(occs, list) and any((x or "").strip() for x in occs))
+
+
+def _published_fields(linkedin_post_id: str, published_at: str) -> Dict[str, Any]:
+    """Columns set when a post goes live; the schedule and last error are cleared in the same write."""
+    return {
+        "status": "published",
+        "linkedin_post_id": linkedin_post_id,
+        "published_at": published_at,
+        "scheduled_for": None,
+        "last_publish_error": None,
+    }
+
+
+def _content_stats(
+    counts: Dict[str, int], total: int, recent: List[Dict], last_published_at: Optional[str]
+) -> Dict[str, Any]:
+    """Shape content stats from per-status counts and the five most recent posts."""
+    word_counts = [len(p["content"].split()) for p in recent if p.get("content")]
+    return {
+        "total": total,
+        "drafts": counts.get("draft", 0),
+        "published": counts.get("published", 0),
+        "scheduled": counts.get("scheduled", 0),
+        "avg_word_count": round(sum(word_counts) / len(word_counts), 1) if word_counts else 0,
+        "recent_topics": [p["topic"] for p in recent if p.get("topic")],
+        "last_published_at": last_published_at,
+    }
+
+
 class FilePostDatabase:
     """
     Local file-based persistence for posts.
@@ -114,6 +191,20 @@ class FilePostDatabase:
                 posts = [p for p in posts if p.get("clerk_user_id") == clerk_user_id]
             return posts
 
+    def get_posts_page(
+        self,
+        status: Optional[str] = None,
+        clerk_user_id: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+    ) -> tuple[List[Dict], int]:
+        posts = self.get_all_posts(status=status, clerk_user_id=clerk_user_id)
+        page = posts[offset:offset + limit]
+        if fields:
+            page = [{k: p.get(k) for k in fields} for p in page]
+        return page, len(posts)
+
     def update_post(self, post_id: int, **kwargs) -> Optional[Dict]:
         now = datetime.now().isoformat()
         with _FILE_LOCK:
@@ -141,12 +232,27 @@ class FilePostDatabase:
             self._save_posts(posts)
             return True
 
-    def mark_as_published(self, post_id: int, linkedin_post_id: str) -> Optional[Dict]:
+    def get_content_stats(self) -> Dict[str, Any]:
+        with _FILE_LOCK:
+            posts = self._load_posts()
+        counts: Dict[str, int] = {}
+        last_published_at = None
+        for p in posts:
+            status = p.get("status")
+            counts[status] = counts.get(status, 0) + 1
+            if status == "published":
+                ts = p.get("published_at") or p.get("updated_at") or p.get("created_at")
+                if ts and (last_published_at is None or ts > last_published_at):
+                    last_published_at = ts
+        return _content_stats(counts, len(posts), posts[:5], last_published_at)
+
+    def mark_as_published(
+        self, post_id: int, linkedin_post_id: str, extra_updates: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict]:
         return self.update_post(
             post_id,
-            status="published",
-            linkedin_post_id=linkedin_post_id,
-            published_at=datetime.now().isoformat(),
+            **_published_fields(linkedin_post_id, datetime.now().isoformat()),
+            **(extra_updates or {}),
         )
 
 
@@ -166,7 +272,7 @@ class FileUserDatabase:
     def _save_users(self, users: dict[str, dict]) -> None:
         _atomic_write_json(self.path, users)
 
-    def upsert_user(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def upsert_user(self, data: Dict[str, Any], returning: bool = True) -> Optional[Dict[str, Any]]:
         clerk_user_id = data.get("clerk_user_id")
         if not clerk_user_id:
             raise ValueError("clerk_user_id is required")
@@ -183,6 +289,21 @@ class FileUserDatabase:
             self._save_users(users)
             return merged
 
+    def upsert_users(self, rows: List[Dict[str, Any]]) -> None:
+        """upsert_user for many users with one load and one save of the file."""
+        now = datetime.now().isoformat()
+        with _FILE_LOCK:
+            users = self._load_users()
+            for data in rows:
+                clerk_user_id = data["clerk_user_id"]
+                sanitized = {k: v for k, v in data.items() if v is not None}
+                existing = users.get(clerk_user_id) or {}
+                created_at = existing.get("created_at") or sanitized.get("created_at") or now
+                merged = {**existing, **sanitized, "created_at": created_at, "updated_at": now}
+                merged["_id"] = merged.get("_id") or f"file:{clerk_user_id}"
+                users[clerk_user_id] = merged
+            self._save_users(users)
+
     def get_user_by_clerk_id(self, clerk_user_id: str) -> Optional[Dict[str, Any]]:
         with _FILE_LOCK:
             users = self._load_users()
@@ -204,6 +325,26 @@ class FileUserDatabase:
                     out.append(dict(u))
             return out
 
+    def list_users_due_for_automation(
+        self, now: datetime, include_pending_batches: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Enabled users past their daily/weekly cooldown (plus users with a pending batch)."""
+        out = []
+        for u in self.list_users_with_automation():
+            last_run = u.get("last_auto_run_at")
+            cooldown = _WEEKLY_COOLDOWN if u.get("automation_frequency") == "weekly" else _DAILY_COOLDOWN
+            try:
+                last_dt = datetime.fromisoformat(last_run.replace("Z", "+00:00")) if last_run else None
+                if last_dt is not None and last_dt.tzinfo is None:
+                    last_dt = last_dt.replace(tzinfo=timezone.utc)
+            except ValueError:
+                last_dt = None
+            if last_dt is None or last_dt < now - cooldown:
+                out.append(u)
+            elif include_pending_batches and u.get("automation_batch_id"):
+                out.append(u)
+        return out
+
     def clear_last_auto_run_at(self, clerk_user_id: str) -> None:
         """Clear last_auto_run_at so the next cron run will process this user (reset schedule)."""
         with _FILE_LOCK:
@@ -220,8 +361,12 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+@lru_cache(maxsize=1)
 def _get_mongo_client():
-    """Get MongoDB client. Uses MONGO_DB_URL or MONGODB_URI from env."""
+    """
+    Get MongoDB client. Uses MONGO_DB_URL or MONGODB_URI from env. One client (and so one
+    connection pool) is shared by every Mongo store; a failed connect is not cached.
+    """
     uri = (os.getenv("MONGO_DB_URL") or os.getenv("MONGODB_URI") or "").strip()
     if not uri:
         raise ValueError("MongoDB is not configured. Set MONGO_DB_URL or MONGODB_URI in .env")
@@ -295,6 +440,18 @@ class MongoPostDatabase:
         cursor = self.collection.find(q).sort("id", -1)
         return [{k: v for k, v in d.items() if k != "_id"} for d in cursor]
 
+    def get_posts_page(
+        self,
+        status: Optional[str] = None,
+        clerk_user_id: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+    ) -> tuple[List[Dict], int]:
+        q = _posts_filter(status, clerk_user_id)
+        cursor = self.collection.find(q, projection=_posts_projection(fields)).sort("id", -1)
+        return list(cursor.skip(offset).limit(limit)), self.collection.count_documents(q)
+
     def update_post(self, post_id: int, **kwargs) -> Optional[Dict]:
         payload = {k: v for k, v in kwargs.items() if v is not None}
         payload["updated_at"] = _now_iso()
@@ -312,14 +469,155 @@ class MongoPostDatabase:
         result = self.collection.delete_one({"id": post_id})
         return result.deleted_count > 0
 
-    def mark_as_published(self, post_id: int, linkedin_post_id: str) -> Optional[Dict]:
-        return self.update_post(
-            post_id,
-            status="published",
-            linkedin_post_id=linkedin_post_id,
-            published_at=_now_iso(),
+    def get_content_stats(self) -> Dict[str, Any]:
+        """Counts per status and latest publish time via one $group, plus the five newest posts."""
+        groups = self.collection.aggregate([
+            {
+                "$group": {
+                    "_id": "$status",
+                    "n": {"$sum": 1},
+                    "last": {
+                        "$max": {
+                            "$ifNull": ["$published_at", {"$ifNull": ["$updated_at", "$created_at"]}]
+                        }
+                    },
+                }
+            }
+        ])
+        counts: Dict[str, int] = {}
+        last_published_at = None
+        for g in groups:
+            counts[g["_id"]] = g["n"]
+            if g["_id"] == "published":
+                last_published_at = g.get("last")
+        recent = list(
+            self.collection.find({}, projection={"_id": 0, "topic": 1, "content": 1}).sort("id", -1).limit(5)
+        )
+        return _content_stats(counts, sum(counts.values()), recent, last_published_at)
+
+    def mark_as_published(
+        self, post_id: int, linkedin_post_id: str, extra_updates: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict]:
+        from pymongo import ReturnDocument
+        now = _now_iso()
+        payload = {**_published_fields(linkedin_post_id, now), **(extra_updates or {}), "updated_at": now}
+        result = self.collection.find_one_and_update(
+            {"id": post_id},
+            {"$set": payload},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+        return result or None
+
+
+class AsyncMongoPostDatabase:
+    """Motor-backed (asyncio) counterpart of MongoPostDatabase for use on the event loop."""
+
+    def __init__(self, db_name: Optional[str] = None, collection_name: Optional[str] = None):
+        uri = (os.getenv("MONGO_DB_URL") or os.getenv("MONGODB_URI") or "").strip()
+        if not uri:
+            raise ValueError("MongoDB is not configured. Set MONGO_DB_URL or MONGODB_URI in .env")
+        from motor.motor_asyncio import AsyncIOMotorClient
+        self.client = AsyncIOMotorClient(
+            uri, serverSelectionTimeoutMS=5000, maxPoolSize=100, minPoolSize=10
+        )
+        self.db = self.client.get_default_database() if not db_name else self.client[db_name]
+        self.collection = self.db[collection_name or "posts"]
+        self._id_lock = asyncio.Lock()
+
+    async def _next_id(self) -> int:
+        doc = await self.collection.find_one(sort=[("id", -1)], projection={"id": 1})
+        return (doc["id"] + 1) if doc and doc.get("id") is not None else 1
+
+    async def create_post(
+        self,
+        content: str,
+        topic: str,
+        status: str = "draft",
+        linkedin_post_id: Optional[str] = None,
+        image_base64: Optional[str] = None,
+        image_mime_type: Optional[str] = None,
+        image_url: Optional[str] = None,
+        image_storage_path: Optional[str] = None,
+        clerk_user_id: Optional[str] = None,
+    ) -> Dict:
+        now = _now_iso()
+        doc = {
+            "content": content,
+            "topic": topic,
+            "status": status,
+            "linkedin_post_id": linkedin_post_id,
+            "image_base64": image_base64,
+            "image_mime_type": image_mime_type,
+            "image_url": image_url,
+            "image_storage_path": image_storage_path,
+            "clerk_user_id": clerk_user_id,
+            "created_at": now,
+            "updated_at": now,
+            "published_at": None,
+        }
+        async with self._id_lock:
+            doc["id"] = await self._next_id()
+            await self.collection.insert_one(doc)
+        return {k: v for k, v in doc.items() if k != "_id"}
+
+    async def get_post(self, post_id: int) -> Optional[Dict]:
+        return await self.collection.find_one({"id": post_id}, projection={"_id": 0})
+
+    async def get_all_posts(self, status: Optional[str] = None, clerk_user_id: Optional[str] = None) -> List[Dict]:
+        q = {} if not status else {"status": status}
+        if clerk_user_id is not None:
+            q["clerk_user_id"] = clerk_user_id
+        cursor = self.collection.find(q, projection={"_id": 0}).sort("id", -1)
+        return await cursor.to_list(length=None)
+
+    async def get_posts_page(
+        self,
+        status: Optional[str] = None,
+        clerk_user_id: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+    ) -> tuple[List[Dict], int]:
+        q = _posts_filter(status, clerk_user_id)
+        cursor = self.collection.find(q, projection=_posts_projection(fields)).sort("id", -1)
+        page, total = await asyncio.gather(
+            cursor.skip(offset).limit(limit).to_list(length=limit),
+            self.collection.count_documents(q),
+        )
+        return page, total
+
+    async def update_post(self, post_id: int, **kwargs) -> Optional[Dict]:
+        payload = {k: v for k, v in kwargs.items() if v is not None}
+        payload["updated_at"] = _now_iso()
+        from pymongo import ReturnDocument
+        return await self.collection.find_one_and_update(
+            {"id": post_id},
+            {"$set": payload},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def delete_post(self, post_id: int) -> bool:
+        result = await self.collection.delete_one({"id": post_id})
+        return result.deleted_count > 0
+
+    async def mark_as_published(
+        self, post_id: int, linkedin_post_id: str, extra_updates: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict]:
+        from pymongo import ReturnDocument
+        now = _now_iso()
+        payload = {**_published_fields(linkedin_post_id, now), **(extra_updates or {}), "updated_at": now}
+        return await self.collection.find_one_and_update(
+            {"id": post_id},
+            {"$set": payload},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
         )
 
+    def close(self) -> None:
+        self.client.close()
+
 
 class MongoUserDatabase:
     """MongoDB-backed storage for Clerk users."""
@@ -329,29 +627,45 @@ class MongoUserDatabase:
         self.db = client.get_default_database() if not db_name else client[db_name]
         self.collection = self.db[collection_name or "clerk_users"]
 
-    def upsert_user(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def upsert_user(self, data: Dict[str, Any], returning: bool = True) -> Optional[Dict[str, Any]]:
         clerk_user_id = data.get("clerk_user_id")
         if not clerk_user_id:
             raise ValueError("clerk_user_id is required")
-        existing = self.get_user_by_clerk_id(clerk_user_id)
-        created_at = (
-            (existing or {}).get("created_at")
-            or data.get("created_at")
-            or _now_iso()
-        )
-        sanitized = {k: v for k, v in data.items() if v is not None}
-        payload = {
-            **sanitized,
-            "clerk_user_id": clerk_user_id,
-            "created_at": created_at,
-            "updated_at": _now_iso(),
-        }
-        self.collection.update_one(
+        from pymongo import ReturnDocument
+        sanitized = {k: v for k, v in data.items() if v is not None and k != "created_at"}
+        payload = {**sanitized, "clerk_user_id": clerk_user_id, "updated_at": _now_iso()}
+        update = {"$set": payload, "$setOnInsert": {"created_at": data.get("created_at") or _now_iso()}}
+        if not returning:
+            self.collection.update_one({"clerk_user_id": clerk_user_id}, update, upsert=True)
+            return None
+        # One round-trip: created_at only on insert, and the updated document comes back.
+        doc = self.collection.find_one_and_update(
             {"clerk_user_id": clerk_user_id},
-            {"$set": payload},
+            update,
             upsert=True,
+            projection={"_id": False},
+            return_document=ReturnDocument.AFTER,
         )
-        return self.get_user_by_clerk_id(clerk_user_id) or payload
+        return doc or payload
+
+    def upsert_users(self, rows: List[Dict[str, Any]]) -> None:
+        """upsert_user for many users in one bulk_write (nothing is read back)."""
+        from pymongo import UpdateOne
+        ops = []
+        for data in rows:
+            sanitized = {k: v for k, v in data.items() if v is not None and k != "created_at"}
+            ops.append(
+                UpdateOne(
+                    {"clerk_user_id": data["clerk_user_id"]},
+                    {
+                        "$set": {**sanitized, "updated_at": _now_iso()},
+                        "$setOnInsert": {"created_at": data.get("created_at") or _now_iso()},
+                    },
+                    upsert=True,
+                )
+            )
+        if ops:
+            self.collection.bulk_write(ops, ordered=False)
 
     def get_user_by_clerk_id(self, clerk_user_id: str) -> Optional[Dict[str, Any]]:
         doc = self.collection.find_one({"clerk_user_id": clerk_user_id})
@@ -378,6 +692,35 @@ class MongoUserDatabase:
                 out.append(doc)
         return out
 
+    def list_users_due_for_automation(
+        self, now: datetime, include_pending_batches: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Enabled users past their daily/weekly cooldown (plus users with a pending batch)."""
+        daily_cutoff, weekly_cutoff = _automation_cutoffs(now)
+        due_clauses: List[Dict[str, Any]] = [
+            {"last_auto_run_at": {"$in": [None, ""]}},
+            {"automation_frequency": "weekly", "last_auto_run_at": {"$lt": weekly_cutoff}},
+            {"automation_frequency": {"$ne": "weekly"}, "last_auto_run_at": {"$lt": daily_cutoff}},
+        ]
+        if include_pending_batches:
+            due_clauses.append({"automation_batch_id": {"$nin": [None, ""]}})
+        cursor = self.collection.find(
+            {
+                "automation_enabled": True,
+                "$and": [
+                    {
+                        "$or": [
+                            {"occupation": {"$exists": True, "$ne": None, "$nin": [""]}},
+                            {"occupations.0": {"$exists": True}},
+                        ]
+                    },
+                    {"$or": due_clauses},
+                ],
+            },
+            projection={"_id": 0},
+        )
+        return [doc for doc in cursor if _has_profession(doc)]
+
     def clear_last_auto_run_at(self, clerk_user_id: str) -> None:
         """Clear last_auto_run_at so the next cron run will process this user (reset schedule)."""
         self.collection.update_one(
@@ -402,7 +745,10 @@ def get_supabase_storage_client():
     return create_client(supabase_url, supabase_key)
 
 
+@lru_cache(maxsize=1)
 def _get_supabase_client():
+    # Shared by the post, user and log stores: one pooled HTTP client and one startup probe
+    # instead of one per store. Failures are not cached, so a later store can retry.
     supabase_url = (os.getenv("SUPABASE_URL") or "").strip()
     supabase_key = (os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_ANON_KEY") or "").strip()
     if not supabase_url or not supabase_key:
@@ -484,25 +830,179 @@ class PostDatabase:
         result = query.order("id", desc=True).execute()
         return result.data or []
 
+    def get_posts_page(
+        self,
+        status: Optional[str] = None,
+        clerk_user_id: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+    ) -> tuple[List[Dict], int]:
+        """One page of posts plus the exact total, counted by Postgres in the same request."""
+        query = self.client.table(self.table).select(",".join(fields) if fields else "*", count="exact")
+        if status:
+            query = query.eq("status", status)
+        if clerk_user_id is not None:
+            query = query.eq("clerk_user_id", clerk_user_id)
+        result = query.order("id", desc=True).range(offset, offset + limit - 1).execute()
+        return result.data or [], result.count or 0
+
     def update_post(self, post_id: int, **kwargs) -> Optional[Dict]:
         payload = {k: v for k, v in kwargs.items() if v is not None}
         payload["updated_at"] = _now_iso()
         result = self.client.table(self.table).update(payload).eq("id", post_id).execute()
-        if not result.data:
-            return None
-        return self.get_post(post_id)
+        # PostgREST returns the updated row; no need to read it back.
+        return result.data[0] if result.data else None
 
     def delete_post(self, post_id: int) -> bool:
         result = self.client.table(self.table).delete().eq("id", post_id).execute()
         return bool(result.data)
 
-    def mark_as_published(self, post_id: int, linkedin_post_id: str) -> Optional[Dict]:
-        return self.update_post(
-            post_id,
-            status="published",
-            linkedin_post_id=linkedin_post_id,
-            published_at=_now_iso(),
+    def get_content_stats(self) -> Dict[str, Any]:
+        """Aggregate via the post_content_stats() RPC; exact HEAD counts if it is not installed."""
+        recent = (
+            self.client.table(self.table)
+            .select("topic,content")
+            .order("id", desc=True)
+            .limit(5)
+            .execute()
+        ).data or []
+        if self.table == "posts":  # the RPC reads public.posts
+            try:
+                row = (self.client.rpc("post_content_stats").execute().data or [{}])[0]
+                counts = {
+                    "draft": row.get("drafts") or 0,
+                    "published": row.get("published") or 0,
+                    "scheduled": row.get("scheduled") or 0,
+                }
+                return _content_stats(counts, row.get("total") or 0, recent, row.get("last_published_at"))
+            except Exception:
+                pass
+
+        def _count(status: Optional[str] = None) -> int:
+            query = self.client.table(self.table).select("id", count="exact", head=True)
+            if status:
+                query = query.eq("status", status)
+            return query.execute().count or 0
+
+        counts = {s: _count(s) for s in ("draft", "published", "scheduled")}
+        last = (
+            self.client.table(self.table)
+            .select("published_at")
+            .eq("status", "published")
+            .not_.is_("published_at", "null")
+            .order("published_at", desc=True)
+            .limit(1)
+            .execute()
+        ).data
+        return _content_stats(counts, _count(), recent, last[0]["published_at"] if last else None)
+
+    def mark_as_published(
+        self, post_id: int, linkedin_post_id: str, extra_updates: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict]:
+        # Written directly rather than via update_post, which drops None values and so could
+        # not clear scheduled_for / last_publish_error.
+        now = _now_iso()
+        payload = {**_published_fields(linkedin_post_id, now), **(extra_updates or {}), "updated_at": now}
+        result = self.client.table(self.table).update(payload).eq("id", post_id).execute()
+        return result.data[0] if result.data else None
+
+    def claim_due_scheduled_posts(self, now_iso: str, limit: int = 10) -> List[Dict]:
+        """
+        Move due scheduled posts to 'publishing' and return the claimed rows. The claim is
+        one UPDATE ... WHERE id IN (...) AND status = 'scheduled' per distinct publish_attempts
+        value, so rows another worker already claimed are not returned.
+
+        Claimed rows are read back with only the columns publishing needs; image_base64 (legacy
+        rows, often hundreds of KB) is fetched separately and only for posts with no other image.
+        """
+        from postgrest.types import ReturnMethod
+
+        due = (
+            self.client.table(self.table)
+            .select("id,publish_attempts")
+            .eq("status", "scheduled")
+            .lte("scheduled_for", now_iso)
+            .order("scheduled_for", desc=False)
+            .limit(limit)
+            .execute()
+        ).data or []
+        if not due:
+            return []
+        by_attempts: Dict[int, List[int]] = {}
+        for row in due:
+            by_attempts.setdefault(int(row.get("publish_attempts") or 0), []).append(row["id"])
+        for attempts, ids in by_attempts.items():
+            (
+                self.client.table(self.table)
+                .update(
+                    {"status": "publishing", "updated_at": now_iso, "publish_attempts": attempts + 1},
+                    returning=ReturnMethod.minimal,
+                )
+                .in_("id", ids)
+                .eq("status", "scheduled")
+                .execute()
+            )
+        # This tick's claims are the due ids now 'publishing' with our updated_at stamp.
+        claimed = (
+            self.client.table(self.table)
+            .select(_SCHEDULER_COLUMNS)
+            .in_("id", [row["id"] for row in due])
+            .eq("status", "publishing")
+            .eq("updated_at", now_iso)
+            .execute()
+        ).data or []
+        legacy_ids = [
+            p["id"] for p in claimed if not p.get("image_url") and not p.get("image_storage_path")
+        ]
+        if legacy_ids:
+            blobs = (
+                self.client.table(self.table)
+                .select("id,image_base64")
+                .in_("id", legacy_ids)
+                .not_.is_("image_base64", "null")
+                .execute()
+            ).data or []
+            by_id = {row["id"]: row["image_base64"] for row in blobs}
+            for p in claimed:
+                if p["id"] in by_id:
+                    p["image_base64"] = by_id[p["id"]]
+        return claimed
+
+    def next_scheduled_at(self) -> Optional[str]:
+        """scheduled_for of the earliest post still waiting to publish, or None."""
+        result = (
+            self.client.table(self.table)
+            .select("scheduled_for")
+            .eq("status", "scheduled")
+            .order("scheduled_for", desc=False)
+            .limit(1)
+            .execute()
         )
+        return result.data[0]["scheduled_for"] if result.data else None
+
+    def fail_scheduled_posts(self, errors: Dict[int, str]) -> None:
+        """
+        Mark claimed posts as failed, {post id: error}. One UPDATE ... WHERE id IN (...) per
+        distinct error, touching only the outcome columns so edits to topic/content made while
+        the post was publishing are kept.
+        """
+        from postgrest.types import ReturnMethod
+
+        by_error: Dict[str, List[int]] = {}
+        for post_id, error in errors.items():
+            by_error.setdefault(error, []).append(post_id)
+        now = _now_iso()
+        for error, ids in by_error.items():
+            (
+                self.client.table(self.table)
+                .update(
+                    {"status": "failed", "last_publish_error": error, "updated_at": now},
+                    returning=ReturnMethod.minimal,
+                )
+                .in_("id", ids)
+                .execute()
+            )
 
 
 class UserDatabase:
@@ -512,35 +1012,60 @@ class UserDatabase:
         self.client = _get_supabase_client()
         self.table = table_name or os.getenv("SUPABASE_USERS_TABLE") or "clerk_users"
 
-    def upsert_user(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def upsert_user(self, data: Dict[str, Any], returning: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        One INSERT ... ON CONFLICT (clerk_user_id) DO UPDATE. With returning=False the row is
+        not sent back (callers that only write).
+        """
+        from postgrest.types import ReturnMethod
+
         clerk_user_id = data.get("clerk_user_id")
         if not clerk_user_id:
             raise ValueError("clerk_user_id is required")
 
-        existing = self.get_user_by_clerk_id(clerk_user_id)
-        created_at = (
-            (existing or {}).get("created_at")
-            or data.get("created_at")
-            or _now_iso()
-        )
-
+        # No pre-read for created_at: new rows take the column default, and the upsert only
+        # touches the columns in the payload, so an existing created_at is kept.
         sanitized = {k: v for k, v in data.items() if v is not None}
         payload = {
             **sanitized,
             "clerk_user_id": clerk_user_id,
-            "created_at": created_at,
             "updated_at": _now_iso(),
         }
 
         result = (
             self.client.table(self.table)
-            .upsert(payload, on_conflict="clerk_user_id")
+            .upsert(
+                payload,
+                on_conflict="clerk_user_id",
+                returning=ReturnMethod.representation if returning else ReturnMethod.minimal,
+            )
             .execute()
         )
+        if not returning:
+            return None
         if not result.data:
             raise ValueError("Failed to upsert user in Supabase.")
         return result.data[0]
 
+    def upsert_users(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        upsert_user for many users: one upsert per distinct column set (a bulk upsert sends
+        the same columns for every row, so rows are grouped rather than padded with NULLs).
+        """
+        from postgrest.types import ReturnMethod
+
+        now = _now_iso()
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for data in rows:
+            payload = {**{k: v for k, v in data.items() if v is not None}, "updated_at": now}
+            groups.setdefault(tuple(sorted(payload)), []).append(payload)
+        for payloads in groups.values():
+            (
+                self.client.table(self.table)
+                .upsert(payloads, on_conflict="clerk_user_id", returning=ReturnMethod.minimal)
+                .execute()
+            )
+
     def get_user_by_clerk_id(self, clerk_user_id: str) -> Optional[Dict[str, Any]]:
         result = (
             self.client.table(self.table)
@@ -566,6 +1091,30 @@ class UserDatabase:
                 out.append(row)
         return out
 
+    def list_users_due_for_automation(
+        self, now: datetime, include_pending_batches: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Enabled users past their daily/weekly cooldown, filtered by Postgres in one query (plus
+        users with a pending OpenAI batch when requested).
+        """
+        daily_cutoff, weekly_cutoff = _automation_cutoffs(now)
+        due = [
+            "last_auto_run_at.is.null",
+            f'and(automation_frequency.eq.weekly,last_auto_run_at.lt."{weekly_cutoff}")',
+            f'and(automation_frequency.neq.weekly,last_auto_run_at.lt."{daily_cutoff}")',
+        ]
+        if include_pending_batches:
+            due.append("automation_batch_id.like.batch_*")
+        result = (
+            self.client.table(self.table)
+            .select("*")
+            .eq("automation_enabled", True)
+            .or_(",".join(due))
+            .execute()
+        )
+        return [row for row in result.data or [] if _has_profession(row)]
+
     def clear_last_auto_run_at(self, clerk_user_id: str) -> None:
         """Clear last_auto_run_at so the next cron run will process this user (reset schedule)."""
         self.client.table(self.table).update({"last_auto_run_at": None}).eq(
@@ -578,6 +1127,22 @@ class UserDatabase:
 
 # --- Automation run logs (Mongo creates collection on first insert) ---
 
+def _log_row(
+    clerk_user_id: str,
+    run_at: str,
+    status: str,
+    posts_created: int = 0,
+    error_message: Optional[str] = None,
+) -> Dict[str, Any]:
+    return {
+        "clerk_user_id": clerk_user_id,
+        "run_at": run_at,
+        "status": status,
+        "posts_created": posts_created,
+        "error_message": error_message,
+    }
+
+
 class MongoAutomationLogStore:
     """MongoDB store for automation run logs. Collection is created on first insert."""
 
@@ -598,14 +1163,12 @@ class MongoAutomationLogStore:
         posts_created: int = 0,
         error_message: Optional[str] = None,
     ) -> None:
-        doc = {
-            "clerk_user_id": clerk_user_id,
-            "run_at": run_at,
-            "status": status,
-            "posts_created": posts_created,
-            "error_message": error_message,
-        }
-        self.collection.insert_one(doc)
+        self.append_logs([_log_row(clerk_user_id, run_at, status, posts_created, error_message)])
+
+    def append_logs(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert many log rows in one round trip."""
+        if rows:
+            self.collection.insert_many([dict(r) for r in rows], ordered=False)
 
     def get_logs_for_user(self, clerk_user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
         cursor = (
@@ -645,15 +1208,14 @@ class FileAutomationLogStore:
         posts_created: int = 0,
         error_message: Optional[str] = None,
     ) -> None:
+        self.append_logs([_log_row(clerk_user_id, run_at, status, posts_created, error_message)])
+
+    def append_logs(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
         with _FILE_LOCK:
             logs = self._load()
-            logs.append({
-                "clerk_user_id": clerk_user_id,
-                "run_at": run_at,
-                "status": status,
-                "posts_created": posts_created,
-                "error_message": error_message,
-            })
+            logs.extend(rows)
             self._save(logs)
 
     def get_logs_for_user(self, clerk_user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
@@ -688,14 +1250,12 @@ class SupabaseAutomationLogStore:
         posts_created: int = 0,
         error_message: Optional[str] = None,
     ) -> None:
-        payload = {
-            "clerk_user_id": clerk_user_id,
-            "run_at": run_at,
-            "status": status,
-            "posts_created": posts_created,
-            "error_message": error_message,
-        }
-        self.client.table(self.table).insert(payload).execute()
+        self.append_logs([_log_row(clerk_user_id, run_at, status, posts_created, error_message)])
+
+    def append_logs(self, rows: List[Dict[str, Any]]) -> None:
+        """Bulk insert: PostgREST takes the rows as one JSON array body."""
+        if rows:
+            self.client.table(self.table).insert(rows).execute()
 
     def get_logs_for_user(self, clerk_user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
         result = (
@@ -4,7 +4,7 @@ Set DROPBOX_ACCESS_TOKEN in .env (and optionally DROPBOX_IMAGE_FOLDER).
 """
 import os
 import re
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
 # Lazy import so app starts without dropbox if not using it
 _dropbox_client = None
@@ -36,13 +36,14 @@ def _shared_link_to_direct(url: str) -> str:
 
 
 def upload_image(
-    image_bytes: bytes,
+    image_bytes: Union[bytes, BinaryIO],
     mime_type: str,
     path_or_name: str,
     folder: Optional[str] = None,
 ) -> Optional[dict]:
     """
     Upload image to Dropbox and return public direct URL.
+    image_bytes may be raw bytes or a binary file object (read once, at upload time).
     Returns None if Dropbox is not configured or upload fails.
     """
     dbx = _get_dropbox_client()
@@ -55,7 +56,8 @@ def upload_image(
     dropbox_path = f"{folder}{path_or_name}"
     try:
         from dropbox.files import WriteMode
-        dbx.files_upload(image_bytes, dropbox_path, mode=WriteMode.overwrite)
+        data = image_bytes if isinstance(image_bytes, bytes) else image_bytes.read()
+        dbx.files_upload(data, dropbox_path, mode=WriteMode.overwrite)
     except Exception:
         return None
     try:
@@ -4,6 +4,8 @@ from typing import Optional
 from openai import OpenAI
 import requests
 
+from utils.rate_limit import openai_limiter
+
 
 def get_openai_client() -> OpenAI:
     api_key = os.getenv("OPENAI_API_KEY")
@@ -34,6 +36,10 @@ def generate_post_image(prompt: str, model: Optional[str] = None) -> bytes:
     size = "1024x1024" if model_name == "dall-e-3" else "1024x1024"
     quality = "standard" if model_name == "dall-e-3" else None
     
+    limiter = openai_limiter(os.getenv("OPENAI_API_KEY"))
+    if limiter is not None:
+        limiter.acquire(0)  # image endpoints are limited per request, not per token
+
     try:
         # Generate image using OpenAI DALL-E
         response = client.images.generate(
@@ -2,10 +2,31 @@
 
 import os
 import json
+import logging
 from typing import Dict, Optional
 from urllib.parse import quote
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# One pooled session for every LinkedIn call: keep-alive connections are reused across
+# posts, uploads and profile checks instead of a fresh TCP/TLS handshake per request.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+
+# Async counterpart for the auth endpoints, so token checks and the OAuth code exchange do
+# not block the event loop. Closed by the app on shutdown (aclose_async_client).
+_ASYNC_CLIENT = httpx.AsyncClient(
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+)
+
+
+async def aclose_async_client() -> None:
+    await _ASYNC_CLIENT.aclose()
 
 
 class LinkedInAPI:
@@ -51,21 +72,21 @@ class LinkedInAPI:
             if "X-Restli-Protocol-Version" in oidc_headers:
                 del oidc_headers["X-Restli-Protocol-Version"]
                 
-            response = requests.get(
+            response = _SESSION.get(
                 f"{self.base_url}/userinfo",
                 headers=oidc_headers
             )
             if response.status_code == 200:
                 return response.json()
             else:
-                print(f"OIDC Userinfo check failed: {response.status_code} {response.text}")
+                logger.info("OIDC userinfo check failed: %s %s", response.status_code, response.text)
         except Exception as e:
-            print(f"OIDC Userinfo check error: {e}")
+            logger.info("OIDC userinfo check error: %s", e)
             pass
             
         # Fallback to legacy /me endpoint
         try:
-            response = requests.get(
+            response = _SESSION.get(
                 f"{self.base_url}/me",
                 headers=self.headers
             )
@@ -73,7 +94,28 @@ class LinkedInAPI:
             return response.json()
         except requests.exceptions.RequestException as e:
             if hasattr(e, 'response') and e.response is not None:
-                print(f"Profile fetch failed: {e.response.status_code} {e.response.text}")
+                logger.warning("Profile fetch failed: %s %s", e.response.status_code, e.response.text)
+            raise Exception(f"Failed to get profile info: {str(e)}")
+
+    async def aget_profile_info(self) -> Dict:
+        """Async get_profile_info: OIDC /userinfo first, then the legacy /me endpoint."""
+        oidc_headers = {k: v for k, v in self.headers.items() if k != "X-Restli-Protocol-Version"}
+        try:
+            response = await _ASYNC_CLIENT.get(f"{self.base_url}/userinfo", headers=oidc_headers)
+            if response.status_code == 200:
+                return response.json()
+            logger.info("OIDC userinfo check failed: %s %s", response.status_code, response.text)
+        except httpx.HTTPError as e:
+            logger.info("OIDC userinfo check error: %s", e)
+
+        try:
+            response = await _ASYNC_CLIENT.get(f"{self.base_url}/me", headers=self.headers)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.warning("Profile fetch failed: %s %s", e.response.status_code, e.response.text)
+            raise Exception(f"Failed to get profile info: {str(e)}")
+        except httpx.HTTPError as e:
             raise Exception(f"Failed to get profile info: {str(e)}")
 
     def get_profile_about_details(self) -> Dict[str, Optional[str]]:
@@ -101,7 +143,7 @@ class LinkedInAPI:
 
         # Attempt to expand /me projection first
         try:
-            response = requests.get(
+            response = _SESSION.get(
                 f"{self.base_url}/me?projection={projection}",
                 headers=self.headers,
                 timeout=15,
@@ -132,7 +174,7 @@ class LinkedInAPI:
                 "projection": "(headline,industryName,summary)",
             }
             try:
-                response = requests.get(
+                response = _SESSION.get(
                     identity_url,
                     headers={
                         **self.headers,
@@ -241,7 +283,7 @@ class LinkedInAPI:
 
         for endpoint in endpoints:
             try:
-                response = requests.get(
+                response = _SESSION.get(
                     endpoint["url"],
                     headers=endpoint["headers"],
                     params=endpoint["params"],
@@ -296,7 +338,7 @@ class LinkedInAPI:
             }
         }
         
-        register_response = requests.post(
+        register_response = _SESSION.post(
             f"{self.base_url}/assets?action=registerUpload",
             headers=self.headers,
             data=json.dumps(register_payload)
@@ -311,7 +353,7 @@ class LinkedInAPI:
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": mime_type
         }
-        upload_response = requests.put(
+        upload_response = _SESSION.put(
             upload_url,
             data=image_bytes,
             headers=upload_headers
@@ -353,7 +395,7 @@ class LinkedInAPI:
                     "title": {"text": image_alt_text or "Generated visual"}
                 }]
             except Exception as image_exc:
-                print(f"Image upload failed, falling back to text-only post: {image_exc}")
+                logger.warning("Image upload failed, falling back to text-only post: %s", image_exc)
                 share_category = "NONE"
                 media_entries = None
         
@@ -374,7 +416,7 @@ class LinkedInAPI:
             payload["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = media_entries
         
         try:
-            response = requests.post(
+            response = _SESSION.post(
                 f"{self.base_url}/ugcPosts",
                 headers=self.headers,
                 data=json.dumps(payload)
@@ -415,7 +457,37 @@ class LinkedInAPI:
             self.get_profile_info()
             return True
         except Exception as e:
-            print(f"Token validation failed: {str(e)}")
+            logger.warning("Token validation failed: %s", e)
+            return False
+
+    async def afetch_profile_or_none(self) -> Optional[Dict]:
+        """
+        Validate the token and fetch the profile in one call: the /userinfo JSON, or None when
+        LinkedIn rejects the token (401/403). Other statuses fall back to the legacy /me lookup;
+        network errors raise.
+        """
+        oidc_headers = {k: v for k, v in self.headers.items() if k != "X-Restli-Protocol-Version"}
+        response = await _ASYNC_CLIENT.get(f"{self.base_url}/userinfo", headers=oidc_headers)
+        if response.status_code == 200:
+            return response.json()
+        if response.status_code in (401, 403):
+            logger.warning("Token validation failed: %s %s", response.status_code, response.text)
+            return None
+        try:
+            response = await _ASYNC_CLIENT.get(f"{self.base_url}/me", headers=self.headers)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.warning("Token validation failed: %s %s", e.response.status_code, e.response.text)
+            return None
+
+    async def avalidate_token(self) -> bool:
+        """Async validate_token."""
+        try:
+            await self.aget_profile_info()
+            return True
+        except Exception as e:
+            logger.warning("Token validation failed: %s", e)
             return False
 
 
@@ -483,13 +555,30 @@ def exchange_code_for_token(code: str, client_id: str, client_secret: str, redir
     }
     
     try:
-        response = requests.post(token_url, data=data, headers=headers)
+        response = _SESSION.post(token_url, data=data, headers=headers)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
         raise Exception(f"Failed to exchange code for token: {str(e)}")
 
 
+async def aexchange_code_for_token(code: str, client_id: str, client_secret: str, redirect_uri: str) -> Dict:
+    """Async exchange_code_for_token."""
+    data = {
+        "grant_type": "authorization_code",
+        "code": code,
+        "redirect_uri": redirect_uri,
+        "client_id": client_id,
+        "client_secret": client_secret
+    }
+    try:
+        response = await _ASYNC_CLIENT.post("https://www.linkedin.com/oauth/v2/accessToken", data=data)
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        raise Exception(f"Failed to exchange code for token: {str(e)}")
+
+
 if __name__ == "__main__":
     # Test LinkedIn API (requires valid token)
     print("Testing LinkedIn API...")
@@ -4,9 +4,33 @@ import os
 import smtplib
 import ssl
 from email.message import EmailMessage
+from functools import lru_cache
 from typing import Iterable, List, Optional
 
 
+@lru_cache(maxsize=1)
+def _ssl_context() -> ssl.SSLContext:
+    # Loading the CA bundle costs a few ms; the context is safe to share across sends.
+    return ssl.create_default_context()
+
+
+def _attach_base64(msg: EmailMessage, data: str, maintype: str, subtype: str, filename: str) -> None:
+    """
+    Attach content that is already base64 text (e.g. a legacy image_base64 column) as-is.
+    add_attachment() would need the decoded bytes only to base64-encode them again.
+    """
+    if "\n" not in data:
+        data = "\n".join(data[i : i + 76] for i in range(0, len(data), 76))
+    part = EmailMessage()
+    part["Content-Type"] = f"{maintype}/{subtype}"
+    part["Content-Transfer-Encoding"] = "base64"
+    part.add_header("Content-Disposition", "attachment", filename=filename)
+    part.set_payload(data)
+    if msg.get_content_type() != "multipart/mixed":
+        msg.make_mixed()
+    msg.attach(part)
+
+
 class EmailSender:
     """Simple SMTP wrapper with Gmail-friendly defaults."""
 
@@ -63,6 +87,9 @@ class EmailSender:
             filename = attachment.get("filename", "attachment")
             mime_type = attachment.get("mime_type", "application/octet-stream")
             maintype, _, subtype = mime_type.partition("/")
+            if attachment.get("content_base64") is not None:
+                _attach_base64(msg, attachment["content_base64"], maintype, subtype or "octet-stream", filename)
+                continue
             msg.add_attachment(
                 content,
                 maintype=maintype,
@@ -70,9 +97,8 @@ class EmailSender:
                 filename=filename,
             )
 
-        context = ssl.create_default_context()
         with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-            server.starttls(context=context)
+            server.starttls(context=_ssl_context())
             server.login(self.smtp_user, self.smtp_password)
             server.send_message(msg)
 
@@ -0,0 +1,124 @@
+"""Client-side RPM/TPM throttle for outbound OpenAI calls.
+
+Requests reserve capacity from two token buckets (requests per minute and tokens per minute)
+before they are sent, so a burst of automation users waits briefly instead of collecting 429s
+and backing off. Limits come from OPENAI_RPM / OPENAI_TPM; with neither set this is a no-op.
+Buckets are per API key, since OpenAI limits are per organization key.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken ships with langchain-openai
+    tiktoken = None
+
+
+class _TokenBucket:
+    """Reserve-ahead bucket: callers take capacity now and are told how long to wait for it."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= amount
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+
+class RateLimiter:
+    def __init__(self, rpm: Optional[int], tpm: Optional[int]):
+        self._requests = _TokenBucket(rpm) if rpm else None
+        self._tokens = _TokenBucket(tpm) if tpm else None
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            wait = 0.0
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens))
+            return wait
+
+    def acquire(self, tokens: int) -> None:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def wait(self, tokens: int) -> None:
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_RPM = int(os.getenv("OPENAI_RPM", "0") or 0)
+_TPM = int(os.getenv("OPENAI_TPM", "0") or 0)
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def openai_limiter(api_key: Optional[str]) -> Optional[RateLimiter]:
+    """Limiter shared by every call made with api_key, or None when throttling is off."""
+    if not (_RPM or _TPM) or not api_key:
+        return None
+    key = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = _LIMITERS[key] = RateLimiter(_RPM, _TPM)
+        return limiter
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def estimate_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """Prompt tokens for text (tiktoken when available, else ~4 characters per token)."""
+    if not text:
+        return 0
+    if tiktoken is not None:
+        try:
+            return len(_encoding(model).encode(text))
+        except Exception:
+            pass
+    return len(text) // 4 + 1
+
+
+def _openai_key_of(llm: object) -> Optional[str]:
+    """API key of a LangChain ChatOpenAI talking to api.openai.com (None for other providers)."""
+    if type(llm).__name__ != "ChatOpenAI" or getattr(llm, "openai_api_base", None):
+        return None
+    secret = getattr(llm, "openai_api_key", None)
+    if secret is None:
+        return os.getenv("OPENAI_API_KEY")
+    return secret.get_secret_value() if hasattr(secret, "get_secret_value") else str(secret)
+
+
+async def throttle_llm(llm: object, prompt: str, max_tokens: int) -> None:
+    """Wait for RPM/TPM capacity before an OpenAI chat call (prompt estimate + output cap)."""
+    limiter = openai_limiter(_openai_key_of(llm))
+    if limiter is not None:
+        model = getattr(llm, "model_name", None) or "gpt-4o-mini"
+        await limiter.wait(estimate_tokens(prompt, model) + max_tokens)
+
+
+__all__ = ["RateLimiter", "estimate_tokens", "openai_limiter", "throttle_llm"]
@@ -8,10 +8,16 @@ Combines:
 from __future__ import annotations
 
 import os
+import re
 from typing import Dict, List, Optional
 
 import requests
 
+_WORD_RE = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in is of on or the to with".split()
+)
+
 
 def _normalize_item(
     item: dict,
@@ -193,6 +199,30 @@ def format_trend_brief(
 
     return "\n".join(lines)
 
-__all__ = ["TrendingTopicFetcher", "format_trend_brief"]
+
+def _words(text: str) -> set:
+    return {w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS}
+
+
+def rank_trends(
+    trends: List[Dict[str, Optional[str]]], *queries: Optional[str]
+) -> List[Dict[str, Optional[str]]]:
+    """
+    Order trends by word overlap (set intersection of title + snippet with the query words),
+    best first. The sort is stable, so ties keep the search engine's order. Prompts only render
+    the first few trends, so this decides which ones the model sees.
+    """
+    query_words = _words(" ".join(q for q in queries if q))
+    if not query_words or len(trends) < 2:
+        return list(trends)
+    scored = [
+        (len(query_words & _words(f"{t.get('title') or ''} {t.get('snippet') or ''}")), t)
+        for t in trends
+    ]
+    scored.sort(key=lambda pair: -pair[0])
+    return [t for _, t in scored]
+
+
+__all__ = ["TrendingTopicFetcher", "format_trend_brief", "rank_trends"]
 
 